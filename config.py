@@ -24,6 +24,10 @@ REINDEX_SCRIPT_PATH = PROJECTS_BASE_DIR / "project-scaffolding" / "scripts" / "r
 _default_audit_bin = PROJECTS_BASE_DIR / "audit-agent" / "audit"
 AUDIT_BIN_PATH = os.getenv("PT_AUDIT_BIN", str(_default_audit_bin) if _default_audit_bin.exists() else "audit")
 
+# Long-lived audit workers (`audit serve`); 0 runs the binary once per call
+AUDIT_WORKERS = int(os.getenv("PT_AUDIT_WORKERS", "0"))
+AUDIT_WORKER_ARGS = os.getenv("PT_AUDIT_WORKER_ARGS", "serve").split()
+
 # Ensure data directory exists
 DATABASE_PATH.parent.mkdir(parents=True, exist_ok=True)
 
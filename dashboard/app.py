@@ -2,8 +2,9 @@
 
 import sys
 from pathlib import Path
-from typing import Optional, List, Dict
+from typing import Any, Optional, List, Dict
 from datetime import datetime
+from contextlib import asynccontextmanager
 import subprocess
 
 from fastapi import FastAPI, Request
@@ -19,18 +20,29 @@ from logger import get_logger
 # Add scripts directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
 
-from db.manager import DatabaseManager
-from discovery.project_scanner import discover_projects
-from discovery.alert_detector import get_all_alerts
-from discovery.code_review_parser import parse_code_review
-from discovery.providers import get_provider, LegacyProvider
+from db.manager import DatabaseManager, close_all_connections
+from discovery.scan_jobs import ScanJobRunner
+from discovery.scan_service import ScanService
+from discovery.providers import get_provider, refresh_provider, LegacyProvider
+from discovery.audit_pool import shutdown_worker_pools
+from discovery.cron_monitor import find_untracked_entries
 
 # Import config
-from config import REINDEX_SCRIPT_PATH
+from config import PROJECTS_BASE_DIR, REINDEX_SCRIPT_PATH
 
 logger = get_logger(__name__)
 
-app = FastAPI(title="Project Tracker Dashboard")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Verify the audit binary once at startup; release long-lived resources when the server stops."""
+    refresh_provider()
+    yield
+    scan_jobs.shutdown()
+    shutdown_worker_pools()
+    close_all_connections()
+
+
+app = FastAPI(title="Project Tracker Dashboard", lifespan=lifespan)
 
 # Setup templates and static files
 templates = Jinja2Templates(directory=str(Path(__file__).parent / "templates"))
@@ -144,29 +156,43 @@ def categorize_services(services):
     return {k: v for k, v in categories.items() if v}
 
 
-def enrich_project_data(project: dict, db: DatabaseManager) -> dict:
-    """Add related data to project."""
-    # Get AI agents
-    agents = db.get_ai_agents(project["id"])
+def enrich_project_data(project: dict, db: DatabaseManager, reviews: Optional[Dict[str, dict]] = None) -> dict:
+    """Add related data to project.
+    
+    Uses the "relations" preloaded by DatabaseManager.get_projects_with_relations
+    when present, otherwise queries them for this project. reviews maps
+    project_id to its code review (DatabaseManager.get_code_reviews).
+    """
+    if reviews is None:
+        reviews = {r["project_id"]: r for r in db.get_code_reviews(project_id=project["id"])}
+    
+    relations = project.pop("relations", None)
+    if relations is None:
+        relations = {
+            "ai_agents": db.get_ai_agents(project["id"]),
+            "cron_jobs": db.get_cron_jobs(project["id"]),
+            "services": db.get_services(project["id"])
+        }
+    
+    # AI agents
+    agents = relations["ai_agents"]
     project["ai_agents"] = [a["agent_name"] for a in agents]
     
-    # Get cron jobs
-    jobs = db.get_cron_jobs(project["id"])
+    # Cron jobs
+    jobs = relations["cron_jobs"]
     project["has_cron"] = len(jobs) > 0
     project["cron_jobs"] = jobs
     
-    # Get services
-    services = db.get_services(project["id"])
+    # Services
+    services = relations["services"]
     project["services"] = [s["service_name"] for s in services]
     project["service_details"] = services
     project["services_by_category"] = categorize_services(services)
     
-    # Check for code review
-    review_path = Path(project["path"]) / "CODE_REVIEW.md"
-    if review_path.exists():
-        review_data = parse_code_review(review_path)
-        if review_data and review_data.get("completion_pct", 100) < 100:
-            project["code_review"] = review_data
+    # Code review (ingested at scan time)
+    review_data = reviews.get(project["id"])
+    if review_data and review_data.get("completion_pct", 100) < 100:
+        project["code_review"] = review_data
     
     # Format time
     project["last_modified_human"] = format_time_ago(project.get("last_modified", ""))
@@ -182,13 +208,14 @@ def enrich_project_data(project: dict, db: DatabaseManager) -> dict:
 async def dashboard(request: Request):
     """Main dashboard view."""
     db = DatabaseManager()
-    projects = db.get_all_projects(order_by="last_modified DESC")
+    projects = db.get_projects_with_relations(order_by="last_modified DESC")
     
     # Enrich with related data
-    enriched_projects = [enrich_project_data(p, db) for p in projects]
+    reviews = {r["project_id"]: r for r in db.get_code_reviews()}
+    enriched_projects = [enrich_project_data(p, db, reviews) for p in projects]
     
-    # Get alerts
-    alerts = get_all_alerts(enriched_projects)
+    # Alerts are computed at scan time
+    alerts = db.get_alerts()
     
     # Calculate index compliance
     indexed_count = len([p for p in enriched_projects if p.get("has_index") and p.get("index_is_valid")])
@@ -198,18 +225,11 @@ async def dashboard(request: Request):
     provider = get_provider()
     audit_available = not isinstance(provider, LegacyProvider)
     
-    # Collect code reviews separately for prominent display
-    code_reviews = []
-    for project in enriched_projects:
-        review_path = Path(project["path"]) / "CODE_REVIEW.md"
-        if review_path.exists():
-            review_data = parse_code_review(review_path)
-            if review_data and review_data.get("completion_pct", 100) < 100:
-                code_reviews.append({
-                    "project_id": project["id"],
-                    "project_name": project["name"],
-                    **review_data
-                })
+    # Collect open code reviews separately for prominent display
+    code_reviews = [
+        {"project_id": p["id"], "project_name": p["name"], **p["code_review"]}
+        for p in enriched_projects if p.get("code_review")
+    ]
     
     return templates.TemplateResponse("index.html", {
         "request": request,
@@ -281,8 +301,10 @@ async def view_todo(request: Request, project_id: str):
     })
 
 
+# Endpoints that block on subprocesses or SQLite are plain `def`, so FastAPI
+# runs them in its threadpool instead of on the event loop
 @app.post("/api/create-index/{project_id}")
-async def create_index(project_id: str):
+def create_index(project_id: str):
     """Run reindex_projects.py for a specific project."""
     try:
         db = DatabaseManager()
@@ -306,12 +328,8 @@ async def create_index(project_id: str):
                 "message": f"Script failed: {result.stderr}"
             }, status_code=500)
             
-        # Rescan to update DB
-        rescan_result = subprocess.run(
-            [sys.executable, str(Path(__file__).parent.parent / "scripts" / "pt.py"), "scan"],
-            capture_output=True,
-            text=True
-        )
+        # Rescan just this project to update its rows
+        ScanService(db).rescan(Path(project["path"]))
         
         return JSONResponse({
             "status": "success",
@@ -325,8 +343,36 @@ async def create_index(project_id: str):
         }, status_code=500)
 
 
+@app.post("/api/rescan/{project_id}")
+def rescan(project_id: str):
+    """Re-extract one project (metadata, health, alerts) and update only its rows."""
+    db = DatabaseManager()
+    project = db.get_project(project_id)
+    if not project:
+        return JSONResponse({"status": "error", "message": "Project not found"}, status_code=404)
+    
+    try:
+        result = ScanService(db).rescan(Path(project["path"]))
+    except Exception as e:
+        logger.error(f"Error rescanning {project_id}: {e}")
+        return JSONResponse({"status": "error", "message": str(e)}, status_code=500)
+    
+    if result is None:
+        return JSONResponse({
+            "status": "error",
+            "message": f"{project['name']} is no longer a project directory"
+        }, status_code=404)
+    
+    return JSONResponse({
+        "status": "success",
+        "updated": result["updated"],
+        "alerts": result["alerts"],
+        "duration_ms": result["duration_ms"]
+    })
+
+
 @app.post("/api/fix-frontmatter/{project_id}")
-async def fix_frontmatter(project_id: str):
+def fix_frontmatter(project_id: str):
     """Call audit fix for a specific project's index file."""
     db = DatabaseManager()
     project = db.get_project(project_id)
@@ -349,52 +395,52 @@ async def fix_frontmatter(project_id: str):
         return JSONResponse({"success": False, "error": str(e)}, status_code=500)
 
 
+def run_refresh(full: bool, progress) -> Dict[str, Any]:
+    """Scan and persist everything (incremental unless full); runs on the scan job thread."""
+    # Threads rather than processes: don't fork the web server
+    service = ScanService(DatabaseManager(), executor="thread", progress=progress)
+    result = service.run(full=full)
+    
+    return {
+        "message": f"Refreshed {result['changed']} of {result['total']} projects",
+        "cache_hits": result["cache_hits"],
+        "cache_misses": result["changed"],
+        "timings": result["timings"]
+    }
+
+
+scan_jobs = ScanJobRunner(run_refresh)
+
+
 @app.post("/api/refresh")
-async def refresh_data():
-    """Trigger full data refresh."""
-    try:
-        db = DatabaseManager()
-        
-        # Scan projects
-        projects = discover_projects()
-        
-        # Update database
-        for project in projects:
-            db.add_project(
-                project_id=project["id"],
-                name=project["name"],
-                path=project["path"],
-                status=project["status"],
-                description=project.get("description"),
-                phase=project.get("phase"),
-                last_modified=project["last_modified"],
-                completion_pct=project.get("completion_pct", 0),
-                is_infrastructure=project.get("is_infrastructure", False),
-                has_index=project.get("has_index", False),
-                index_is_valid=project.get("index_is_valid", False),
-                index_updated_at=project.get("index_updated_at")
-            )
-        
-        return JSONResponse({
-            "status": "success",
-            "message": f"Refreshed {len(projects)} projects"
-        })
-    except Exception as e:
-        logger.error(f"Error refreshing data: {e}")
-        return JSONResponse({
-            "status": "error",
-            "message": str(e)
-        }, status_code=500)
+async def refresh_data(full: bool = False):
+    """Start a data refresh in the background (incremental unless ?full=true).
+    
+    Returns the job immediately; while a scan is queued or running, further
+    requests get that same job. Poll /api/jobs/{id} for progress.
+    """
+    job = scan_jobs.submit(full)
+    return JSONResponse({"status": "accepted", "job_id": job["id"], "job": job}, status_code=202)
+
+
+@app.get("/api/jobs/{job_id}")
+async def api_job(job_id: str):
+    """Status and per-phase progress of a background scan job."""
+    job = scan_jobs.get(job_id)
+    if job is None:
+        return JSONResponse({"error": f"Unknown job: {job_id}"}, status_code=404)
+    return job
 
 
 @app.get("/api/projects")
 async def api_projects():
     """JSON API for projects."""
     db = DatabaseManager()
-    projects = db.get_all_projects(order_by="last_modified DESC")
+    projects = db.get_projects_with_relations(order_by="last_modified DESC")
     
     # Enrich with related data
-    enriched_projects = [enrich_project_data(p, db) for p in projects]
+    reviews = {r["project_id"]: r for r in db.get_code_reviews()}
+    enriched_projects = [enrich_project_data(p, db, reviews) for p in projects]
     
     return {"projects": enriched_projects}
 
@@ -403,17 +449,74 @@ async def api_projects():
 async def api_alerts():
     """Get all alerts."""
     db = DatabaseManager()
-    projects = db.get_all_projects()
-    enriched_projects = [enrich_project_data(p, db) for p in projects]
-    alerts = get_all_alerts(enriched_projects)
-    return {"alerts": alerts}
+    return {"alerts": db.get_alerts()}
+
+
+@app.get("/api/reviews")
+def api_reviews(status: Optional[str] = None):
+    """Get code reviews with action items, optionally filtered by status."""
+    db = DatabaseManager()
+    return {
+        "reviews": db.get_code_reviews(status=status),
+        "open_items": db.get_review_items(checked=False)
+    }
+
+
+@app.get("/api/tasks")
+def api_tasks(
+    project_id: Optional[str] = None,
+    section: Optional[str] = None,
+    status: str = "open",
+    older_than_days: Optional[int] = None,
+    order_by: str = "project",
+    page: int = 1,
+    per_page: int = 50
+):
+    """Tasks across all projects; status is "open", "done" or "all"."""
+    checked = {"open": False, "done": True, "all": None}
+    if status not in checked or order_by not in DatabaseManager.TASK_ORDER_BY:
+        return JSONResponse({"error": "Invalid status or order_by"}, status_code=400)
+    
+    db = DatabaseManager()
+    page = max(page, 1)
+    per_page = min(max(per_page, 1), 500)
+    filters = {
+        "project_id": project_id,
+        "section": section,
+        "checked": checked[status],
+        "older_than_days": older_than_days
+    }
+    return {
+        "tasks": db.get_tasks(**filters, order_by=order_by, limit=per_page, offset=(page - 1) * per_page),
+        "total": db.count_tasks(**filters),
+        "page": page,
+        "per_page": per_page
+    }
+
+
+@app.get("/api/search")
+def api_search(q: str, limit: int = 20):
+    """Full-text search over project documents; matches are wrapped in <mark>."""
+    db = DatabaseManager()
+    try:
+        return {"query": q, "results": db.search_documents(q, limit=min(limit, 100))}
+    except RuntimeError as e:
+        return JSONResponse({"error": str(e)}, status_code=503)
+
+
+@app.get("/api/cron/untracked")
+def api_untracked_cron():
+    """Crontab entries that don't match any tracked cron job."""
+    db = DatabaseManager()
+    entries = find_untracked_entries(db.get_cron_jobs())
+    return {"entries": entries}
 
 
 @app.get("/api/stats")
 async def api_stats():
     """Dashboard statistics."""
     db = DatabaseManager()
-    projects = db.get_all_projects()
+    projects = db.get_projects_with_relations()
     
     # Count by status
     status_counts = {}
@@ -421,23 +524,12 @@ async def api_stats():
         status = project["status"]
         status_counts[status] = status_counts.get(status, 0) + 1
     
-    # Count projects with cron jobs
-    projects_with_cron = 0
-    for project in projects:
-        jobs = db.get_cron_jobs(project["id"])
-        if jobs:
-            projects_with_cron += 1
-    
-    # Count projects with AI agents
-    projects_with_ai = 0
-    for project in projects:
-        agents = db.get_ai_agents(project["id"])
-        if agents:
-            projects_with_ai += 1
+    # Count projects with cron jobs and AI agents
+    projects_with_cron = sum(1 for p in projects if p["relations"]["cron_jobs"])
+    projects_with_ai = sum(1 for p in projects if p["relations"]["ai_agents"])
     
     # Get alert counts
-    enriched_projects = [enrich_project_data(p, db) for p in projects]
-    alerts = get_all_alerts(enriched_projects)
+    alerts = db.get_alerts()
     alert_counts = {
         "critical": len([a for a in alerts if a["severity"] == "critical"]),
         "warning": len([a for a in alerts if a["severity"] == "warning"]),
@@ -8,16 +8,19 @@ function refreshData() {
     button.textContent = '⟳ Refreshing...';
     button.disabled = true;
     
+    const fail = (message) => {
+        alert('Error refreshing data: ' + message);
+        button.textContent = originalText;
+        button.disabled = false;
+    };
+    
     fetch('/api/refresh', { method: 'POST' })
         .then(response => response.json())
         .then(data => {
-            if (data.status === 'success') {
-                // Reload page to show updated data
-                location.reload();
+            if (data.job_id) {
+                pollJob(data.job_id, button, fail);
             } else {
-                alert('Error refreshing data: ' + data.message);
-                button.textContent = originalText;
-                button.disabled = false;
+                fail(data.message || 'no job started');
             }
         })
         .catch(error => {
@@ -28,6 +31,29 @@ function refreshData() {
         });
 }
 
+// Poll a background scan job until it finishes, showing the current phase
+function pollJob(jobId, button, fail) {
+    fetch(`/api/jobs/${jobId}`)
+        .then(response => response.json())
+        .then(job => {
+            if (job.status === 'done') {
+                // Reload page to show updated data
+                location.reload();
+            } else if (job.status === 'error' || job.error) {
+                fail(job.error);
+            } else {
+                if (job.phase) {
+                    button.textContent = `⟳ ${job.phase} ${job.progress[job.phase]}`;
+                }
+                setTimeout(() => pollJob(jobId, button, fail), 1000);
+            }
+        })
+        .catch(error => {
+            console.error('Job status failed:', error);
+            fail('lost track of the refresh job');
+        });
+}
+
 function createIndex(projectId) {
     const button = document.getElementById(`btn-index-${projectId}`);
     const originalText = button.textContent;
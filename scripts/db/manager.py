@@ -1,13 +1,106 @@
 """Database manager for project tracker operations."""
 
+import os
+import re
 import sqlite3
-from datetime import datetime
+import threading
+from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import Dict, Iterable, List, Optional, Any, Set
 from contextlib import contextmanager
 
 from .schema import get_db_path
 
+# Connection tuning applied once per pooled connection
+CONNECTION_PRAGMAS = (
+    "PRAGMA foreign_keys = ON",
+    "PRAGMA journal_mode = WAL",       # Readers don't block on a running scan
+    "PRAGMA synchronous = NORMAL",     # Safe with WAL, far fewer fsyncs
+    "PRAGMA cache_size = -16000",      # 16 MB page cache
+    "PRAGMA mmap_size = 134217728",    # 128 MB memory-mapped I/O
+)
+BUSY_TIMEOUT_SECONDS = 30
+# Ids bound per "IN (...)" query; stays under SQLite's older 999-variable limit
+IN_CHUNK_SIZE = 500
+# Words of a search query, used when it isn't valid FTS5 syntax
+SEARCH_TOKEN_PATTERN = re.compile(r"\w+")
+STATEMENT_CACHE_SIZE = 256
+
+# Thread-local pool: each thread keeps one open connection per database file
+_pool = threading.local()
+_pool_lock = threading.Lock()
+_all_connections: List[sqlite3.Connection] = []
+_pool_generation = 0  # Bumped by close_all_connections() to invalidate thread-local pools
+
+
+def _open_connection(db_path: Path) -> sqlite3.Connection:
+    """Open and tune a new SQLite connection."""
+    # check_same_thread=False only so close_all_connections() can run from a
+    # shutdown hook; each connection is still used by a single thread.
+    conn = sqlite3.connect(
+        db_path,
+        timeout=BUSY_TIMEOUT_SECONDS,
+        cached_statements=STATEMENT_CACHE_SIZE,
+        check_same_thread=False
+    )
+    for pragma in CONNECTION_PRAGMAS:
+        conn.execute(pragma)
+    conn.row_factory = sqlite3.Row  # Enable dict-like access
+    return conn
+
+
+def get_pooled_connection(db_path: Path) -> sqlite3.Connection:
+    """Return this thread's long-lived connection to db_path, opening it on first use."""
+    # Connections must not cross fork() (e.g. process pool workers)
+    if getattr(_pool, "pid", None) != os.getpid() or getattr(_pool, "generation", None) != _pool_generation:
+        _pool.pid = os.getpid()
+        _pool.generation = _pool_generation
+        _pool.connections = {}
+    
+    key = str(db_path)
+    conn = _pool.connections.get(key)
+    if conn is None:
+        conn = _open_connection(db_path)
+        _pool.connections[key] = conn
+        with _pool_lock:
+            _all_connections.append(conn)
+    return conn
+
+
+def close_all_connections() -> None:
+    """Close every pooled connection (call on process shutdown)."""
+    global _pool_generation
+    
+    with _pool_lock:
+        connections = list(_all_connections)
+        _all_connections.clear()
+        _pool_generation += 1
+    
+    for conn in connections:
+        try:
+            conn.close()
+        except sqlite3.Error:
+            pass
+
+
+def close_thread_connections() -> None:
+    """Close the calling thread's pooled connections (for short-lived worker threads)."""
+    if getattr(_pool, "pid", None) != os.getpid():
+        return
+    connections = list(getattr(_pool, "connections", {}).values())
+    _pool.connections = {}
+    
+    with _pool_lock:
+        for conn in connections:
+            if conn in _all_connections:
+                _all_connections.remove(conn)
+    
+    for conn in connections:
+        try:
+            conn.close()
+        except sqlite3.Error:
+            pass
+
 
 class DatabaseManager:
     """Manage all database operations."""
@@ -18,14 +111,14 @@ class DatabaseManager:
         
     @contextmanager
     def _get_conn(self):
-        """Get database connection context manager."""
-        conn = sqlite3.connect(self.db_path)
-        conn.execute("PRAGMA foreign_keys = ON")
-        conn.row_factory = sqlite3.Row  # Enable dict-like access
+        """Get this thread's pooled database connection."""
+        conn = get_pooled_connection(self.db_path)
         try:
             yield conn
         finally:
-            conn.close()
+            # Never leave a half-finished transaction on a shared connection
+            if conn.in_transaction:
+                conn.rollback()
     
     # ==================== PROJECT OPERATIONS ====================
     
@@ -79,17 +172,17 @@ class DatabaseManager:
             row = cursor.fetchone()
             return dict(row) if row else None
     
+    # Whitelist allowed order_by values to prevent SQL injection
+    ALLOWED_ORDER_BY = {
+        "name", "name ASC", "name DESC",
+        "status", "status ASC", "status DESC",
+        "last_modified", "last_modified ASC", "last_modified DESC",
+        "completion_pct", "completion_pct ASC", "completion_pct DESC"
+    }
+    
     def get_all_projects(self, order_by: str = "last_modified DESC") -> List[Dict[str, Any]]:
         """Get all projects, sorted."""
-        # Whitelist allowed order_by values to prevent SQL injection
-        allowed_order = {
-            "name", "name ASC", "name DESC",
-            "status", "status ASC", "status DESC",
-            "last_modified", "last_modified ASC", "last_modified DESC",
-            "completion_pct", "completion_pct ASC", "completion_pct DESC"
-        }
-        
-        if order_by not in allowed_order:
+        if order_by not in self.ALLOWED_ORDER_BY:
             raise ValueError(f"Invalid order_by parameter: {order_by}")
         
         with self._get_conn() as conn:
@@ -99,6 +192,50 @@ class DatabaseManager:
             rows = cursor.fetchall()
             return [dict(row) for row in rows]
     
+    def get_projects_with_relations(
+        self,
+        order_by: str = "last_modified DESC",
+        project_ids: Optional[Iterable[str]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Get all projects (or only project_ids) plus their AI agents, cron jobs and services.
+        
+        Uses four queries total regardless of project count. Each project dict
+        gets a "relations" key: {"ai_agents": [...], "cron_jobs": [...], "services": [...]}.
+        """
+        if order_by not in self.ALLOWED_ORDER_BY:
+            raise ValueError(f"Invalid order_by parameter: {order_by}")
+        
+        relation_tables = {
+            "ai_agents": "ai_agents",
+            "cron_jobs": "cron_jobs",
+            "services": "service_dependencies"
+        }
+        
+        where, params = "", []
+        if project_ids is not None:
+            params = list(project_ids)
+            where = f"WHERE {{column}} IN ({', '.join('?' for _ in params)})"
+        
+        grouped: Dict[str, Dict[str, List[Dict[str, Any]]]] = {}
+        with self._get_conn() as conn:
+            cursor = conn.cursor()
+            cursor.execute(f"SELECT * FROM projects {where.format(column='id')} ORDER BY {order_by}", params)
+            projects = [dict(row) for row in cursor.fetchall()]
+            for key, table in relation_tables.items():
+                cursor.execute(f"SELECT * FROM {table} {where.format(column='project_id')} ORDER BY id", params)
+                by_project: Dict[str, List[Dict[str, Any]]] = {}
+                for row in cursor.fetchall():
+                    by_project.setdefault(row["project_id"], []).append(dict(row))
+                grouped[key] = by_project
+        
+        for project in projects:
+            project["relations"] = {
+                key: grouped[key].get(project["id"], []) for key in relation_tables
+            }
+        
+        return projects
+    
     def update_project(self, project_id: str, **kwargs) -> None:
         """Update specific fields of a project."""
         if not kwargs:
@@ -127,13 +264,17 @@ class DatabaseManager:
             cursor.execute(f"UPDATE projects SET {fields} WHERE id = ?", values)
             conn.commit()
     
-    def update_health(self, project_id: str, score: int, grade: str) -> None:
-        """Update health_score and health_grade for a project."""
-        # 🛡️ Input validation
+    @staticmethod
+    def _validate_health(score: int, grade: str) -> None:
+        """🛡️ Input validation for health data."""
         if not isinstance(score, int) or not (0 <= score <= 100):
             raise ValueError(f"score must be int 0-100, got: {score}")
         if grade not in {"A", "B", "C", "D", "F"}:
             raise ValueError(f"grade must be A-F, got: {grade}")
+    
+    def update_health(self, project_id: str, score: int, grade: str) -> None:
+        """Update health_score and health_grade for a project."""
+        self._validate_health(score, grade)
             
         with self._get_conn() as conn:
             cursor = conn.cursor()
@@ -151,6 +292,16 @@ class DatabaseManager:
             cursor.execute("DELETE FROM projects WHERE id = ?", (project_id,))
             conn.commit()
     
+    def prune_projects(self, keep_ids: Set[str]) -> List[str]:
+        """Delete projects not in keep_ids (and their related data); returns the removed names."""
+        with self._get_conn() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT id, name FROM projects ORDER BY id")
+            removed = [(row["id"], row["name"]) for row in cursor.fetchall() if row["id"] not in keep_ids]
+            cursor.executemany("DELETE FROM projects WHERE id = ?", [(pid,) for pid, _ in removed])
+            conn.commit()
+            return [name for _, name in removed]
+    
     # ==================== CRON JOB OPERATIONS ====================
     
     def add_cron_job(
@@ -262,6 +413,757 @@ class DatabaseManager:
             cursor.execute("DELETE FROM service_dependencies WHERE project_id = ?", (project_id,))
             conn.commit()
     
+    # ==================== BULK SYNC ====================
+    
+    # Project columns written by a scan (created_at and health are managed separately)
+    SCAN_PROJECT_FIELDS = (
+        "name", "path", "status", "description", "phase", "last_modified",
+        "completion_pct", "is_infrastructure", "has_index", "index_is_valid",
+        "index_updated_at", "project_type"
+    )
+    
+    def bulk_sync(
+        self,
+        projects: List[Dict[str, Any]],
+        services_by_project: Optional[Dict[str, List[Dict[str, Any]]]] = None,
+        health_results: Optional[Dict[str, Optional[Dict[str, Any]]]] = None,
+        remove_missing: bool = True
+    ) -> Dict[str, Any]:
+        """
+        Write a whole scan's results in a single transaction.
+        
+        projects: extracted projects (see iter_extracted); stubs with "unchanged": True
+            only mark the project as still present.
+        services_by_project: {project_id: [service dicts]}; when given, services
+            are synced for every discovered project.
+        health_results: {project_id: {"score": N, "grade": "X"} or None}
+        remove_missing: delete projects in the database that weren't discovered
+        
+        Project and child rows are only rewritten when their content changed.
+        Returns a summary dict with "updated", "removed" (project names),
+        "unchanged" (count), "child_rows" (child rows written), "documents"
+        (search documents re-indexed) and "tasks" (task rows changed).
+        """
+        changed = [p for p in projects if not p.get("unchanged")]
+        discovered_ids = {p["id"] for p in projects}
+        summary = {"updated": [], "removed": [], "unchanged": 0, "child_rows": 0, "documents": 0, "tasks": 0}
+        
+        with self._get_conn() as conn:
+            cursor = conn.cursor()
+            try:
+                # Delete projects that are no longer found
+                if remove_missing:
+                    cursor.execute("SELECT id, name FROM projects")
+                    names = {row["id"]: row["name"] for row in cursor.fetchall()}
+                    to_delete = sorted(set(names) - discovered_ids)
+                    cursor.executemany("DELETE FROM projects WHERE id = ?", [(pid,) for pid in to_delete])
+                    summary["removed"] = [names[pid] for pid in to_delete]
+                
+                existing = {
+                    row["id"]: dict(row)
+                    for row in self._fetch_in(cursor, "SELECT * FROM projects WHERE id IN ({ids})", [p["id"] for p in changed])
+                }
+                
+                # Upsert only projects whose scanned fields differ
+                now = datetime.now().isoformat()
+                project_rows = []
+                for project in changed:
+                    values = self._scan_project_values(project)
+                    current = existing.get(project["id"])
+                    if current and tuple(current[f] for f in self.SCAN_PROJECT_FIELDS) == values:
+                        summary["unchanged"] += 1
+                        continue
+                    project_rows.append((project["id"], now) + values)
+                    summary["updated"].append(project["name"])
+                summary["unchanged"] += len(projects) - len(changed)
+                
+                columns = ("id", "created_at") + self.SCAN_PROJECT_FIELDS
+                updates = ", ".join(f"{f} = excluded.{f}" for f in self.SCAN_PROJECT_FIELDS)
+                cursor.executemany(f"""
+                    INSERT INTO projects ({", ".join(columns)})
+                    VALUES ({", ".join("?" for _ in columns)})
+                    ON CONFLICT(id) DO UPDATE SET {updates}
+                """, project_rows)
+                
+                # Health scores
+                health_rows = []
+                for project_id, health in (health_results or {}).items():
+                    if health and project_id in discovered_ids:
+                        self._validate_health(health["score"], health["grade"])
+                        health_rows.append((health["score"], health["grade"], project_id))
+                cursor.executemany(
+                    "UPDATE projects SET health_score = ?, health_grade = ? WHERE id = ?",
+                    health_rows
+                )
+                
+                # Child rows (diffed per project)
+                summary["child_rows"] += self._sync_child_rows(
+                    cursor, "ai_agents", ("agent_name", "role"),
+                    {p["id"]: [(a["agent_name"], a.get("role")) for a in p.get("ai_agents", [])]
+                     for p in changed}
+                )
+                summary["child_rows"] += self._sync_child_rows(
+                    cursor, "cron_jobs", ("schedule", "command", "description"),
+                    {p["id"]: [(j["schedule"], j["command"], j.get("description")) for j in p.get("cron_jobs", [])]
+                     for p in changed}
+                )
+                reviewed = [p for p in changed if "code_review" in p]
+                summary["child_rows"] += self._sync_child_rows(
+                    cursor, "code_reviews", self.CODE_REVIEW_FIELDS,
+                    {p["id"]: [self._code_review_values(p["code_review"])] if p["code_review"] else []
+                     for p in reviewed}
+                )
+                summary["child_rows"] += self._sync_child_rows(
+                    cursor, "review_action_items", ("text", "checked"),
+                    {p["id"]: [(i["text"], int(bool(i["checked"])))
+                               for i in (p["code_review"] or {}).get("action_items", [])]
+                     for p in reviewed}
+                )
+                if services_by_project is not None:
+                    summary["child_rows"] += self._sync_child_rows(
+                        cursor, "service_dependencies", ("service_name", "purpose", "cost_monthly"),
+                        {pid: [(s["service_name"], s.get("purpose"), s.get("cost_monthly"))
+                               for s in services_by_project.get(pid, [])]
+                         for pid in discovered_ids}
+                    )
+                
+                # Parse cache entries used by re-extracted projects (stale ones dropped)
+                cache_projects = [p for p in changed if "parse_cache" in p]
+                cursor.executemany(
+                    "DELETE FROM parse_cache WHERE project_id = ?",
+                    [(p["id"],) for p in cache_projects]
+                )
+                self._write_parse_cache(cursor, [e for p in cache_projects for e in p["parse_cache"]])
+                
+                # Tasks, diffed per project by stable id
+                summary["tasks"] = self._sync_tasks(cursor, [p for p in changed if "tasks" in p], now)
+                
+                # Search index: only documents whose content changed
+                summary["documents"] = self._sync_documents(cursor, [p for p in changed if "documents" in p])
+                
+                # Mark scanned projects fresh in the same transaction
+                cursor.executemany("""
+                    INSERT OR REPLACE INTO scan_fingerprints (project_id, fingerprint, scanned_at)
+                    VALUES (?, ?, ?)
+                """, [(p["id"], p["fingerprint"], now) for p in changed if p.get("fingerprint")])
+                
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+        
+        return summary
+    
+    @staticmethod
+    def _fetch_in(cursor, sql: str, ids: Iterable[str], params: tuple = ()) -> List[sqlite3.Row]:
+        """Run sql, where "{ids}" marks an IN list, for ids in chunks; returns all rows."""
+        ids = list(ids)
+        rows = []
+        for start in range(0, len(ids), IN_CHUNK_SIZE):
+            chunk = ids[start:start + IN_CHUNK_SIZE]
+            cursor.execute(sql.format(ids=", ".join("?" for _ in chunk)), tuple(chunk) + params)
+            rows.extend(cursor.fetchall())
+        return rows
+    
+    def _scan_project_values(self, project: Dict[str, Any]) -> tuple:
+        """Normalize a scanned project dict to SCAN_PROJECT_FIELDS order, as stored in SQLite."""
+        return (
+            project["name"],
+            project["path"],
+            project["status"],
+            project.get("description"),
+            project.get("phase"),
+            project.get("last_modified"),
+            project.get("completion_pct", 0),
+            int(bool(project.get("is_infrastructure", False))),
+            int(bool(project.get("has_index", False))),
+            int(bool(project.get("index_is_valid", False))),
+            project.get("index_updated_at"),
+            project.get("project_type", "standard")
+        )
+    
+    @classmethod
+    def _sync_child_rows(cls, cursor, table: str, columns: tuple, desired: Dict[str, List[tuple]]) -> int:
+        """Replace a project's child rows only where they differ; returns rows inserted."""
+        if not desired:
+            return 0
+        
+        current: Dict[str, List[tuple]] = {}
+        for row in cls._fetch_in(
+            cursor, f"SELECT project_id, {', '.join(columns)} FROM {table} WHERE project_id IN ({{ids}}) ORDER BY id", desired
+        ):
+            current.setdefault(row["project_id"], []).append(tuple(row[c] for c in columns))
+        
+        stale = [pid for pid, rows in desired.items() if current.get(pid, []) != rows]
+        if not stale:
+            return 0
+        
+        cursor.executemany(f"DELETE FROM {table} WHERE project_id = ?", [(pid,) for pid in stale])
+        new_rows = [(pid,) + row for pid in stale for row in desired[pid]]
+        cursor.executemany(
+            f"INSERT INTO {table} (project_id, {', '.join(columns)}) VALUES (?, {', '.join('?' for _ in columns)})",
+            new_rows
+        )
+        return len(new_rows)
+    
+    # ==================== TASKS ====================
+    
+    TASK_FIELDS = ("path", "section", "line", "text", "checked")
+    TASK_ORDER_BY = {
+        "project": "projects.name, tasks.path, tasks.line",
+        "age": "tasks.first_seen, projects.name, tasks.line",
+    }
+    
+    def _sync_tasks(self, cursor, projects: List[Dict[str, Any]], now: str) -> int:
+        """Insert, update and delete task rows where they differ; returns rows changed."""
+        inserts, updates, deletes = [], [], []
+        
+        for project in projects:
+            cursor.execute(
+                f"SELECT id, {', '.join(self.TASK_FIELDS)} FROM tasks WHERE project_id = ?",
+                (project["id"],)
+            )
+            current = {row["id"]: tuple(row[f] for f in self.TASK_FIELDS) for row in cursor.fetchall()}
+            
+            desired = {}
+            for task in project["tasks"]:
+                desired[task["id"]] = (
+                    task["path"], task["section"], task["line"], task["text"], int(task["checked"])
+                )
+            
+            for task_id, values in desired.items():
+                if task_id not in current:
+                    inserts.append((task_id, project["id"]) + values + (now, now))
+                elif current[task_id] != values:
+                    updates.append(values + (now, task_id))
+            deletes.extend((task_id,) for task_id in current if task_id not in desired)
+        
+        cursor.executemany(f"""
+            INSERT INTO tasks (id, project_id, {', '.join(self.TASK_FIELDS)}, first_seen, updated_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, inserts)
+        cursor.executemany(f"""
+            UPDATE tasks SET {', '.join(f'{f} = ?' for f in self.TASK_FIELDS)}, updated_at = ?
+            WHERE id = ?
+        """, updates)
+        cursor.executemany("DELETE FROM tasks WHERE id = ?", deletes)
+        
+        return len(inserts) + len(updates) + len(deletes)
+    
+    def import_tasks(self, batches: Iterable[List[Dict[str, Any]]]) -> Dict[str, Set[str]]:
+        """
+        Upsert streamed task rows, committing once per batch.
+        
+        Rows for untracked projects are skipped. Returns {project_id: {task ids
+        seen}} for prune_tasks() once the stream has been fully consumed.
+        """
+        seen: Dict[str, Set[str]] = {}
+        
+        with self._get_conn() as conn:
+            cursor = conn.cursor()
+            for batch in batches:
+                now = datetime.now().isoformat()
+                cursor.executemany(f"""
+                    INSERT INTO tasks (id, project_id, {', '.join(self.TASK_FIELDS)}, first_seen, updated_at)
+                    SELECT ?, ?, ?, ?, ?, ?, ?, ?, ?
+                    WHERE EXISTS (SELECT 1 FROM projects WHERE id = ?)
+                    ON CONFLICT(id) DO UPDATE SET
+                        {', '.join(f'{f} = excluded.{f}' for f in self.TASK_FIELDS)},
+                        updated_at = excluded.updated_at
+                    WHERE {' OR '.join(f'{f} IS NOT excluded.{f}' for f in self.TASK_FIELDS)}
+                """, [
+                    (t["id"], t["project_id"], t["path"], t["section"], t["line"], t["text"],
+                     int(t["checked"]), now, now, t["project_id"])
+                    for t in batch
+                ])
+                conn.commit()
+                
+                for task in batch:
+                    seen.setdefault(task["project_id"], set()).add(task["id"])
+        
+        return seen
+    
+    def prune_tasks(self, seen: Dict[str, Set[str]]) -> int:
+        """Delete tasks of the given projects whose ids weren't seen; returns rows deleted."""
+        with self._get_conn() as conn:
+            cursor = conn.cursor()
+            stale = []
+            for project_id, ids in seen.items():
+                cursor.execute("SELECT id FROM tasks WHERE project_id = ?", (project_id,))
+                stale.extend((row["id"],) for row in cursor.fetchall() if row["id"] not in ids)
+            cursor.executemany("DELETE FROM tasks WHERE id = ?", stale)
+            conn.commit()
+            return len(stale)
+    
+    @staticmethod
+    def _task_filters(
+        project_id: Optional[str],
+        section: Optional[str],
+        checked: Optional[bool],
+        older_than_days: Optional[int]
+    ) -> tuple:
+        """Build the WHERE clause and params shared by get_tasks and count_tasks."""
+        conditions, params = [], []
+        if project_id:
+            conditions.append("tasks.project_id = ?")
+            params.append(project_id)
+        if section:
+            conditions.append("tasks.section = ?")
+            params.append(section)
+        if checked is not None:
+            conditions.append("tasks.checked = ?")
+            params.append(int(checked))
+        if older_than_days is not None:
+            conditions.append("tasks.first_seen <= ?")
+            params.append((datetime.now() - timedelta(days=older_than_days)).isoformat())
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        return where, params
+    
+    def get_tasks(
+        self,
+        project_id: Optional[str] = None,
+        section: Optional[str] = None,
+        checked: Optional[bool] = None,
+        older_than_days: Optional[int] = None,
+        order_by: str = "project",
+        limit: int = 50,
+        offset: int = 0
+    ) -> List[Dict[str, Any]]:
+        """
+        Get tasks with their project name, one page at a time.
+        
+        checked=False gives open tasks; older_than_days keeps tasks first seen
+        at least that many days ago. order_by is "project" (file order) or
+        "age" (oldest first).
+        """
+        if order_by not in self.TASK_ORDER_BY:
+            raise ValueError(f"Invalid order_by parameter: {order_by}")
+        
+        where, params = self._task_filters(project_id, section, checked, older_than_days)
+        with self._get_conn() as conn:
+            cursor = conn.cursor()
+            cursor.execute(f"""
+                SELECT tasks.*, projects.name AS project_name
+                FROM tasks JOIN projects ON projects.id = tasks.project_id
+                {where}
+                ORDER BY {self.TASK_ORDER_BY[order_by]}
+                LIMIT ? OFFSET ?
+            """, params + [limit, offset])
+            tasks = [dict(row) for row in cursor.fetchall()]
+            for task in tasks:
+                task["checked"] = bool(task["checked"])
+            return tasks
+    
+    def count_tasks(
+        self,
+        project_id: Optional[str] = None,
+        section: Optional[str] = None,
+        checked: Optional[bool] = None,
+        older_than_days: Optional[int] = None
+    ) -> int:
+        """Count tasks matching the same filters as get_tasks."""
+        where, params = self._task_filters(project_id, section, checked, older_than_days)
+        with self._get_conn() as conn:
+            cursor = conn.cursor()
+            cursor.execute(f"SELECT COUNT(*) FROM tasks {where}", params)
+            return cursor.fetchone()[0]
+    
+    # ==================== SEARCH ====================
+    
+    @staticmethod
+    def _search_available(cursor) -> bool:
+        """True if the FTS5 documents index exists (SQLite built with FTS5)."""
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE name = 'documents_fts'")
+        return cursor.fetchone() is not None
+    
+    def _sync_documents(self, cursor, projects: List[Dict[str, Any]]) -> int:
+        """Re-index changed documents of re-extracted projects; returns documents indexed."""
+        if not projects or not self._search_available(cursor):
+            return 0
+        
+        stored = {
+            row["path"]: dict(row)
+            for row in self._fetch_in(
+                cursor, "SELECT id, project_id, path, content_hash FROM documents WHERE project_id IN ({ids})",
+                [p["id"] for p in projects]
+            )
+        }
+        
+        indexed = 0
+        for project in projects:
+            current = {d["path"] for d in project["documents"]}
+            
+            # Files removed from the project (trigger drops their FTS rows)
+            cursor.executemany("DELETE FROM documents WHERE id = ?", [
+                (doc["id"],) for doc in stored.values()
+                if doc["project_id"] == project["id"] and doc["path"] not in current
+            ])
+            
+            for doc in project["documents"]:
+                existing = stored.get(doc["path"])
+                if existing and existing["content_hash"] == doc["content_hash"]:
+                    continue
+                if doc.get("text") is None:
+                    # Served from the parse cache without reading; nothing new to index
+                    continue
+                
+                cursor.execute("""
+                    INSERT INTO documents (project_id, path, kind, content_hash)
+                    VALUES (?, ?, ?, ?)
+                    ON CONFLICT(path) DO UPDATE SET
+                        project_id = excluded.project_id,
+                        kind = excluded.kind,
+                        content_hash = excluded.content_hash
+                """, (project["id"], doc["path"], doc["kind"], doc["content_hash"]))
+                cursor.execute("SELECT id FROM documents WHERE path = ?", (doc["path"],))
+                doc_id = cursor.fetchone()["id"]
+                
+                cursor.execute("DELETE FROM documents_fts WHERE rowid = ?", (doc_id,))
+                cursor.execute(
+                    "INSERT INTO documents_fts (rowid, title, body) VALUES (?, ?, ?)",
+                    (doc_id, f"{project['name']} {Path(doc['path']).name}", doc["text"])
+                )
+                indexed += 1
+        
+        return indexed
+    
+    def search_documents(
+        self,
+        query: str,
+        limit: int = 20,
+        highlight: tuple = ("<mark>", "</mark>")
+    ) -> List[Dict[str, Any]]:
+        """
+        Full-text search over project documents, best match (bm25) first.
+        
+        query uses FTS5 syntax (e.g. "stripe AND webhook*"); if it doesn't
+        parse, its words are searched as plain terms. Each hit has project_id,
+        project_name, path, kind, snippet (matches wrapped in highlight) and
+        rank. Raises RuntimeError if SQLite lacks FTS5.
+        """
+        sql = """
+            SELECT documents.project_id, projects.name AS project_name,
+                   documents.path, documents.kind,
+                   snippet(documents_fts, 1, ?, ?, '…', 16) AS snippet,
+                   bm25(documents_fts, 5.0, 1.0) AS rank
+            FROM documents_fts
+            JOIN documents ON documents.id = documents_fts.rowid
+            JOIN projects ON projects.id = documents.project_id
+            WHERE documents_fts MATCH ?
+            ORDER BY rank
+            LIMIT ?
+        """
+        
+        with self._get_conn() as conn:
+            cursor = conn.cursor()
+            if not self._search_available(cursor):
+                raise RuntimeError("Full-text search requires SQLite with FTS5")
+            
+            try:
+                cursor.execute(sql, (*highlight, query, limit))
+            except sqlite3.OperationalError:
+                # e.g. "stripe-webhook" or unbalanced quotes: search the words instead
+                plain = " ".join(f'"{token}"' for token in SEARCH_TOKEN_PATTERN.findall(query))
+                if not plain:
+                    return []
+                cursor.execute(sql, (*highlight, plain, limit))
+            return [dict(row) for row in cursor.fetchall()]
+    
+    # ==================== CODE REVIEWS ====================
+    
+    CODE_REVIEW_FIELDS = ("reviewer", "review_date", "verdict", "status", "summary", "completion_pct")
+    
+    @staticmethod
+    def _code_review_values(review: Dict[str, Any]) -> tuple:
+        """Map parse_code_review() output to code_reviews column values."""
+        return (
+            review.get("reviewer"),
+            review.get("date"),
+            review.get("verdict"),
+            review.get("status", "pending"),
+            review.get("summary"),
+            review.get("completion_pct", 0)
+        )
+    
+    def get_code_reviews(
+        self,
+        status: Optional[str] = None,
+        project_id: Optional[str] = None,
+        project_ids: Optional[Iterable[str]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Get code reviews with their action items, in parse_code_review() shape.
+        
+        Each review also carries project_id and project_name. Filter by
+        status ("pending", "in_progress", "completed") and/or project
+        (one project_id, or several project_ids).
+        """
+        query = """
+            SELECT code_reviews.*, code_reviews.review_date AS date, projects.name AS project_name
+            FROM code_reviews JOIN projects ON projects.id = code_reviews.project_id
+        """
+        conditions, params = [], []
+        if status:
+            conditions.append("code_reviews.status = ?")
+            params.append(status)
+        if project_id:
+            conditions.append("code_reviews.project_id = ?")
+            params.append(project_id)
+        if project_ids is not None:
+            project_ids = list(project_ids)
+            conditions.append(f"code_reviews.project_id IN ({', '.join('?' for _ in project_ids)})")
+            params.extend(project_ids)
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        query += " ORDER BY projects.name"
+        
+        with self._get_conn() as conn:
+            cursor = conn.cursor()
+            cursor.execute(query, params)
+            reviews = [dict(row) for row in cursor.fetchall()]
+            if not reviews:
+                return []
+            
+            by_project = {r["project_id"]: r for r in reviews}
+            for review in reviews:
+                review["action_items"] = []
+            
+            cursor.execute(f"""
+                SELECT project_id, text, checked FROM review_action_items
+                WHERE project_id IN ({", ".join("?" for _ in by_project)})
+                ORDER BY id
+            """, list(by_project))
+            for row in cursor.fetchall():
+                by_project[row["project_id"]]["action_items"].append(
+                    {"text": row["text"], "checked": bool(row["checked"])}
+                )
+            return reviews
+    
+    def get_review_items(self, checked: Optional[bool] = None) -> List[Dict[str, Any]]:
+        """Get review action items across all projects (open items with checked=False)."""
+        query = """
+            SELECT review_action_items.*, projects.name AS project_name
+            FROM review_action_items JOIN projects ON projects.id = review_action_items.project_id
+        """
+        params: tuple = ()
+        if checked is not None:
+            query += " WHERE review_action_items.checked = ?"
+            params = (int(checked),)
+        query += " ORDER BY projects.name, review_action_items.id"
+        
+        with self._get_conn() as conn:
+            cursor = conn.cursor()
+            cursor.execute(query, params)
+            items = [dict(row) for row in cursor.fetchall()]
+            for item in items:
+                item["checked"] = bool(item["checked"])
+            return items
+    
+    # ==================== ALERTS ====================
+    
+    def replace_alerts(
+        self,
+        alerts: List[Dict[str, Any]],
+        project_ids: List[str],
+        detectors: List[str]
+    ) -> None:
+        """
+        Store freshly computed alerts for a scope of projects and detectors.
+        
+        Alerts are upserted by fingerprint (first_seen is preserved); alerts in
+        the scope that were not produced again are deleted. Alerts outside the
+        scope are left alone, so callers can invalidate per project.
+        """
+        now = datetime.now().isoformat()
+        
+        with self._get_conn() as conn:
+            cursor = conn.cursor()
+            try:
+                cursor.executemany("""
+                    INSERT INTO alerts
+                    (fingerprint, project_id, detector, type, severity, message, details, first_seen, last_seen)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT(fingerprint) DO UPDATE SET
+                        severity = excluded.severity,
+                        message = excluded.message,
+                        details = excluded.details,
+                        last_seen = excluded.last_seen
+                """, [
+                    (a["fingerprint"], a["project_id"], a["detector"], a["type"], a["severity"],
+                     a["message"], a.get("details"), now, now)
+                    for a in alerts
+                ])
+                
+                # Drop alerts in scope that no longer fire
+                current = {a["fingerprint"] for a in alerts}
+                scope_detectors = sorted(set(detectors))
+                rows = self._fetch_in(cursor, f"""
+                    SELECT fingerprint FROM alerts
+                    WHERE project_id IN ({{ids}}) AND detector IN ({", ".join("?" for _ in scope_detectors)})
+                """, sorted(set(project_ids)), tuple(scope_detectors))
+                stale = [(row["fingerprint"],) for row in rows if row["fingerprint"] not in current]
+                cursor.executemany("DELETE FROM alerts WHERE fingerprint = ?", stale)
+                
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+    
+    def get_alerts(self, project_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Get stored alerts, critical first, then by project name."""
+        query = """
+            SELECT alerts.*, projects.name AS project_name
+            FROM alerts JOIN projects ON projects.id = alerts.project_id
+        """
+        params: tuple = ()
+        if project_id:
+            query += " WHERE alerts.project_id = ?"
+            params = (project_id,)
+        query += """
+            ORDER BY CASE alerts.severity
+                WHEN 'critical' THEN 0 WHEN 'warning' THEN 1 WHEN 'info' THEN 2 ELSE 3
+            END, projects.name
+        """
+        
+        with self._get_conn() as conn:
+            cursor = conn.cursor()
+            cursor.execute(query, params)
+            return [dict(row) for row in cursor.fetchall()]
+    
+    # ==================== CRON LOG OFFSETS ====================
+    
+    def get_log_states(self) -> Dict[str, Dict[str, Any]]:
+        """Get cron log read positions as {path: {"inode", "offset", "last_run", "status"}}."""
+        with self._get_conn() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT path, inode, byte_offset, last_run, status FROM cron_log_offsets")
+            return {
+                row["path"]: {
+                    "inode": row["inode"],
+                    "offset": row["byte_offset"],
+                    "last_run": row["last_run"],
+                    "status": row["status"]
+                }
+                for row in cursor.fetchall()
+            }
+    
+    def save_log_states(self, states: Dict[str, Dict[str, Any]]) -> None:
+        """Store cron log read positions (as returned by get_log_states)."""
+        now = datetime.now().isoformat()
+        rows = [
+            (path, state.get("inode"), state.get("offset", 0), state.get("last_run"), state.get("status"), now)
+            for path, state in states.items() if state
+        ]
+        
+        with self._get_conn() as conn:
+            cursor = conn.cursor()
+            cursor.executemany("""
+                INSERT OR REPLACE INTO cron_log_offsets
+                (path, inode, byte_offset, last_run, status, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+            """, rows)
+            conn.commit()
+    
+    # ==================== SCAN FINGERPRINTS ====================
+    
+    def get_fingerprints(self) -> Dict[str, str]:
+        """Get stored scan fingerprints as {project_id: fingerprint}."""
+        with self._get_conn() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT project_id, fingerprint FROM scan_fingerprints")
+            return {row["project_id"]: row["fingerprint"] for row in cursor.fetchall()}
+    
+    def set_fingerprint(self, project_id: str, fingerprint: str) -> None:
+        """Record the fingerprint a project was last scanned at."""
+        with self._get_conn() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                INSERT OR REPLACE INTO scan_fingerprints (project_id, fingerprint, scanned_at)
+                VALUES (?, ?, ?)
+            """, (project_id, fingerprint, datetime.now().isoformat()))
+            conn.commit()
+    
+    # ==================== PARSE CACHE ====================
+    
+    def get_parse_cache(self, project_id: Optional[str] = None) -> Dict[str, Dict[tuple, Dict[str, Any]]]:
+        """Get parse cache entries as {project_id: {(path, parser): entry}}."""
+        with self._get_conn() as conn:
+            cursor = conn.cursor()
+            if project_id:
+                cursor.execute("SELECT * FROM parse_cache WHERE project_id = ?", (project_id,))
+            else:
+                cursor.execute("SELECT * FROM parse_cache")
+            
+            entries: Dict[str, Dict[tuple, Dict[str, Any]]] = {}
+            for row in cursor.fetchall():
+                entries.setdefault(row["project_id"], {})[(row["path"], row["parser"])] = dict(row)
+            return entries
+    
+    def save_parse_cache(self, entries: List[Dict[str, Any]]) -> None:
+        """Upsert parse cache entries (ParseCache.updates)."""
+        if not entries:
+            return
+        with self._get_conn() as conn:
+            self._write_parse_cache(conn.cursor(), entries)
+            conn.commit()
+    
+    @staticmethod
+    def _write_parse_cache(cursor, entries: List[Dict[str, Any]]) -> None:
+        """Upsert parse cache entries, skipping projects that are no longer tracked."""
+        cursor.executemany("""
+            INSERT OR REPLACE INTO parse_cache
+                (path, parser, project_id, mtime_ns, size, content_hash, result)
+            SELECT ?, ?, ?, ?, ?, ?, ?
+            WHERE EXISTS (SELECT 1 FROM projects WHERE id = ?)
+        """, [
+            (e["path"], e["parser"], e["project_id"], e["mtime_ns"], e["size"],
+             e["content_hash"], e["result"], e["project_id"])
+            for e in entries
+        ])
+    
+    def get_check_cache(
+        self,
+        op: Optional[str] = None,
+        project_ids: Optional[Iterable[str]] = None
+    ) -> Dict[tuple, Dict[str, Any]]:
+        """Get audit result cache entries as {(path, op): entry}, optionally for one op and some projects."""
+        query = "SELECT * FROM check_cache"
+        conditions, params = [], []
+        if op:
+            conditions.append("op = ?")
+            params.append(op)
+        if project_ids is not None:
+            project_ids = list(project_ids)
+            conditions.append(f"project_id IN ({', '.join('?' for _ in project_ids)})")
+            params.extend(project_ids)
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        
+        with self._get_conn() as conn:
+            cursor = conn.cursor()
+            cursor.execute(query, params)
+            return {(row["path"], row["op"]): dict(row) for row in cursor.fetchall()}
+    
+    def save_check_cache(self, entries: List[Dict[str, Any]], evicted: Iterable[tuple] = ()) -> None:
+        """Upsert audit result cache entries and drop evicted (path, op) keys (CheckCache.updates/evicted)."""
+        evicted = list(evicted)
+        if not entries and not evicted:
+            return
+        with self._get_conn() as conn:
+            cursor = conn.cursor()
+            cursor.executemany("DELETE FROM check_cache WHERE path = ? AND op = ?", evicted)
+            cursor.executemany("""
+                INSERT OR REPLACE INTO check_cache
+                    (path, op, project_id, tool_version, mtime_ns, size, content_hash, result)
+                SELECT ?, ?, ?, ?, ?, ?, ?, ?
+                WHERE EXISTS (SELECT 1 FROM projects WHERE id = ?)
+            """, [
+                (e["path"], e["op"], e["project_id"], e["tool_version"], e["mtime_ns"], e["size"],
+                 e["content_hash"], e["result"], e["project_id"])
+                for e in entries
+            ])
+            conn.commit()
+    
     # ==================== ACTIVITY FEED ====================
     
     def get_activity(self, limit: int = 50) -> List[Dict[str, Any]]:
@@ -8,6 +8,9 @@ from typing import Optional
 # Add parent directory to path for config import
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 from config import DATABASE_PATH
+from logger import get_logger
+
+logger = get_logger(__name__)
 
 
 def get_db_path() -> Path:
@@ -15,6 +18,21 @@ def get_db_path() -> Path:
     return DATABASE_PATH
 
 
+def _create_derived_table(cursor: sqlite3.Cursor, table_name: str, ddl: str) -> bool:
+    """Create a table populated at scan time.
+    
+    When the table is new, stored scan fingerprints are cleared so the next
+    incremental scan re-extracts every project and fills it. Returns True if
+    the table was created.
+    """
+    cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (table_name,))
+    is_new = cursor.fetchone() is None
+    cursor.execute(ddl)
+    if is_new:
+        cursor.execute("DELETE FROM scan_fingerprints")
+    return is_new
+
+
 def create_database(db_path: Optional[Path] = None) -> None:
     """Create database with all tables and indexes."""
     if db_path is None:
@@ -121,6 +139,149 @@ def create_database(db_path: Optional[Path] = None) -> None:
         )
     """)
     
+    # Incremental scan cache (one fingerprint per project)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS scan_fingerprints (
+            project_id TEXT PRIMARY KEY,
+            fingerprint TEXT NOT NULL,
+            scanned_at TEXT NOT NULL,
+            FOREIGN KEY (project_id) REFERENCES projects(id) ON DELETE CASCADE
+        )
+    """)
+    
+    # Alerts computed at scan time (stable fingerprint per alert)
+    _create_derived_table(cursor, "alerts", """
+        CREATE TABLE IF NOT EXISTS alerts (
+            fingerprint TEXT PRIMARY KEY,
+            project_id TEXT NOT NULL,
+            detector TEXT NOT NULL,
+            type TEXT NOT NULL,
+            severity TEXT NOT NULL,
+            message TEXT NOT NULL,
+            details TEXT,
+            first_seen TEXT NOT NULL,
+            last_seen TEXT NOT NULL,
+            FOREIGN KEY (project_id) REFERENCES projects(id) ON DELETE CASCADE
+        )
+    """)
+    
+    # CODE_REVIEW.md contents, ingested at scan time (one review per project)
+    _create_derived_table(cursor, "code_reviews", """
+        CREATE TABLE IF NOT EXISTS code_reviews (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            project_id TEXT NOT NULL UNIQUE,
+            reviewer TEXT,
+            review_date TEXT,
+            verdict TEXT,
+            status TEXT NOT NULL,
+            summary TEXT,
+            completion_pct INTEGER DEFAULT 0,
+            FOREIGN KEY (project_id) REFERENCES projects(id) ON DELETE CASCADE
+        )
+    """)
+    
+    _create_derived_table(cursor, "review_action_items", """
+        CREATE TABLE IF NOT EXISTS review_action_items (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            project_id TEXT NOT NULL,
+            text TEXT NOT NULL,
+            checked BOOLEAN DEFAULT 0,
+            FOREIGN KEY (project_id) REFERENCES projects(id) ON DELETE CASCADE
+        )
+    """)
+    
+    # Parser outputs keyed by file path, validated by stat signature or content hash
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS parse_cache (
+            path TEXT NOT NULL,
+            parser TEXT NOT NULL,
+            project_id TEXT NOT NULL,
+            mtime_ns INTEGER NOT NULL,
+            size INTEGER NOT NULL,
+            content_hash TEXT NOT NULL,
+            result TEXT NOT NULL,
+            PRIMARY KEY (path, parser),
+            FOREIGN KEY (project_id) REFERENCES projects(id) ON DELETE CASCADE
+        )
+    """)
+    
+    # Audit results (check_file / get_health) keyed by path, tool version and file signature
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS check_cache (
+            path TEXT NOT NULL,
+            op TEXT NOT NULL,
+            project_id TEXT NOT NULL,
+            tool_version TEXT NOT NULL,
+            mtime_ns INTEGER,
+            size INTEGER,
+            content_hash TEXT NOT NULL,
+            result TEXT NOT NULL,
+            PRIMARY KEY (path, op),
+            FOREIGN KEY (project_id) REFERENCES projects(id) ON DELETE CASCADE
+        )
+    """)
+    
+    # Full-text search over project documents (TODO, README, index, review)
+    is_new = _create_derived_table(cursor, "documents", """
+        CREATE TABLE IF NOT EXISTS documents (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            project_id TEXT NOT NULL,
+            path TEXT NOT NULL UNIQUE,
+            kind TEXT NOT NULL,
+            content_hash TEXT NOT NULL,
+            FOREIGN KEY (project_id) REFERENCES projects(id) ON DELETE CASCADE
+        )
+    """)
+    if is_new:
+        # Cached parses don't carry file text, so files must be re-read once
+        cursor.execute("DELETE FROM parse_cache")
+    
+    try:
+        cursor.execute("""
+            CREATE VIRTUAL TABLE IF NOT EXISTS documents_fts
+            USING fts5(title, body, tokenize = 'porter unicode61')
+        """)
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS documents_fts_delete AFTER DELETE ON documents
+            BEGIN
+                DELETE FROM documents_fts WHERE rowid = old.id;
+            END
+        """)
+    except sqlite3.OperationalError as e:
+        # SQLite built without FTS5: scanning works, search is unavailable
+        logger.warning(f"Full-text search disabled: {e}")
+    
+    # Every TODO.md checkbox, keyed by a stable hash (see assign_task_ids)
+    is_new = _create_derived_table(cursor, "tasks", """
+        CREATE TABLE IF NOT EXISTS tasks (
+            id TEXT PRIMARY KEY,
+            project_id TEXT NOT NULL,
+            path TEXT NOT NULL,
+            section TEXT,
+            line INTEGER NOT NULL,
+            text TEXT NOT NULL,
+            checked BOOLEAN DEFAULT 0,
+            first_seen TEXT NOT NULL,
+            updated_at TEXT NOT NULL,
+            FOREIGN KEY (project_id) REFERENCES projects(id) ON DELETE CASCADE
+        )
+    """)
+    if is_new:
+        # Cached TODO parses predate task extraction
+        cursor.execute("DELETE FROM parse_cache WHERE parser = 'todo'")
+    
+    # Read position of cron logs so checks only read appended bytes
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS cron_log_offsets (
+            path TEXT PRIMARY KEY,
+            inode INTEGER,
+            byte_offset INTEGER NOT NULL DEFAULT 0,
+            last_run TEXT,
+            status TEXT,
+            updated_at TEXT NOT NULL
+        )
+    """)
+    
     # Create indexes for performance
     cursor.execute("""
         CREATE INDEX IF NOT EXISTS idx_projects_last_modified 
@@ -147,6 +308,41 @@ def create_database(db_path: Optional[Path] = None) -> None:
         ON service_dependencies(project_id)
     """)
     
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_code_reviews_status 
+        ON code_reviews(status)
+    """)
+    
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_review_items_project 
+        ON review_action_items(project_id, checked)
+    """)
+    
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_tasks_project 
+        ON tasks(project_id, checked)
+    """)
+    
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_tasks_section 
+        ON tasks(section, checked)
+    """)
+    
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_tasks_age 
+        ON tasks(checked, first_seen)
+    """)
+    
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_parse_cache_project 
+        ON parse_cache(project_id)
+    """)
+    
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_alerts_project 
+        ON alerts(project_id, detector)
+    """)
+    
     conn.commit()
     conn.close()
 
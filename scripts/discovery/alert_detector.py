@@ -1,13 +1,16 @@
 """Alert detection for project tracker."""
 
+import hashlib
 import sys
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Set
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
-from .cron_monitor import check_cron_health
+from .cron_monitor import check_cron_health, get_crontab_snapshot
 from .code_review_parser import parse_code_review
+from .check_cache import CheckCache
+from .todo_parser import has_entries, parse_todo
 from .providers import get_provider
 from db.manager import DatabaseManager
 
@@ -82,102 +85,72 @@ def detect_blocked_projects(projects: List[Dict[str, Any]]) -> List[Dict[str, An
     alerts = []
     
     for project in projects:
-        todo_path = Path(project["path"]) / "TODO.md"
-        if todo_path.exists():
-            try:
-                content = todo_path.read_text()
-                
-                # 1. Look for Critical Blockers (Immediate progress stoppers)
-                critical_sections = [
-                    "### Blockers",
-                    "## Blockers",
-                    "### Blockers & Dependencies",
-                    "## Blockers & Dependencies"
-                ]
-                
-                found_critical = False
-                for section in critical_sections:
-                    if section in content:
-                        section_content = _extract_section(content, section)
-                        lines = _get_clean_lines(section_content)
-                        
-                        # Only flag if there are actual blockers, not just "None"
-                        if len(lines) > 0 and not any(l.lower() == "none" for l in lines):
-                            alerts.append({
-                                "project_id": project["id"],
-                                "project_name": project["name"],
-                                "type": "blocked",
-                                "severity": "critical",
-                                "message": "Project blocked",
-                                "details": lines[0][:100]
-                            })
-                            found_critical = True
-                            break
-                
-                # 2. Look for Missing Features (Roadmap gaps)
-                # Only flag these if not already blocked, and at a lower severity
-                if not found_critical:
-                    roadmap_sections = ["### What's Missing", "## What's Missing"]
-                    for section in roadmap_sections:
-                        if section in content:
-                            section_content = _extract_section(content, section)
-                            lines = _get_clean_lines(section_content)
-                            
-                            # Only flag if there are actual gaps and the project isn't complete
-                            if len(lines) > 0 and not any(l.lower() == "none" for l in lines):
-                                if project.get("status") != "complete":
-                                    alerts.append({
-                                        "project_id": project["id"],
-                                        "project_name": project["name"],
-                                        "type": "gaps",
-                                        "severity": "info",
-                                        "message": "Roadmap gaps",
-                                        "details": f"{len(lines)} items in backlog"
-                                    })
-                                break
-                                
-            except Exception as e:
-                logger.warning(f"Failed to detect blockers for {project.get('name', 'unknown')}: {e}")
+        # Scan results already carry the tokenized sections; DB rows don't
+        if "blockers" in project:
+            blockers, gaps = project["blockers"], project.get("gaps", [])
+        else:
+            todo_path = Path(project["path"]) / "TODO.md"
+            if not todo_path.exists():
+                continue
+            todo_data = parse_todo(todo_path)
+            blockers, gaps = todo_data["blockers"], todo_data["gaps"]
+        
+        # 1. Critical Blockers (Immediate progress stoppers)
+        # Only flag if there are actual blockers, not just "None"
+        if has_entries(blockers):
+            alerts.append({
+                "project_id": project["id"],
+                "project_name": project["name"],
+                "type": "blocked",
+                "severity": "critical",
+                "message": "Project blocked",
+                "details": blockers[0][:100]
+            })
+        
+        # 2. Missing Features (Roadmap gaps)
+        # Only flag these if not already blocked, at a lower severity, and the project isn't complete
+        elif has_entries(gaps) and project.get("status") != "complete":
+            alerts.append({
+                "project_id": project["id"],
+                "project_name": project["name"],
+                "type": "gaps",
+                "severity": "info",
+                "message": "Roadmap gaps",
+                "details": f"{len(gaps)} items in backlog"
+            })
     
     return alerts
 
 
-def _extract_section(content: str, section_title: str) -> str:
-    """Helper to extract content of a markdown section."""
-    start = content.find(section_title)
-    if start == -1:
-        return ""
-    
-    # Find next section header (## or ###)
-    next_header = content.find("\n##", start + len(section_title))
-    if next_header == -1:
-        return content[start:]
-    return content[start:next_header]
-
-
-def _get_clean_lines(section_content: str) -> List[str]:
-    """Helper to get non-empty, non-header lines from section content."""
-    return [line.strip().lstrip('- ').lstrip('* ').strip() 
-            for line in section_content.split('\n') 
-            if line.strip() and not line.strip().startswith('#')]
-
-
-def detect_cron_failures(projects: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-    """Detect cron job failures and issues."""
+def detect_cron_failures(projects: List[Dict[str, Any]],
+                         db: Optional[DatabaseManager] = None) -> List[Dict[str, Any]]:
+    """Detect cron job failures and issues (log read offsets are kept in db)."""
     alerts = []
-    db = DatabaseManager()
+    db = db or DatabaseManager()
+    snapshot = None
+    log_states = None
     
     for project in projects:
-        # Fetch cron jobs from database
-        cron_jobs = db.get_cron_jobs(project["id"])
+        # Use preloaded cron jobs (enriched or freshly scanned projects), else query
+        if "cron_jobs" in project:
+            cron_jobs = project["cron_jobs"]
+        else:
+            cron_jobs = db.get_cron_jobs(project["id"])
         if not cron_jobs:
             continue
         
+        # One crontab snapshot and one load of log offsets per alert run
+        snapshot = snapshot or get_crontab_snapshot()
+        if log_states is None:
+            log_states = db.get_log_states()
+        
         # Check each cron job's health
         issues = check_cron_health(
             project["id"],
             cron_jobs,
-            project["path"]
+            project["path"],
+            snapshot,
+            log_states
         )
         
         for issue in issues:
@@ -189,9 +162,13 @@ def detect_cron_failures(projects: List[Dict[str, Any]]) -> List[Dict[str, Any]]
                 "type": f"cron_{issue['type']}",
                 "severity": severity,
                 "message": issue["message"],
-                "details": f"{issue.get('description', issue.get('command', ''))}"
+                "details": f"{issue.get('description', issue.get('command', ''))}",
+                "key": issue.get("command", "")
             })
     
+    if log_states:
+        db.save_log_states(log_states)
+    
     return alerts
 
 
@@ -200,35 +177,39 @@ def detect_code_reviews(projects: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     alerts = []
     
     for project in projects:
-        review_path = Path(project["path"]) / "CODE_REVIEW.md"
-        if review_path.exists():
-            review_data = parse_code_review(review_path)
-            if review_data:
-                status = review_data.get("status", "pending")
-                verdict = review_data.get("verdict", "Unknown")
-                reviewer = review_data.get("reviewer", "Unknown")
-                
-                # Determine severity based on verdict
+        # Reviews are ingested at scan time; fall back to parsing the file
+        if "code_review" in project:
+            review_data = project["code_review"]
+        else:
+            review_path = Path(project["path"]) / "CODE_REVIEW.md"
+            review_data = parse_code_review(review_path) if review_path.exists() else None
+        
+        if review_data:
+            status = review_data.get("status", "pending")
+            verdict = review_data.get("verdict", "Unknown")
+            reviewer = review_data.get("reviewer", "Unknown")
+            
+            # Determine severity based on verdict
+            severity = "warning"
+            if "production" in verdict.lower() or "approved" in verdict.lower():
+                severity = "info"
+            elif "delete" in verdict.lower() or "refactor" in verdict.lower():
                 severity = "warning"
-                if "production" in verdict.lower() or "approved" in verdict.lower():
-                    severity = "info"
-                elif "delete" in verdict.lower() or "refactor" in verdict.lower():
-                    severity = "warning"
-                
-                # Create alert message
-                message = f"Code review: {verdict}"
-                details = f"Reviewer: {reviewer}"
-                if review_data.get("summary"):
-                    details += f" | {review_data['summary'][:80]}..."
-                
-                alerts.append({
-                    "project_id": project["id"],
-                    "project_name": project["name"],
-                    "type": "code_review",
-                    "severity": severity,
-                    "message": message,
-                    "details": details
-                })
+            
+            # Create alert message
+            message = f"Code review: {verdict}"
+            details = f"Reviewer: {reviewer}"
+            if review_data.get("summary"):
+                details += f" | {review_data['summary'][:80]}..."
+            
+            alerts.append({
+                "project_id": project["id"],
+                "project_name": project["name"],
+                "type": "code_review",
+                "severity": severity,
+                "message": message,
+                "details": details
+            })
     
     return alerts
 
@@ -260,8 +241,9 @@ def detect_missing_index(projects: List[Dict[str, Any]]) -> List[Dict[str, Any]]
     return alerts
 
 
-def detect_invalid_frontmatter(projects: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-    """Detect projects with invalid frontmatter using audit check."""
+def detect_invalid_frontmatter(projects: List[Dict[str, Any]],
+                               check_cache: Optional[CheckCache] = None) -> List[Dict[str, Any]]:
+    """Detect projects with invalid frontmatter using audit check (results cached in check_cache)."""
     alerts = []
     provider = get_provider()
     
@@ -277,7 +259,9 @@ def detect_invalid_frontmatter(projects: List[Dict[str, Any]]) -> List[Dict[str,
     
     def check_one(item):
         project, index_file = item
-        result = provider.check_file(str(index_file))
+        if check_cache is None:
+            return (project, provider.check_file(str(index_file)))
+        result = check_cache.get(project["id"], index_file, "check", lambda: provider.check_file(str(index_file)))
         return (project, result)
     
     with ThreadPoolExecutor(max_workers=8) as executor:
@@ -301,21 +285,114 @@ def detect_invalid_frontmatter(projects: List[Dict[str, Any]]) -> List[Dict[str,
     return alerts
 
 
-def get_all_alerts(projects: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-    """Get all alerts for all projects."""
+# Detector name -> function; the name is stored with each persisted alert
+ALERT_DETECTORS = {
+    "blocked": detect_blocked_projects,
+    "code_review": detect_code_reviews,
+    "cron": detect_cron_failures,
+    "stalled": detect_stalled_projects,
+    "index": detect_missing_index,
+    "frontmatter": detect_invalid_frontmatter,
+    "todo": detect_missing_todo,
+}
+
+# Detectors that depend on the clock or state outside the project's files,
+# so they must be re-run even for projects an incremental scan skipped
+VOLATILE_DETECTORS = ["cron", "stalled"]
+FILE_DETECTORS = [name for name in ALERT_DETECTORS if name not in VOLATILE_DETECTORS]
+
+# Detectors that call the audit provider and accept a CheckCache
+CACHED_DETECTORS = {"frontmatter"}
+
+# Detectors that keep state in the database and accept a DatabaseManager
+DB_DETECTORS = {"cron"}
+
+
+def alert_fingerprint(alert: Dict[str, Any]) -> str:
+    """Stable identity for an alert: project, type and optional key (not the message)."""
+    identity = f"{alert['project_id']}|{alert['type']}|{alert.get('key', '')}"
+    return hashlib.sha1(identity.encode("utf-8")).hexdigest()
+
+
+def get_all_alerts(projects: List[Dict[str, Any]], detectors: Optional[List[str]] = None,
+                   check_cache: Optional[CheckCache] = None,
+                   db: Optional[DatabaseManager] = None) -> List[Dict[str, Any]]:
+    """Get all alerts for all projects (optionally only from the named detectors)."""
     all_alerts = []
     
     # Detect different types of issues
-    all_alerts.extend(detect_blocked_projects(projects))
-    all_alerts.extend(detect_code_reviews(projects))  # Add code review detection
-    all_alerts.extend(detect_cron_failures(projects))
-    all_alerts.extend(detect_stalled_projects(projects))
-    all_alerts.extend(detect_missing_index(projects))  # Add index monitoring
-    all_alerts.extend(detect_invalid_frontmatter(projects))
-    all_alerts.extend(detect_missing_todo(projects))
+    for name in detectors or ALERT_DETECTORS:
+        detector = ALERT_DETECTORS[name]
+        if name in CACHED_DETECTORS:
+            found = detector(projects, check_cache)
+        elif name in DB_DETECTORS:
+            found = detector(projects, db)
+        else:
+            found = detector(projects)
+        for alert in found:
+            alert["detector"] = name
+            alert["fingerprint"] = alert_fingerprint(alert)
+            all_alerts.append(alert)
     
     # Sort by severity (critical first, then warning, then info)
     severity_order = {"critical": 0, "warning": 1, "info": 2}
     all_alerts.sort(key=lambda x: (severity_order.get(x["severity"], 3), x["project_name"]))
     
     return all_alerts
+
+
+# Parsed fields on scan results that file detectors use instead of re-reading files
+SCANNED_SIGNALS = ("blockers", "gaps")
+
+
+def persist_alerts(db: DatabaseManager, changed_ids: Optional[Set[str]] = None,
+                   scanned: Optional[List[Dict[str, Any]]] = None, all_volatile: bool = True,
+                   file_only: bool = False) -> int:
+    """
+    Recompute alerts and store them in the alerts table.
+    
+    changed_ids limits file-based detectors to projects an incremental scan
+    re-extracted; volatile detectors (cron, stalled) always run for every
+    project. Pass None to recompute everything. scanned is the list of freshly
+    extracted projects; their parsed TODO blockers/gaps are reused so TODO.md
+    isn't read again. Code reviews come from the code_reviews table. With
+    all_volatile=False, volatile detectors are also limited to changed_ids
+    (single-project rescans); with file_only=True they don't run at all
+    (streamed scan batches, which run them once at the end). Only the
+    projects in scope are loaded. Returns the number of alerts computed.
+    """
+    scanned_by_id = {p["id"]: p for p in scanned or []}
+    
+    # Everything is loaded only when some detector covers every project
+    scope = None if changed_ids is None or (all_volatile and not file_only) else changed_ids
+    if scope is not None and not scope:
+        return 0
+    reviews = {r["project_id"]: r for r in db.get_code_reviews(project_ids=scope)}
+    
+    projects = db.get_projects_with_relations(project_ids=scope)
+    for project in projects:
+        project["cron_jobs"] = project.pop("relations")["cron_jobs"]
+        project["code_review"] = reviews.get(project["id"])
+        for key in SCANNED_SIGNALS:
+            if key in scanned_by_id.get(project["id"], {}):
+                project[key] = scanned_by_id[project["id"]][key]
+    
+    changed = projects if changed_ids is None else [p for p in projects if p["id"] in changed_ids]
+    
+    file_alerts = []
+    if changed:
+        check_ids = None if changed_ids is None else [p["id"] for p in changed]
+        check_cache = CheckCache(db.get_check_cache("check", check_ids), get_provider().version)
+        file_alerts = get_all_alerts(changed, FILE_DETECTORS, check_cache)
+        db.save_check_cache(check_cache.updates, check_cache.evicted)
+        logger.info(f"Frontmatter check cache: {check_cache.stats()}")
+    db.replace_alerts(file_alerts, [p["id"] for p in changed], FILE_DETECTORS)
+    
+    if file_only:
+        return len(file_alerts)
+    
+    volatile_scope = projects if all_volatile else changed
+    volatile_alerts = get_all_alerts(volatile_scope, VOLATILE_DETECTORS, db=db) if volatile_scope else []
+    db.replace_alerts(volatile_alerts, [p["id"] for p in volatile_scope], VOLATILE_DETECTORS)
+    
+    return len(file_alerts) + len(volatile_alerts)
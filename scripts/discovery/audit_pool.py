@@ -0,0 +1,252 @@
+"""Pool of long-lived audit worker processes speaking line-delimited JSON.
+
+Protocol (one JSON object per line on stdin/stdout):
+
+    request:  {"id": 7, "op": "check", "path": "/abs/file.md"}
+    response: {"id": 7, "result": {...}}   or   {"id": 7, "error": "message"}
+
+Ops are "check" (result: {"valid", "issues"}), "fix" (result: {"fixed"}),
+"health" (result: {"score", "grade"}) and "ping" (result: {}).
+"""
+
+import atexit
+import itertools
+import json
+import queue
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+# Add parent directory to path for logger import
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+from logger import get_logger
+
+logger = get_logger(__name__)
+
+REQUEST_TIMEOUT = 30
+# Idle workers are pinged before reuse after this many seconds
+HEALTH_CHECK_INTERVAL = 60
+PING_TIMEOUT = 5
+# Consecutive failed requests (after a restart and retry) before the pool gives
+# up for the rest of the process, e.g. a binary without a `serve` subcommand
+MAX_CONSECUTIVE_FAILURES = 3
+
+
+class WorkerError(Exception):
+    """Raised when a worker can't answer a request (crash, timeout, error reply)."""
+
+
+class WorkerReplyError(WorkerError):
+    """The worker answered the request with an error."""
+
+
+class AuditWorker:
+    """One worker process; a reader thread feeds its responses into a queue."""
+
+    def __init__(self, command: List[str]):
+        self.command = command
+        self.proc: Optional[subprocess.Popen] = None
+        self.responses: "queue.Queue[Optional[Dict[str, Any]]]" = queue.Queue()
+        self.last_used = 0.0
+        self.start()
+
+    def start(self) -> None:
+        """Start (or restart) the worker process."""
+        self.stop()
+        self.responses = queue.Queue()
+        self.proc = subprocess.Popen(
+            self.command,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            bufsize=1
+        )
+        threading.Thread(target=self._read_responses, args=(self.proc, self.responses), daemon=True).start()
+        self.last_used = time.monotonic()
+
+    @staticmethod
+    def _read_responses(proc: subprocess.Popen, responses: queue.Queue) -> None:
+        for line in proc.stdout:
+            try:
+                responses.put(json.loads(line))
+            except json.JSONDecodeError:
+                logger.debug(f"Ignoring non-JSON worker output: {line.strip()[:200]}")
+        # EOF: the worker exited
+        responses.put(None)
+
+    def alive(self) -> bool:
+        return self.proc is not None and self.proc.poll() is None
+
+    def request(self, request_id: int, op: str, params: Dict[str, Any], timeout: float) -> Dict[str, Any]:
+        """Send one request and wait for its response."""
+        try:
+            self.proc.stdin.write(json.dumps({"id": request_id, "op": op, **params}) + "\n")
+            self.proc.stdin.flush()
+        except (OSError, ValueError) as e:
+            raise WorkerError(f"worker stdin closed: {e}")
+
+        deadline = time.monotonic() + timeout
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise WorkerError(f"{op} timed out after {timeout}s")
+            try:
+                response = self.responses.get(timeout=remaining)
+            except queue.Empty:
+                continue
+            if response is None:
+                raise WorkerError("worker exited")
+            if response.get("id") != request_id:
+                # Late answer to a request that already timed out
+                continue
+            self.last_used = time.monotonic()
+            if "error" in response:
+                raise WorkerReplyError(str(response["error"]))
+            return response.get("result") or {}
+
+    def stop(self, timeout: float = 2) -> None:
+        """Close stdin so the worker exits; kill it if it doesn't."""
+        if self.proc is None:
+            return
+        proc, self.proc = self.proc, None
+        try:
+            proc.stdin.close()
+        except OSError:
+            pass
+        try:
+            proc.wait(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            proc.wait()
+
+
+class AuditWorkerPool:
+    """
+    A fixed number of AuditWorkers handed out one request at a time.
+
+    Crashed or unresponsive workers are restarted and the request retried
+    once; workers idle longer than HEALTH_CHECK_INTERVAL are pinged first.
+    After MAX_CONSECUTIVE_FAILURES requests fail that way in a row, or if the
+    workers can't be spawned at all, the pool is disabled for the rest of the
+    process and requests fail fast so callers use their one-shot fallback.
+    """
+
+    def __init__(self, command: List[str], size: int = 2):
+        self.command = command
+        self.size = size
+        self._ids = itertools.count(1)
+        self._idle: "queue.Queue[AuditWorker]" = queue.Queue()
+        self._failures = 0
+        self.closed = False
+        self.disabled = False
+        try:
+            self._workers = [AuditWorker(command) for _ in range(size)]
+        except OSError as e:
+            self._workers = []
+            self._disable(f"cannot start {command[0]}: {e}")
+        for worker in self._workers:
+            self._idle.put(worker)
+
+    def _disable(self, reason: str) -> None:
+        """Stop using workers for the rest of the process (logged once)."""
+        if self.disabled:
+            return
+        self.disabled = True
+        logger.warning(f"audit workers disabled ({reason}); using one-shot audit calls")
+        self._stop_idle()
+
+    def request(self, op: str, timeout: float = REQUEST_TIMEOUT, **params: Any) -> Dict[str, Any]:
+        """Run op on an idle worker; raises WorkerError if it fails twice."""
+        if self.closed:
+            raise WorkerError("pool is shut down")
+        if self.disabled:
+            raise WorkerError("pool is disabled")
+        try:
+            worker = self._idle.get(timeout=timeout)
+        except queue.Empty:
+            raise WorkerError(f"no idle worker within {timeout}s")
+
+        try:
+            self._ensure_healthy(worker)
+            try:
+                result = worker.request(next(self._ids), op, params, timeout)
+            except WorkerReplyError:
+                # The worker is fine; retrying won't change its answer
+                self._failures = 0
+                raise
+            except WorkerError as e:
+                logger.warning(f"audit worker failed ({e}); restarting and retrying {op}")
+                worker.start()
+                result = worker.request(next(self._ids), op, params, timeout)
+            self._failures = 0
+            return result
+        except WorkerReplyError:
+            raise
+        except (OSError, WorkerError) as e:
+            self._failures += 1
+            if self._failures >= MAX_CONSECUTIVE_FAILURES:
+                self._disable(f"{self._failures} requests failed in a row, last: {e}")
+            if isinstance(e, WorkerError):
+                raise
+            raise WorkerError(f"cannot restart worker: {e}") from e
+        finally:
+            if self.closed or self.disabled:
+                worker.stop()
+            else:
+                self._idle.put(worker)
+
+    def _ensure_healthy(self, worker: AuditWorker) -> None:
+        """Restart a dead worker, or ping one that has been idle for a while."""
+        if not worker.alive():
+            logger.warning("audit worker died; restarting")
+            worker.start()
+            return
+        if time.monotonic() - worker.last_used > HEALTH_CHECK_INTERVAL:
+            try:
+                worker.request(next(self._ids), "ping", {}, PING_TIMEOUT)
+            except WorkerError as e:
+                logger.warning(f"audit worker failed health check ({e}); restarting")
+                worker.start()
+
+    def shutdown(self) -> None:
+        """Stop all workers (in-flight requests finish first)."""
+        self.closed = True
+        self._stop_idle()
+
+    def _stop_idle(self) -> None:
+        while True:
+            try:
+                self._idle.get_nowait().stop()
+            except queue.Empty:
+                break
+
+
+_pools: Dict[Tuple[Tuple[str, ...], int], AuditWorkerPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_worker_pool(command: List[str], size: int) -> AuditWorkerPool:
+    """Return the shared pool for a worker command, starting it on first use."""
+    key = (tuple(command), size)
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None or pool.closed:
+            pool = AuditWorkerPool(command, size)
+            _pools[key] = pool
+        return pool
+
+
+def shutdown_worker_pools() -> None:
+    """Stop every worker pool (dashboard shutdown, interpreter exit)."""
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.shutdown()
+
+
+atexit.register(shutdown_worker_pools)
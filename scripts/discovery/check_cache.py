@@ -0,0 +1,126 @@
+"""Result cache for audit calls (check_file, get_health) that rarely change."""
+
+import hashlib
+import json
+import sys
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Add parent directory to path for logger import
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+from logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class CheckCache:
+    """
+    Audit results keyed by (path, op), valid for one tool version.
+
+    Like ParseCache, an entry is reused when the file's (mtime_ns, size)
+    matches, so a hit costs one stat; otherwise the file is hashed (blake2b)
+    and the entry is reused if the content is unchanged. Entries written by
+    a different tool version are evicted. Safe to share between threads.
+
+    entries: {(path, op): entry} as returned by DatabaseManager.get_check_cache().
+    New or revalidated entries are collected in `updates`, stale keys in
+    `evicted`, for the caller to persist with save_check_cache().
+    """
+
+    def __init__(self, entries: Optional[Dict[Tuple[str, str], Dict[str, Any]]], version: str):
+        self.entries = entries or {}
+        self.version = version
+        self.updates: List[Dict[str, Any]] = []
+        self.evicted: List[Tuple[str, str]] = []
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+
+    def get(self, project_id: str, path: Path, op: str, compute: Callable[[], Any]) -> Any:
+        """Return compute() for a file, from the cache when the file and tool are unchanged."""
+        try:
+            st = path.stat()
+        except OSError:
+            # Missing files aren't cached; the tool reports them itself
+            return compute()
+
+        entry = self._current(str(path), op)
+        if entry and entry["mtime_ns"] == st.st_mtime_ns and entry["size"] == st.st_size:
+            self._count("hits")
+            return json.loads(entry["result"])
+
+        try:
+            content_hash = hashlib.blake2b(path.read_bytes(), digest_size=20).hexdigest()
+        except OSError as e:
+            logger.debug(f"Cannot read {path}: {e}")
+            return compute()
+        return self._resolve(project_id, str(path), op, entry, content_hash, st.st_mtime_ns, st.st_size, compute)
+
+    def lookup_signed(self, key: str, op: str, signature: str) -> Optional[Any]:
+        """
+        Return the cached result for something that isn't a single file (e.g. a
+        project) while signature (e.g. its scan fingerprint) matches, else None.
+        Misses are filled in with store_signed(), so callers can batch them.
+        """
+        entry = self._current(key, op)
+        if entry and entry["content_hash"] == signature:
+            self._count("hits")
+            return json.loads(entry["result"])
+        self._count("misses")
+        return None
+
+    def store_signed(self, project_id: str, key: str, op: str, signature: str, value: Any) -> None:
+        """Record a result computed after a lookup_signed() miss."""
+        if value is None or (isinstance(value, dict) and value.get("error")):
+            return
+        self._store(project_id, key, op, signature, None, None, json.dumps(value))
+
+    def _current(self, path: str, op: str) -> Optional[Dict[str, Any]]:
+        """Look up an entry, evicting it if another tool version wrote it."""
+        with self._lock:
+            entry = self.entries.get((path, op))
+            if entry and entry["tool_version"] != self.version:
+                del self.entries[(path, op)]
+                self.evicted.append((path, op))
+                self.evictions += 1
+                return None
+            return entry
+
+    def _resolve(self, project_id, path, op, entry, content_hash, mtime_ns, size, compute) -> Any:
+        if entry and entry["content_hash"] == content_hash:
+            self._count("hits")
+            result = entry["result"]
+        else:
+            self._count("misses")
+            value = compute()
+            if value is None or (isinstance(value, dict) and value.get("error")):
+                # Failed calls (e.g. a timeout) are retried next time
+                return value
+            result = json.dumps(value)
+        self._store(project_id, path, op, content_hash, mtime_ns, size, result)
+        return json.loads(result)
+
+    def _store(self, project_id, path, op, content_hash, mtime_ns, size, result: str) -> None:
+        entry = {
+            "path": path,
+            "op": op,
+            "project_id": project_id,
+            "tool_version": self.version,
+            "mtime_ns": mtime_ns,
+            "size": size,
+            "content_hash": content_hash,
+            "result": result
+        }
+        with self._lock:
+            self.entries[(path, op)] = entry
+            self.updates.append(entry)
+
+    def _count(self, counter: str) -> None:
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def stats(self) -> Dict[str, int]:
+        """Hit/miss/eviction counters for this run."""
+        return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions}
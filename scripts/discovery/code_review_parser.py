@@ -33,7 +33,15 @@ def parse_code_review(file_path: Path) -> Optional[Dict]:
     
     try:
         content = file_path.read_text(encoding='utf-8')
-        
+    except Exception as e:
+        logger.error(f"Error reading CODE_REVIEW.md at {file_path}: {e}")
+        return None
+    return parse_code_review_content(content)
+
+
+def parse_code_review_content(content: str) -> Optional[Dict]:
+    """Parse CODE_REVIEW.md content (see parse_code_review)."""
+    try:
         # Extract reviewer
         reviewer_match = re.search(r'\*\*Reviewer:\*\*\s*(.+)', content)
         reviewer = reviewer_match.group(1).strip() if reviewer_match else "Unknown"
@@ -112,6 +120,6 @@ def parse_code_review(file_path: Path) -> Optional[Dict]:
         }
         
     except Exception as e:
-        logger.error(f"Error parsing CODE_REVIEW.md at {file_path}: {e}")
+        logger.error(f"Error parsing CODE_REVIEW.md: {e}")
         return None
 
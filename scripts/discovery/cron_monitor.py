@@ -1,11 +1,15 @@
 """Cron job monitoring and failure detection."""
 
+import os
 import sys
 import re
+import shlex
 import subprocess
+import threading
+import time
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 from croniter import croniter
 
 # Add parent directory to path for logger import
@@ -14,14 +18,49 @@ from logger import get_logger
 
 logger = get_logger(__name__)
 
+# How long a crontab snapshot is reused across alert runs / dashboard requests
+CRONTAB_SNAPSHOT_TTL = 30  # seconds
 
-def check_cron_health(project_id: str, cron_jobs: List[Dict[str, str]], project_path: str) -> List[Dict[str, str]]:
+# Interpreters and wrappers: the job is identified by what they run
+GENERIC_EXECUTABLES = {
+    "python", "python3", "bash", "sh", "zsh", "node", "env", "uv", "run", "exec", "nohup"
+}
+COMMAND_SEPARATORS = {"&&", "||", ";", "|", "&"}
+
+# Cron log scanning: only the tail of a log is inspected
+LOG_TAIL_LINES = 100
+LOG_BLOCK_SIZE = 8192
+LOG_MAX_LINE_BYTES = 64 * 1024
+
+TIMESTAMP_PATTERN = re.compile(
+    r'\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}:\d{2}'      # ISO format
+    r'|\w{3} \w{3} \d{1,2} \d{2}:\d{2}:\d{2} \d{4}'  # Cron format
+)
+ERROR_PATTERN = re.compile(r'error|failed|exception|traceback|fatal', re.IGNORECASE)
+
+CRON_SPECIAL_SCHEDULES = {
+    "@yearly", "@annually", "@monthly", "@weekly", "@daily", "@midnight", "@hourly", "@reboot"
+}
+
+
+def check_cron_health(
+    project_id: str,
+    cron_jobs: List[Dict[str, str]],
+    project_path: str,
+    snapshot: Optional["CrontabSnapshot"] = None,
+    log_states: Optional[Dict[str, Dict[str, Any]]] = None
+) -> List[Dict[str, str]]:
     """
     Check health of cron jobs for a project.
     
+    Pass a CrontabSnapshot to share one `crontab -l` across projects, and a
+    {log_path: state} dict to resume log reads from the last byte offset
+    (the dict is updated in place).
     Returns list of issues found (empty if all healthy).
     """
     issues = []
+    if snapshot is None:
+        snapshot = get_crontab_snapshot()
     
     for job in cron_jobs:
         schedule = job.get("schedule", "")
@@ -43,7 +82,7 @@ def check_cron_health(project_id: str, cron_jobs: List[Dict[str, str]], project_
             continue
         
         # Check if job is in user's crontab
-        is_installed, crontab_entry = check_crontab_installed(command)
+        is_installed, crontab_entry = check_crontab_installed(command, snapshot)
         if not is_installed:
             issues.append({
                 "type": "not_installed",
@@ -57,7 +96,8 @@ def check_cron_health(project_id: str, cron_jobs: List[Dict[str, str]], project_
         # Check for log file
         log_file = find_log_file(project_path, command)
         if log_file:
-            last_run, status = check_log_file(log_file)
+            state = log_states.setdefault(str(log_file), {}) if log_states is not None else None
+            last_run, status = check_log_file(log_file, state)
             
             if last_run:
                 expected_run = get_expected_next_run(schedule, last_run)
@@ -94,7 +134,7 @@ def is_valid_cron(schedule: str) -> bool:
     try:
         # Handle special cases
         if schedule.startswith("@"):
-            return schedule in ["@yearly", "@annually", "@monthly", "@weekly", "@daily", "@midnight", "@hourly", "@reboot"]
+            return schedule in CRON_SPECIAL_SCHEDULES
         
         # Validate standard cron expression
         croniter(schedule)
@@ -104,32 +144,166 @@ def is_valid_cron(schedule: str) -> bool:
         return False
 
 
-def check_crontab_installed(command: str) -> Tuple[bool, Optional[str]]:
-    """Check if command is in user's crontab."""
+def _command_target(command: str) -> Optional[str]:
+    """
+    Return the basename of the script or binary a command executes.
+
+    That's the first word that isn't an interpreter, option or VAR=value
+    assignment; `cd` steps and redirect targets are skipped, so log files
+    and working directories never identify a job.
+    """
     try:
-        result = subprocess.run(
-            ["crontab", "-l"],
-            capture_output=True,
-            text=True,
-            timeout=5
-        )
+        lexer = shlex.shlex(command, posix=True, punctuation_chars=True)
+        lexer.whitespace_split = True
+        words = list(lexer)
+    except ValueError:
+        words = command.split()
+    
+    skip_next = in_cd = False
+    for word in words:
+        if skip_next:
+            skip_next = False
+            continue
+        if word in COMMAND_SEPARATORS:
+            in_cd = False
+            continue
+        if in_cd:
+            continue
+        if word and set(word) <= set("<>&") and ("<" in word or ">" in word):
+            # Redirect operator: its target is the next word
+            skip_next = True
+            continue
+        if word == "cd":
+            in_cd = True
+            continue
+        if not word or word.startswith("-") or re.match(r"^[A-Za-z_][A-Za-z0-9_]*=", word):
+            continue
+        name = Path(word).name
+        if name in GENERIC_EXECUTABLES or re.fullmatch(r"python[\d.]*", name):
+            continue
+        return name or None
+    return None
+
+
+class CrontabSnapshot:
+    """One parsed `crontab -l`, indexed for constant-time job lookups."""
+    
+    def __init__(self, crontab_text: str = "", available: bool = True):
+        self.available = available
+        self.entries: List[Dict[str, str]] = []
+        self._by_command: Dict[str, int] = {}
+        self._by_target: Dict[str, List[int]] = {}
         
-        if result.returncode != 0:
-            return False, None
+        for line in crontab_text.split('\n'):
+            entry = self._parse_line(line)
+            if not entry:
+                continue
+            index = len(self.entries)
+            self.entries.append(entry)
+            self._by_command.setdefault(" ".join(entry["command"].split()), index)
+            target = _command_target(entry["command"])
+            if target:
+                self._by_target.setdefault(target, []).append(index)
+    
+    @staticmethod
+    def _parse_line(line: str) -> Optional[Dict[str, str]]:
+        """Split a crontab line into schedule and command; skips comments and env assignments."""
+        line = line.strip()
+        if not line or line.startswith('#'):
+            return None
         
-        crontab = result.stdout
+        parts = line.split()
+        if parts[0].startswith('@'):
+            if parts[0] not in CRON_SPECIAL_SCHEDULES or len(parts) < 2:
+                return None
+            schedule, command = parts[0], line.split(None, 1)[1]
+        else:
+            # VAR=value lines configure the environment, they aren't jobs
+            if '=' in parts[0] or len(parts) < 6:
+                return None
+            schedule = " ".join(parts[:5])
+            command = line.split(None, 5)[5]
         
-        # Look for command in crontab (may be wrapped in different ways)
-        for line in crontab.split('\n'):
-            if line.strip().startswith('#'):
-                continue
-            if command in line or Path(command).name in line:
-                return True, line.strip()
+        executable = command.split()[0] if command.split() else ""
+        return {
+            "schedule": schedule,
+            "command": command,
+            "executable": Path(executable).name,
+            "line": line
+        }
+    
+    @classmethod
+    def load(cls) -> "CrontabSnapshot":
+        """Read the current user's crontab."""
+        try:
+            result = subprocess.run(
+                ["crontab", "-l"],
+                capture_output=True,
+                text=True,
+                timeout=5
+            )
+        except Exception as e:
+            logger.warning(f"Failed to read crontab: {e}")
+            return cls(available=False)
         
-        return False, None
-    except Exception as e:
-        logger.warning(f"Failed to check crontab for command '{command}': {e}")
-        return False, None
+        if result.returncode != 0:
+            # No crontab for this user
+            return cls()
+        
+        return cls(result.stdout)
+    
+    def find(self, command: str) -> Optional[Dict[str, str]]:
+        """Find the crontab entry running a tracked command, if any."""
+        index = self._by_command.get(" ".join(command.split()))
+        if index is not None:
+            return self.entries[index]
+        
+        # Fall back to the script/binary the command executes
+        target = _command_target(command)
+        indexes = self._by_target.get(target) if target else None
+        return self.entries[indexes[0]] if indexes else None
+    
+    def untracked_entries(self, commands: List[str]) -> List[Dict[str, str]]:
+        """Return crontab entries that don't match any of the tracked commands."""
+        matched = set()
+        for command in commands:
+            entry = self.find(command)
+            if entry is not None:
+                matched.add(entry["line"])
+        return [entry for entry in self.entries if entry["line"] not in matched]
+
+
+_snapshot_lock = threading.Lock()
+_snapshot_cache: Dict[str, Any] = {"snapshot": None, "loaded_at": 0.0}
+
+
+def get_crontab_snapshot(max_age: float = CRONTAB_SNAPSHOT_TTL) -> CrontabSnapshot:
+    """Return a crontab snapshot shared across callers, reloaded after max_age seconds."""
+    with _snapshot_lock:
+        snapshot = _snapshot_cache["snapshot"]
+        if snapshot is None or time.monotonic() - _snapshot_cache["loaded_at"] > max_age:
+            snapshot = CrontabSnapshot.load()
+            _snapshot_cache["snapshot"] = snapshot
+            _snapshot_cache["loaded_at"] = time.monotonic()
+        return snapshot
+
+
+def check_crontab_installed(command: str, snapshot: Optional[CrontabSnapshot] = None) -> Tuple[bool, Optional[str]]:
+    """Check if command is in user's crontab."""
+    if snapshot is None:
+        snapshot = get_crontab_snapshot()
+    
+    entry = snapshot.find(command)
+    if entry:
+        return True, entry["line"]
+    return False, None
+
+
+def find_untracked_entries(cron_jobs: List[Dict[str, str]], snapshot: Optional[CrontabSnapshot] = None) -> List[Dict[str, str]]:
+    """List crontab entries that no tracked cron job accounts for."""
+    if snapshot is None:
+        snapshot = get_crontab_snapshot()
+    return snapshot.untracked_entries([job["command"] for job in cron_jobs if job.get("command")])
 
 
 def find_log_file(project_path: str, command: str) -> Optional[Path]:
@@ -153,60 +327,96 @@ def find_log_file(project_path: str, command: str) -> Optional[Path]:
     return None
 
 
-def check_log_file(log_path: Path) -> Tuple[Optional[datetime], Optional[str]]:
+def read_lines_reversed(log_path: Path, stop_offset: int = 0, block_size: int = LOG_BLOCK_SIZE) -> Iterator[str]:
+    """
+    Yield lines of a file from the end backwards, reading fixed-size blocks.
+    
+    Stops at byte offset stop_offset, so only bytes appended since a previous
+    read are visited. Memory stays bounded by the block size (plus one line,
+    capped at LOG_MAX_LINE_BYTES).
+    """
+    with open(log_path, "rb") as f:
+        f.seek(0, os.SEEK_END)
+        position = f.tell()
+        fragment = b""
+        
+        while position > stop_offset:
+            read_size = min(block_size, position - stop_offset)
+            position -= read_size
+            f.seek(position)
+            block = f.read(read_size) + fragment
+            
+            lines = block.split(b"\n")
+            # The first piece may continue in the previous block
+            fragment = lines.pop(0)
+            for line in reversed(lines):
+                yield line.decode("utf-8", errors="replace")
+            
+            if len(fragment) > LOG_MAX_LINE_BYTES:
+                yield fragment[-LOG_MAX_LINE_BYTES:].decode("utf-8", errors="replace")
+                fragment = b""
+        
+        if fragment:
+            yield fragment.decode("utf-8", errors="replace")
+
+
+def check_log_file(log_path: Path, state: Optional[Dict[str, Any]] = None) -> Tuple[Optional[datetime], Optional[str]]:
     """
     Check log file for last run and status.
     
+    Only the last LOG_TAIL_LINES lines are read, backwards from EOF. When a
+    state dict from a previous check is given (see DatabaseManager.get_log_states),
+    only bytes appended since then are read and the dict is updated in place.
+    
     Returns (last_run_time, status) where status is 'success' or 'error'
     """
     try:
-        content = log_path.read_text()
-        lines = content.split('\n')
+        st = log_path.stat()
+        
+        # Resume from the previous offset unless the log was rotated or truncated
+        previous = None
+        stop_offset = 0
+        if state and state.get("inode") == st.st_ino and state.get("offset", 0) <= st.st_size:
+            previous = state
+            stop_offset = state["offset"]
         
-        # Look for timestamp patterns and error indicators
         last_timestamp = None
         last_status = "success"
-        
-        # Common timestamp patterns
-        timestamp_patterns = [
-            r'\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}:\d{2}',  # ISO format
-            r'\w{3} \w{3} \d{1,2} \d{2}:\d{2}:\d{2} \d{4}',  # Cron format
-        ]
-        
-        # Error patterns
-        error_patterns = [
-            r'error',
-            r'failed',
-            r'exception',
-            r'traceback',
-            r'fatal',
-        ]
+        lines_read = 0
         
         # Parse from end of file (most recent)
-        for line in reversed(lines[-100:]):  # Check last 100 lines
+        for line in read_lines_reversed(log_path, stop_offset):
+            lines_read += 1
+            if lines_read > LOG_TAIL_LINES:
+                break
+            
             # Check for errors
-            if not last_timestamp or last_status == "success":
-                for pattern in error_patterns:
-                    if re.search(pattern, line, re.IGNORECASE):
-                        last_status = "error"
-                        break
+            if last_status == "success" and ERROR_PATTERN.search(line):
+                last_status = "error"
             
             # Look for timestamp
-            if not last_timestamp:
-                for pattern in timestamp_patterns:
-                    match = re.search(pattern, line)
-                    if match:
-                        try:
-                            timestamp_str = match.group(0)
-                            # Try to parse it
-                            last_timestamp = parse_timestamp(timestamp_str)
-                            break
-                        except Exception as e:
-                            logger.debug(f"Failed to parse timestamp '{timestamp_str}': {e}")
-                            continue
-            
-            if last_timestamp:
-                break
+            match = TIMESTAMP_PATTERN.search(line)
+            if match:
+                try:
+                    last_timestamp = parse_timestamp(match.group(0))
+                    break
+                except Exception as e:
+                    logger.debug(f"Failed to parse timestamp '{match.group(0)}': {e}")
+        
+        # Nothing newer than the last check: carry its result forward
+        if last_timestamp is None and previous and lines_read <= LOG_TAIL_LINES:
+            if previous.get("last_run"):
+                last_timestamp = datetime.fromisoformat(previous["last_run"])
+            if previous.get("status") == "error":
+                last_status = "error"
+        
+        if state is not None:
+            state.update({
+                "inode": st.st_ino,
+                "offset": st.st_size,
+                "last_run": last_timestamp.isoformat() if last_timestamp else None,
+                "status": last_status
+            })
         
         return last_timestamp, last_status
     except Exception as e:
@@ -0,0 +1,66 @@
+"""Cheap per-project fingerprints for incremental scanning."""
+
+import hashlib
+import sys
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+# Add parent directory to path for logger import
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+from logger import get_logger
+
+logger = get_logger(__name__)
+
+# Files whose content drives extract_project_metadata
+FINGERPRINT_FILES = ["TODO.md", "README.md", "CODE_REVIEW.md"]
+
+
+def _stat_signature(path: Path) -> Optional[Tuple[int, int]]:
+    """Return (mtime_ns, size) for a path, or None if it doesn't exist."""
+    try:
+        st = path.stat()
+        return (st.st_mtime_ns, st.st_size)
+    except OSError:
+        return None
+
+
+def _git_ref_paths(project_path: Path) -> List[Path]:
+    """Return .git/HEAD plus the file holding the ref HEAD points at."""
+    git_dir = project_path / ".git"
+    head_path = git_dir / "HEAD"
+    paths = [head_path]
+
+    try:
+        head = head_path.read_text().strip()
+    except OSError:
+        return paths
+
+    if head.startswith("ref:"):
+        ref_name = head[4:].strip()
+        ref_path = git_dir / ref_name
+        # Refs that were packed by `git gc` live in packed-refs instead
+        paths.append(ref_path if ref_path.exists() else git_dir / "packed-refs")
+
+    return paths
+
+
+def compute_fingerprint(project_path: Path) -> str:
+    """
+    Compute a fingerprint from the stat signatures of the files the scanner reads.
+
+    Covers the project directory itself (entries added/removed), TODO.md,
+    README.md, CODE_REVIEW.md, 00_Index_*.md, .git/HEAD and the current ref.
+    Only stat() calls are made; file contents are never read except HEAD.
+    """
+    parts = [("dir", _stat_signature(project_path))]
+
+    for name in FINGERPRINT_FILES:
+        parts.append((name, _stat_signature(project_path / name)))
+
+    for index_file in sorted(project_path.glob("00_Index_*.md")):
+        parts.append((index_file.name, _stat_signature(index_file)))
+
+    for ref_path in _git_ref_paths(project_path):
+        parts.append((str(ref_path.relative_to(project_path)), _stat_signature(ref_path)))
+
+    return hashlib.sha1(repr(parts).encode("utf-8")).hexdigest()
@@ -4,7 +4,10 @@ import sys
 import subprocess
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Optional
+from typing import Dict, Optional, Tuple
+
+from .git_reader import GitReadError, find_git_dir, read_last_commit_date, ref_cache_key
+from .project_walker import walk_project
 
 # Add parent directory to path for logger import
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
@@ -12,14 +15,39 @@ from logger import get_logger
 
 logger = get_logger(__name__)
 
+# {git_dir: (ref_cache_key, commit_date)}
+_commit_date_cache: Dict[str, Tuple[tuple, Optional[str]]] = {}
+
 
 def get_last_commit_date(project_path: Path) -> Optional[str]:
-    """Get last commit date from git."""
-    git_dir = project_path / ".git"
+    """Get last commit date from git.
+    
+    Reads the repository in-process and caches the result per repo, keyed on
+    the mtimes of HEAD and the ref it points at. The git executable is only
+    used when the commit can't be read directly (e.g. a delta-packed object).
+    """
+    git_dir = find_git_dir(project_path)
     
-    if not git_dir.exists():
+    if git_dir is None:
         return None
     
+    cache_key = ref_cache_key(git_dir)
+    cached = _commit_date_cache.get(str(git_dir))
+    if cached and cached[0] == cache_key:
+        return cached[1]
+    
+    try:
+        commit_date = read_last_commit_date(git_dir)
+    except GitReadError as e:
+        logger.debug(f"In-process git read failed for {project_path}, using git log: {e}")
+        commit_date = get_last_commit_date_subprocess(project_path)
+    
+    _commit_date_cache[str(git_dir)] = (cache_key, commit_date)
+    return commit_date
+
+
+def get_last_commit_date_subprocess(project_path: Path) -> Optional[str]:
+    """Get last commit date by running `git log`."""
     try:
         result = subprocess.run(
             ["git", "log", "-1", "--format=%cI"],
@@ -44,35 +72,31 @@ def get_last_commit_date(project_path: Path) -> Optional[str]:
     return None
 
 
-def get_last_modified_fallback(project_path: Path) -> str:
-    """Fallback to file modification times if git fails."""
+def get_last_modified_fallback(project_path: Path, newest_mtime: Optional[float] = None) -> str:
+    """Fallback to file modification times if git fails.
+
+    Pass newest_mtime when the caller already walked the project to avoid
+    a second traversal.
+    """
     try:
-        # Get all files (excluding common directories)
-        files = []
-        for item in project_path.rglob("*"):
-            if item.is_file():
-                # Skip common non-project directories
-                if any(part in [".git", "node_modules", "__pycache__", "venv", ".DS_Store"] 
-                       for part in item.parts):
-                    continue
-                files.append(item)
+        if newest_mtime is None:
+            newest_mtime = walk_project(project_path)["newest_mtime"]
         
-        if files:
-            most_recent = max(f.stat().st_mtime for f in files)
-            return datetime.fromtimestamp(most_recent, tz=timezone.utc).isoformat()
+        if newest_mtime is not None:
+            return datetime.fromtimestamp(newest_mtime, tz=timezone.utc).isoformat()
     except Exception as e:
         logger.warning(f"Failed to get file modification times for {project_path}: {e}")
     
     return datetime.now(timezone.utc).isoformat()
 
 
-def get_last_modified(project_path: Path) -> str:
+def get_last_modified(project_path: Path, newest_mtime: Optional[float] = None) -> str:
     """Get last modified timestamp (latest of git commit or file edit)."""
     # Get git date if available
     git_date = get_last_commit_date(project_path)
     
     # Get file system date
-    fs_date = get_last_modified_fallback(project_path)
+    fs_date = get_last_modified_fallback(project_path, newest_mtime)
     
     # If no git date, return fs date
     if not git_date:
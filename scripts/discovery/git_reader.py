@@ -0,0 +1,270 @@
+"""Minimal in-process reader for git refs and commit objects.
+
+Resolves HEAD through loose refs and packed-refs, then inflates the commit
+object either from a loose object file or from a pack (via its .idx). Only
+what the scanner needs is implemented; anything unusual (delta-compressed
+pack entries, alternates, exotic index versions) raises GitReadError so the
+caller can fall back to the git executable.
+"""
+
+import struct
+import sys
+import zlib
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Optional, Tuple
+
+# Add parent directory to path for logger import
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+from logger import get_logger
+
+logger = get_logger(__name__)
+
+PACK_IDX_MAGIC = b"\377tOc"
+PACK_OBJ_TYPES = {1: "commit", 2: "tree", 3: "blob", 4: "tag"}
+MAX_SYMREF_DEPTH = 5
+
+
+class GitReadError(Exception):
+    """Raised when the repository can't be read without the git executable."""
+
+
+def find_git_dir(project_path: Path) -> Optional[Path]:
+    """Return the git directory for a project, following `.git` files (worktrees, submodules)."""
+    dot_git = project_path / ".git"
+
+    if dot_git.is_dir():
+        return dot_git
+
+    if dot_git.is_file():
+        try:
+            content = dot_git.read_text().strip()
+        except OSError:
+            return None
+        if content.startswith("gitdir:"):
+            git_dir = Path(content[len("gitdir:"):].strip())
+            if not git_dir.is_absolute():
+                git_dir = (project_path / git_dir).resolve()
+            return git_dir if git_dir.is_dir() else None
+
+    return None
+
+
+def get_common_dir(git_dir: Path) -> Path:
+    """Return the directory holding shared refs/objects (differs for linked worktrees)."""
+    commondir_file = git_dir / "commondir"
+    try:
+        common = Path(commondir_file.read_text().strip())
+    except OSError:
+        return git_dir
+    return common if common.is_absolute() else (git_dir / common).resolve()
+
+
+def _ref_file(git_dir: Path, ref_name: str) -> Path:
+    """Return the loose ref path for a ref name (per-worktree refs stay in git_dir)."""
+    if ref_name.startswith("refs/"):
+        return get_common_dir(git_dir) / ref_name
+    return git_dir / ref_name
+
+
+def _read_packed_ref(common_dir: Path, ref_name: str) -> Optional[str]:
+    """Look up a ref in packed-refs."""
+    packed = common_dir / "packed-refs"
+    try:
+        with open(packed, "r") as f:
+            for line in f:
+                if line.startswith("#") or line.startswith("^"):
+                    continue
+                parts = line.strip().split(" ", 1)
+                if len(parts) == 2 and parts[1] == ref_name:
+                    return parts[0]
+    except FileNotFoundError:
+        return None
+    except OSError as e:
+        raise GitReadError(f"Cannot read {packed}: {e}")
+    return None
+
+
+def resolve_head(git_dir: Path) -> Optional[str]:
+    """
+    Resolve HEAD to a commit id.
+
+    Returns None for an unborn branch (repository without commits).
+    """
+    try:
+        value = (git_dir / "HEAD").read_text().strip()
+    except OSError as e:
+        raise GitReadError(f"Cannot read HEAD: {e}")
+
+    for _ in range(MAX_SYMREF_DEPTH):
+        if not value.startswith("ref:"):
+            return value
+
+        ref_name = value[len("ref:"):].strip()
+        try:
+            value = _ref_file(git_dir, ref_name).read_text().strip()
+        except FileNotFoundError:
+            return _read_packed_ref(get_common_dir(git_dir), ref_name)
+        except OSError as e:
+            raise GitReadError(f"Cannot read ref {ref_name}: {e}")
+
+    raise GitReadError("Symbolic ref chain too deep")
+
+
+def ref_cache_key(git_dir: Path) -> Tuple[Optional[int], ...]:
+    """Return mtimes of the files HEAD resolution depends on, for cache invalidation."""
+    common_dir = get_common_dir(git_dir)
+    paths = [git_dir / "HEAD", common_dir / "packed-refs"]
+
+    try:
+        head = paths[0].read_text().strip()
+        if head.startswith("ref:"):
+            paths.append(_ref_file(git_dir, head[len("ref:"):].strip()))
+    except OSError:
+        pass
+
+    key = []
+    for path in paths:
+        try:
+            key.append(path.stat().st_mtime_ns)
+        except OSError:
+            key.append(None)
+    return tuple(key)
+
+
+def _read_loose_object(common_dir: Path, sha: str) -> Optional[Tuple[str, bytes]]:
+    """Inflate a loose object; returns (type, body) or None if not present."""
+    path = common_dir / "objects" / sha[:2] / sha[2:]
+    try:
+        raw = zlib.decompress(path.read_bytes())
+    except FileNotFoundError:
+        return None
+    except (OSError, zlib.error) as e:
+        raise GitReadError(f"Cannot inflate loose object {sha}: {e}")
+
+    header, _, body = raw.partition(b"\0")
+    obj_type = header.split(b" ", 1)[0].decode("ascii", "replace")
+    return obj_type, body
+
+
+def _find_pack_offset(idx_path: Path, sha_bytes: bytes) -> Optional[int]:
+    """Binary-search a version 2 pack index for an object; returns its pack offset."""
+    hash_size = len(sha_bytes)
+
+    with open(idx_path, "rb") as f:
+        header = f.read(8)
+        if header[:4] != PACK_IDX_MAGIC or struct.unpack(">I", header[4:8])[0] != 2:
+            raise GitReadError(f"Unsupported pack index format: {idx_path.name}")
+
+        fanout = struct.unpack(">256I", f.read(1024))
+        total = fanout[255]
+        first = sha_bytes[0]
+        lo = fanout[first - 1] if first else 0
+        hi = fanout[first]
+
+        names_start = 8 + 1024
+        while lo < hi:
+            mid = (lo + hi) // 2
+            f.seek(names_start + mid * hash_size)
+            name = f.read(hash_size)
+            if name < sha_bytes:
+                lo = mid + 1
+            elif name > sha_bytes:
+                hi = mid
+            else:
+                # Skip past names and CRC32 table to the 4-byte offsets
+                offsets_start = names_start + total * hash_size + total * 4
+                f.seek(offsets_start + mid * 4)
+                offset = struct.unpack(">I", f.read(4))[0]
+                if offset & 0x80000000:
+                    f.seek(offsets_start + total * 4 + (offset & 0x7FFFFFFF) * 8)
+                    offset = struct.unpack(">Q", f.read(8))[0]
+                return offset
+
+    return None
+
+
+def _read_pack_entry(pack_path: Path, offset: int) -> Tuple[str, bytes]:
+    """Inflate a non-delta object stored at offset in a pack file."""
+    with open(pack_path, "rb") as f:
+        f.seek(offset)
+        c = f.read(1)[0]
+        type_num = (c >> 4) & 7
+        while c & 0x80:
+            c = f.read(1)[0]
+
+        obj_type = PACK_OBJ_TYPES.get(type_num)
+        if obj_type is None:
+            # OFS_DELTA / REF_DELTA would need the base chain applied
+            raise GitReadError(f"Delta-compressed pack entry at {offset} in {pack_path.name}")
+
+        inflater = zlib.decompressobj()
+        chunks = []
+        while not inflater.eof:
+            data = f.read(16384)
+            if not data:
+                raise GitReadError(f"Truncated pack entry at {offset} in {pack_path.name}")
+            chunks.append(inflater.decompress(data))
+        return obj_type, b"".join(chunks)
+
+
+def read_object(git_dir: Path, sha: str) -> Tuple[str, bytes]:
+    """Read an object by id from loose objects or packs; returns (type, body)."""
+    common_dir = get_common_dir(git_dir)
+
+    loose = _read_loose_object(common_dir, sha)
+    if loose is not None:
+        return loose
+
+    try:
+        sha_bytes = bytes.fromhex(sha)
+    except ValueError:
+        raise GitReadError(f"Invalid object id: {sha!r}")
+
+    pack_dir = common_dir / "objects" / "pack"
+    try:
+        for idx_path in pack_dir.glob("*.idx"):
+            offset = _find_pack_offset(idx_path, sha_bytes)
+            if offset is not None:
+                return _read_pack_entry(idx_path.with_suffix(".pack"), offset)
+    except (OSError, struct.error, IndexError, zlib.error) as e:
+        raise GitReadError(f"Cannot read pack for {sha}: {e}")
+
+    raise GitReadError(f"Object {sha} not found in loose objects or packs")
+
+
+def parse_committer_date(commit_body: bytes) -> str:
+    """Parse the committer timestamp of a commit into strict ISO 8601 (like `git log --format=%cI`)."""
+    for line in commit_body.split(b"\n"):
+        if not line:
+            # End of headers
+            break
+        if line.startswith(b"committer "):
+            _, timestamp, tz = line.rsplit(b" ", 2)
+            tz = tz.decode("ascii")
+            sign = -1 if tz.startswith("-") else 1
+            offset = timedelta(hours=int(tz[1:3]), minutes=int(tz[3:5])) * sign
+            return datetime.fromtimestamp(int(timestamp), tz=timezone(offset)).isoformat()
+
+    raise GitReadError("Commit has no committer header")
+
+
+def read_last_commit_date(git_dir: Path) -> Optional[str]:
+    """
+    Return the committer date of HEAD without running git.
+
+    Returns None if the repository has no commits. Raises GitReadError when
+    the commit can't be read in-process.
+    """
+    sha = resolve_head(git_dir)
+    if not sha:
+        return None
+
+    obj_type, body = read_object(git_dir, sha)
+    if obj_type != "commit":
+        raise GitReadError(f"HEAD points at a {obj_type}, not a commit")
+
+    try:
+        return parse_committer_date(body)
+    except (ValueError, IndexError) as e:
+        raise GitReadError(f"Malformed committer header: {e}")
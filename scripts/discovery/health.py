@@ -0,0 +1,102 @@
+"""Native project health scoring (used when the audit binary isn't available)."""
+
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from .git_metadata import get_last_modified
+from .index_validator import check_index_file
+from .todo_parser import has_entries, parse_todo
+
+# Add parent directory to path for logger import
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+from logger import get_logger
+
+logger = get_logger(__name__)
+
+# Signal -> points; the weights add up to 100
+HEALTH_WEIGHTS = {
+    "has_index": 20,
+    "index_is_valid": 20,
+    "has_todo": 20,
+    "has_readme": 10,
+    "unblocked": 15,
+    "active": 15,
+}
+
+# Minimum score per grade, best first
+GRADE_THRESHOLDS = [(90, "A"), (80, "B"), (70, "C"), (60, "D")]
+
+# Same threshold as detect_stalled_projects
+ACTIVE_DAYS = 60
+
+
+def grade_for(score: int) -> str:
+    """Map a 0-100 score to an A-F grade."""
+    for minimum, grade in GRADE_THRESHOLDS:
+        if score >= minimum:
+            return grade
+    return "F"
+
+
+def score_health(signals: Dict[str, Any]) -> Dict[str, Any]:
+    """Return {"score", "grade"} for a dict of boolean signals (see HEALTH_WEIGHTS)."""
+    score = sum(points for signal, points in HEALTH_WEIGHTS.items() if signals.get(signal))
+    return {"score": score, "grade": grade_for(score)}
+
+
+def is_active(last_modified: Optional[str], now: Optional[datetime] = None) -> bool:
+    """True if an ISO last_modified timestamp is within ACTIVE_DAYS (i.e. not stalled)."""
+    if not last_modified:
+        return False
+    try:
+        last_mod = datetime.fromisoformat(last_modified.replace('Z', '+00:00'))
+    except ValueError:
+        logger.debug(f"Failed to parse last_modified: {last_modified!r}")
+        return False
+    if now is None:
+        now = datetime.now(last_mod.tzinfo) if last_mod.tzinfo else datetime.now()
+    return last_mod >= now - timedelta(days=ACTIVE_DAYS)
+
+
+def health_signals(project: Dict[str, Any], now: Optional[datetime] = None) -> Dict[str, bool]:
+    """
+    Gather health signals from a scanned project (see extract_project_metadata).
+    
+    Nothing is read from disk: the scan already parsed the index, TODO.md
+    and README.md. Activity is judged by last_modified, as the stalled
+    alert does.
+    """
+    has_todo = bool(project.get("has_todo"))
+    return {
+        "has_index": bool(project.get("has_index")),
+        "index_is_valid": bool(project.get("index_is_valid")),
+        "has_todo": has_todo,
+        "has_readme": bool(project.get("has_readme")),
+        "unblocked": has_todo and not has_entries(project.get("blockers", [])),
+        "active": is_active(project.get("last_modified"), now),
+    }
+
+
+def collect_health_signals(project_path: Path, now: Optional[datetime] = None) -> Dict[str, bool]:
+    """
+    Gather health signals for a bare project directory.
+    
+    Fallback for callers without a scanned project: reads the index and
+    TODO.md and looks up last_modified, then scores like health_signals.
+    """
+    project = {"last_modified": get_last_modified(project_path)}
+    
+    index_files = sorted(project_path.glob("00_Index_*.md"))
+    if index_files:
+        project["has_index"] = True
+        project["index_is_valid"] = not check_index_file(index_files[0])
+    
+    todo_path = project_path / "TODO.md"
+    if todo_path.is_file():
+        project["has_todo"] = True
+        project["blockers"] = parse_todo(todo_path).get("blockers", [])
+    
+    project["has_readme"] = (project_path / "README.md").is_file()
+    return health_signals(project, now)
@@ -0,0 +1,59 @@
+"""Validation of project index files (00_Index_*.md) per Critical Rule #0."""
+
+import sys
+from pathlib import Path
+from typing import List
+
+# Add parent directory to path for logger import
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+from logger import get_logger
+
+logger = get_logger(__name__)
+
+REQUIRED_TAGS = ["map/project", "p/", "type/", "domain/", "status/", "tech/"]
+REQUIRED_SECTIONS = ["Key Components", "Status"]
+
+
+def check_index_content(content: str) -> List[str]:
+    """Return the problems found in an index file's content (empty if valid)."""
+    # Check for YAML frontmatter
+    if not content.strip().startswith('---'):
+        return ["Missing YAML frontmatter"]
+    
+    issues = []
+    
+    # Check for required tags
+    tags_section = content.split('---')[1]
+    for tag in REQUIRED_TAGS:
+        if tag not in tags_section:
+            issues.append(f"Missing tag: {tag}")
+    
+    # Check for required sections (case-insensitive and partial match)
+    content_upper = content.upper()
+    headings = [line.upper() for line in content.split('\n') if line.startswith('##')]
+    for section in REQUIRED_SECTIONS:
+        if f"## {section.upper()}" not in content_upper and f"### {section.upper()}" not in content_upper:
+            # Also check for variants with icons like "## 🎯 Status"
+            if not any(section.upper() in heading for heading in headings):
+                issues.append(f"Missing section: {section}")
+    
+    return issues
+
+
+def check_index_file(index_path: Path) -> List[str]:
+    """Return the problems found in an index file; unreadable files are one issue."""
+    try:
+        return check_index_content(index_path.read_text())
+    except Exception as e:
+        logger.warning(f"Error validating index file {index_path}: {e}")
+        return [f"Cannot read index file: {e}"]
+
+
+def validate_index_file(index_path: Path) -> bool:
+    """Basic validation of index file according to Critical Rule #0."""
+    return not check_index_file(index_path)
+
+
+def validate_index_content(content: str) -> bool:
+    """validate_index_file for content that has already been read."""
+    return not check_index_content(content)
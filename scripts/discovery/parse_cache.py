@@ -0,0 +1,92 @@
+"""Content-addressed cache for parsed project files (TODO, CODE_REVIEW, index)."""
+
+import hashlib
+import json
+import sys
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Add parent directory to path for logger import
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+from logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class ParseCache:
+    """
+    Parser results keyed by (path, parser name).
+
+    An entry is reused when the file's (mtime_ns, size) matches; otherwise the
+    file is read once and hashed, and the entry is reused if the content is
+    unchanged (e.g. after a checkout or touch). Only on a content change is
+    the parser run, on the text already read; parsers take content, not paths.
+
+    entries: {(path, parser): entry} as returned by DatabaseManager.get_parse_cache().
+    New or revalidated entries are collected in `updates` for the caller to
+    persist; `used` holds every entry consulted, grouped by project, and
+    `contents` the text of files that had to be read.
+    """
+
+    def __init__(self, entries: Optional[Dict[Tuple[str, str], Dict[str, Any]]] = None):
+        self.entries = entries or {}
+        self.updates: List[Dict[str, Any]] = []
+        self.used: Dict[str, List[Dict[str, Any]]] = {}
+        self.contents: Dict[str, str] = {}
+        # path -> (mtime_ns, size, content_hash) of files read this run, so a
+        # second parser of the same file (e.g. the index) doesn't read it again
+        self._hashes: Dict[str, Tuple[int, int, str]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, project_id: str, path: Path, parser: str, parse_fn: Callable[[str], Any],
+            default: Any = None) -> Any:
+        """Return parse_fn(content of path), from the cache when the file hasn't changed.
+
+        default is returned (uncached) when the file can't be stat'ed or read.
+        """
+        key = (str(path), parser)
+        try:
+            st = path.stat()
+        except OSError:
+            return default
+
+        entry = self.entries.get(key)
+        if entry and entry["mtime_ns"] == st.st_mtime_ns and entry["size"] == st.st_size:
+            self.hits += 1
+            self.used.setdefault(project_id, []).append(entry)
+            return json.loads(entry["result"])
+
+        known = self._hashes.get(str(path))
+        if known and known[:2] == (st.st_mtime_ns, st.st_size):
+            content_hash = known[2]
+        else:
+            try:
+                content = path.read_bytes()
+            except OSError as e:
+                logger.debug(f"Cannot read {path}: {e}")
+                return default
+            content_hash = hashlib.sha1(content).hexdigest()
+            self.contents[str(path)] = content.decode("utf-8", errors="replace")
+            self._hashes[str(path)] = (st.st_mtime_ns, st.st_size, content_hash)
+
+        if entry and entry["content_hash"] == content_hash:
+            self.hits += 1
+            result = entry["result"]
+        else:
+            self.misses += 1
+            result = json.dumps(parse_fn(self.contents[str(path)]))
+
+        entry = {
+            "project_id": project_id,
+            "path": str(path),
+            "parser": parser,
+            "mtime_ns": st.st_mtime_ns,
+            "size": st.st_size,
+            "content_hash": content_hash,
+            "result": result
+        }
+        self.entries[key] = entry
+        self.updates.append(entry)
+        self.used.setdefault(project_id, []).append(entry)
+        return json.loads(result)
@@ -1,15 +1,23 @@
 """Project scanner for auto-discovery."""
 
+import os
 import sys
 import yaml
 from pathlib import Path
-from typing import List, Dict, Any, Optional, Union
-from datetime import datetime
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import List, Dict, Any, Callable, Iterable, Iterator, Optional, Union
+from datetime import date, datetime
+from concurrent.futures import FIRST_COMPLETED, Executor, ProcessPoolExecutor, ThreadPoolExecutor, as_completed, wait
 
 from .git_metadata import get_last_modified
-from .todo_parser import parse_todo
-from .providers import get_provider
+from .fingerprint import compute_fingerprint
+from .project_walker import walk_project, should_skip_directory
+from .todo_parser import assign_task_ids, parse_todo_content, task_id
+from .check_cache import CheckCache
+from .code_review_parser import parse_code_review_content
+from .index_validator import validate_index_content
+from .parse_cache import ParseCache
+from .search_index import collect_documents
+from .providers import MetadataProvider, get_provider, is_single_project
 
 # Add parent directory to path for config and logger imports
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
@@ -19,18 +27,33 @@ from logger import get_logger
 logger = get_logger(__name__)
 
 
-def discover_projects(base_path: Optional[Union[str, Path]] = None) -> List[Dict[str, Any]]:
-    """Scan directory for projects."""
-    if base_path is None:
-        base_path = PROJECTS_BASE_DIR
-    base = Path(base_path)
+EXECUTOR_MODES = ("process", "thread")
+
+# Executor mode name or a concurrent.futures.Executor to run extraction on
+ExecutorSpec = Union[str, Executor]
+
+# Projects per `audit health` invocation
+HEALTH_BATCH_SIZE = 16
+
+
+def iter_candidates(
+    base_path: Optional[Union[str, Path]] = None,
+    fingerprints: Optional[Dict[str, str]] = None,
+    load_cache_entries: Optional[Callable[[str], Optional[Dict[tuple, Dict[str, Any]]]]] = None
+) -> Iterator[Dict[str, Any]]:
+    """
+    Yield candidate project directories in name order (the discover stage).
     
+    Each candidate has id, name, path and fingerprint. Unchanged projects
+    (incremental mode) are flagged "unchanged": True; the others carry their
+    "cache_entries" for extraction, looked up with load_cache_entries(project_id)
+    only once the project is known to need extracting.
+    """
+    base = Path(base_path or PROJECTS_BASE_DIR)
     if not base.exists():
-        return []
-    
-    projects = []
+        return
     
-    for item in base.iterdir():
+    for item in sorted(base.iterdir(), key=lambda p: p.name):
         if not item.is_dir():
             continue
         
@@ -46,88 +69,300 @@ def discover_projects(base_path: Optional[Union[str, Path]] = None) -> List[Dict
         if item.name.startswith('_'):
             continue
         
-        # Check for indicators of a project
+        # Fingerprint before extracting so a concurrent edit is picked up next scan
+        fingerprint = compute_fingerprint(item)
+        project_id = project_id_for(item)
+        candidate = {"id": project_id, "name": item.name, "path": str(item), "fingerprint": fingerprint}
+        
+        # Incremental mode: skip extraction for projects that haven't changed
+        if fingerprints is not None and fingerprints.get(project_id) == fingerprint:
+            candidate["unchanged"] = True
+        else:
+            candidate["cache_entries"] = load_cache_entries(project_id) if load_cache_entries else None
+        yield candidate
+
+
+def iter_extracted(
+    candidates: Iterable[Dict[str, Any]],
+    jobs: Optional[int] = None,
+    executor: ExecutorSpec = "process",
+    window: Optional[int] = None
+) -> Iterator[Dict[str, Any]]:
+    """
+    Streaming extract stage: pull candidates lazily, yield projects as they finish.
+    
+    Extraction is fanned out over `jobs` workers (default: CPU count) using a
+    process pool, or a thread pool when executor="thread" (better for
+    I/O-bound network filesystems); an Executor instance is used as-is and
+    not shut down. Directories that turn out not to be projects, and
+    candidates whose extraction raises, are dropped.
+    
+    At most `window` extractions (default 4 per worker) are in flight, so
+    discovery never runs far ahead of extraction and memory stays bounded
+    whatever the fleet size. Unchanged stubs are yielded straight away;
+    results arrive in completion order, not name order.
+    """
+    if isinstance(executor, str) and executor not in EXECUTOR_MODES:
+        raise ValueError(f"executor must be one of {EXECUTOR_MODES}, got: {executor}")
+    
+    jobs = jobs or os.cpu_count() or 1
+    owned = not isinstance(executor, Executor)
+    
+    if owned and jobs <= 1:
+        for candidate in candidates:
+            if candidate.get("unchanged"):
+                yield _stub(candidate)
+                continue
+            try:
+                project = scan_candidate(candidate["path"], candidate["fingerprint"], candidate.get("cache_entries"))
+            except Exception as e:
+                logger.error(f"Failed to extract {candidate.get('name')}: {e}")
+                continue
+            if project:
+                yield project
+        return
+    
+    window = window or jobs * 4
+    if owned:
+        pool_cls = ProcessPoolExecutor if executor == "process" else ThreadPoolExecutor
+        pool = pool_cls(max_workers=jobs)
+    else:
+        pool = executor
+    
+    in_flight: Dict[Any, Dict[str, Any]] = {}
+    try:
+        for candidate in candidates:
+            if candidate.get("unchanged"):
+                yield _stub(candidate)
+                continue
+            future = pool.submit(
+                scan_candidate, candidate["path"], candidate["fingerprint"], candidate.get("cache_entries"))
+            in_flight[future] = candidate
+            if len(in_flight) >= window:
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    project = _future_project(future, in_flight.pop(future))
+                    if project:
+                        yield project
+        for future in as_completed(list(in_flight)):
+            project = _future_project(future, in_flight.pop(future))
+            if project:
+                yield project
+    finally:
+        if owned:
+            # Stopped early (error, generator closed): don't start queued work
+            pool.shutdown(wait=True, cancel_futures=True)
+
+
+def _future_project(future, candidate: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Result of an extraction future; a failed extraction is logged and skipped."""
+    try:
+        return future.result()
+    except Exception as e:
+        logger.error(f"Failed to extract {candidate.get('name')}: {e}")
+        return None
+
+
+def _stub(candidate: Dict[str, Any]) -> Dict[str, Any]:
+    """An unchanged project as returned by extraction (no cache entries)."""
+    return {k: v for k, v in candidate.items() if k != "cache_entries"}
+
+
+def scan_candidate(
+    path: str,
+    fingerprint: Optional[str] = None,
+    cache_entries: Optional[Dict[tuple, Dict[str, Any]]] = None
+) -> Optional[Dict[str, Any]]:
+    """
+    Check whether a directory looks like a project and extract its metadata.
+    
+    Module-level so it can be pickled into process pool workers.
+    """
+    item = Path(path)
+    
+    try:
+        # Check for indicators of a project (cheap marker files first)
         has_git = (item / ".git").exists()
         has_readme = (item / "README.md").exists()
         has_todo = (item / "TODO.md").exists()
-        has_python = any(item.glob("**/*.py"))
-        has_js = any(item.glob("**/*.js")) or any(item.glob("**/*.ts"))
+        
+        # One pruned traversal gives code indicators and newest mtime
+        walk_stats = walk_project(item)
+        has_python = walk_stats["has_python"]
+        has_js = walk_stats["has_js"]
         
         # If it looks like a project, extract metadata
         if has_git or has_readme or has_todo or has_python or has_js:
-            project = extract_project_metadata(item)
+            project = extract_project_metadata(item, walk_stats, ParseCache(cache_entries))
             if project:
-                projects.append(project)
+                project["fingerprint"] = fingerprint or compute_fingerprint(item)
+                return project
+    except Exception as e:
+        logger.error(f"Failed to scan {item.name}: {e}")
     
-    return projects
+    return None
 
 
-def scan_health_parallel(projects: List[Dict], max_workers: int = 8) -> Dict[str, Dict]:
-    """Run health checks in parallel, return {project_id: {"score": N, "grade": "X"}}."""
+def scan_health_parallel(
+    projects: List[Dict],
+    max_workers: int = 8,
+    batch_size: int = HEALTH_BATCH_SIZE,
+    check_cache: Optional[CheckCache] = None,
+    refresh: bool = False
+) -> Dict[str, Dict]:
+    """Run health checks in parallel, return {project_id: {"score": N, "grade": "X"}}.
+    
+    Projects are checked up to batch_size at a time per provider call (one
+    audit process per batch), with batches running concurrently. Small scans
+    use smaller batches so every worker still gets one. With a check_cache,
+    projects whose scan fingerprint already has a result for the current
+    provider version today aren't checked again (scores have time-based
+    signals, e.g. "active"); refresh=True rechecks them all and only stores
+    the results.
+    """
     provider = get_provider()
     results = {}
     
+    pending = []
+    for project in projects:
+        cached = None
+        if check_cache is not None and project.get("fingerprint") and not refresh:
+            cached = check_cache.lookup_signed(project["path"], "health", _health_signature(project))
+        if cached is not None:
+            results[project["id"]] = cached
+        else:
+            pending.append(project)
+    
+    size = max(1, min(batch_size, -(-len(pending) // max_workers)))
+    batches = [pending[i:i + size] for i in range(0, len(pending), size)]
+    
     with ThreadPoolExecutor(max_workers=max_workers) as executor:
         futures = {
-            executor.submit(provider.get_health, p["path"]): p["id"]
-            for p in projects
+            executor.submit(provider.get_project_health_batch, batch): batch
+            for batch in batches
         }
         for future in as_completed(futures):
-            project_id = futures[future]
+            batch = futures[future]
             try:
-                results[project_id] = future.result()
+                health_by_path = future.result()
             except Exception as e:
-                logger.error(f"Health check failed for {project_id}: {e}")
-                results[project_id] = None
+                logger.error(f"Health check failed for batch of {len(batch)} projects: {e}")
+                health_by_path = {}
+            for project in batch:
+                health = health_by_path.get(project["path"])
+                results[project["id"]] = health
+                if check_cache is not None and project.get("fingerprint"):
+                    check_cache.store_signed(project["id"], project["path"], "health", _health_signature(project), health)
     
     return results
 
 
-def is_infrastructure_project(project_name: str, todo_content: str = "") -> bool:
-    """Detect if a project is infrastructure based on TODO.md marker only."""
-    # Infrastructure detection is data-driven: projects must explicitly declare
-    # their type in TODO.md with: **Type:** Infrastructure
-    # NO hardcoded lists. NO name matching. Data lives with the project.
-    return "**Type:** Infrastructure" in todo_content or "**Type:** Infra" in todo_content
+def _health_signature(project: Dict[str, Any]) -> str:
+    """Cache signature for a health result: the scan fingerprint, valid for one day."""
+    return f"{project['fingerprint']}:{date.today().isoformat()}"
 
 
-def validate_index_file(index_path: Path) -> bool:
-    """Basic validation of index file according to Critical Rule #0."""
-    try:
-        content = index_path.read_text()
+def project_id_for(project_path: Path) -> str:
+    """Derive the database ID for a project directory."""
+    return project_path.name.lower().replace(" ", "-")
+
+
+def provider_task_rows(provider: MetadataProvider, root: Optional[Path] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Stream tasks-table rows from provider.iter_tasks() for a task root.
+    
+    root is a directory of projects or a single project (default: the
+    projects directory); a single project is owned by its own directory.
+    """
+    base = Path(root) if root else PROJECTS_BASE_DIR
+    if root and is_single_project(base):
+        base = base.parent
+    return audit_task_rows(provider.iter_tasks(str(root) if root else None), base)
+
+
+def audit_task_rows(
+    records: Iterable[Dict[str, Any]],
+    base_path: Optional[Union[str, Path]] = None
+) -> Iterator[Dict[str, Any]]:
+    """
+    Map `audit tasks` records to tasks-table rows, lazily.
+    
+    The owning project is the first directory under base_path; ids use the
+    same scheme as the TODO tokenizer (assign_task_ids), so both sources
+    agree on task identity. Records without a file or text are skipped.
+    """
+    base = Path(base_path or PROJECTS_BASE_DIR)
+    seen: Dict[tuple, int] = {}
+    
+    for record in records:
+        file_path = record.get("path") or record.get("file")
+        text = (record.get("text") or record.get("task") or "").strip()
+        if not file_path or not text:
+            logger.debug(f"Skipping audit task without file/text: {record}")
+            continue
         
-        # Check for YAML frontmatter
-        if not content.strip().startswith('---'):
-            return False
-            
-        # Check for required tags
-        required_tags = ["map/project", "p/", "type/", "domain/", "status/", "tech/"]
-        tags_section = content.split('---')[1]
-        if not all(tag in tags_section for tag in required_tags):
-            return False
-            
-        # Check for required sections (case-insensitive and partial match)
-        required_sections = ["Key Components", "Status"]
-        content_upper = content.upper()
-        for section in required_sections:
-            if f"## {section.upper()}" not in content_upper and f"### {section.upper()}" not in content_upper:
-                # Also check for variants with icons like "## 🎯 Status"
-                if not any(f"{section.upper()}" in line.upper() for line in content.split('\n') if line.startswith('##')):
-                    return False
-            
-        return True
+        path = Path(file_path)
+        if not path.is_absolute():
+            path = base / path
+        try:
+            relative = path.relative_to(base)
+        except ValueError:
+            continue
+        if len(relative.parts) < 2:
+            continue
+        
+        project_id = project_id_for(base / relative.parts[0])
+        section = record.get("section") or record.get("heading") or ""
+        key = (project_id, section, text)
+        occurrence = seen.get(key, 0)
+        seen[key] = occurrence + 1
+        
+        yield {
+            "id": task_id(project_id, section, text, occurrence),
+            "project_id": project_id,
+            "path": str(path),
+            "section": section or None,
+            "line": int(record.get("line") or 0),
+            "text": text,
+            "checked": bool(record.get("checked", record.get("done", False)))
+        }
+
+
+def extract_project_type(content: str) -> Optional[str]:
+    """Return the type/ tag from an index file's YAML frontmatter, if any."""
+    try:
+        if content.strip().startswith('---'):
+            frontmatter = yaml.safe_load(content.split('---')[1])
+            if frontmatter and "tags" in frontmatter:
+                for tag in frontmatter["tags"]:
+                    if tag.startswith("type/"):
+                        return tag.replace("type/", "")
     except Exception as e:
-        logger.warning(f"Error validating index file {index_path}: {e}")
-        return False
+        logger.debug(f"Failed to parse index YAML: {e}")
+    return None
 
 
-def extract_project_metadata(project_path: Path) -> Dict[str, Any]:
-    """Extract all metadata from a project."""
+def extract_project_metadata(
+    project_path: Path,
+    walk_stats: Optional[Dict[str, Any]] = None,
+    cache: Optional[ParseCache] = None
+) -> Dict[str, Any]:
+    """Extract all metadata from a project.
+
+    walk_stats is the result of walk_project(); it is computed here if the
+    caller didn't already walk the tree. File parsers go through cache; the
+    entries used are returned in "parse_cache" for the caller to persist.
+    """
+    if walk_stats is None:
+        walk_stats = walk_project(project_path)
+    if cache is None:
+        cache = ParseCache()
+    
     metadata = {
-        "id": project_path.name.lower().replace(" ", "-"),
+        "id": project_id_for(project_path),
         "name": project_path.name,
         "path": str(project_path),
-        "last_modified": get_last_modified(project_path),
+        "last_modified": get_last_modified(project_path, walk_stats["newest_mtime"]),
         "status": "unknown",
         "phase": None,
         "description": None,
@@ -136,9 +371,15 @@ def extract_project_metadata(project_path: Path) -> Dict[str, Any]:
         "cron_jobs": [],
         "services": [],
         "is_infrastructure": False,
+        "blockers": [],
+        "gaps": [],
+        "code_review": None,
+        "tasks": [],
         "has_index": False,
         "index_is_valid": False,
         "index_updated_at": None,
+        "has_todo": False,
+        "has_readme": False,
         "project_type": "standard"
     }
     
@@ -147,63 +388,63 @@ def extract_project_metadata(project_path: Path) -> Dict[str, Any]:
     if index_files:
         index_file = index_files[0]
         metadata["has_index"] = True
-        metadata["index_is_valid"] = validate_index_file(index_file)
+        metadata["index_is_valid"] = cache.get(metadata["id"], index_file, "index_valid", validate_index_content, False)
         try:
             metadata["index_updated_at"] = datetime.fromtimestamp(index_file.stat().st_mtime).isoformat()
-            
-            # Extract project_type from YAML tags
-            content = index_file.read_text()
-            if content.strip().startswith('---'):
-                try:
-                    frontmatter = yaml.safe_load(content.split('---')[1])
-                    if frontmatter and "tags" in frontmatter:
-                        for tag in frontmatter["tags"]:
-                            if tag.startswith("type/"):
-                                metadata["project_type"] = tag.replace("type/", "")
-                                break
-                except Exception as e:
-                    logger.debug(f"Failed to parse YAML for {index_file}: {e}")
         except Exception as e:
             logger.warning(f"Failed to get metadata from index file {index_file}: {e}")
+        
+        # Extract project_type from YAML tags
+        project_type = cache.get(metadata["id"], index_file, "project_type", extract_project_type)
+        if project_type:
+            metadata["project_type"] = project_type
     
-    # Parse TODO.md if exists
+    # Parse TODO.md if exists (single read; also carries the infrastructure marker)
     todo_path = project_path / "TODO.md"
-    todo_content = ""
     if todo_path.exists():
-        try:
-            todo_content = todo_path.read_text()
-        except Exception as e:
-            logger.warning(f"Failed to read TODO.md for {project_path.name}: {e}")
-        
-        todo_data = parse_todo(todo_path)
+        todo_data = cache.get(metadata["id"], todo_path, "todo", parse_todo_content, parse_todo_content(""))
         metadata.update({
+            "has_todo": True,
             "status": todo_data.get("status", "unknown"),
             "phase": todo_data.get("phase"),
             "completion_pct": todo_data.get("completion_pct", 0),
             "ai_agents": todo_data.get("ai_agents", []),
-            "cron_jobs": todo_data.get("cron_jobs", [])
+            "cron_jobs": todo_data.get("cron_jobs", []),
+            "is_infrastructure": todo_data.get("is_infrastructure", False),
+            "blockers": todo_data.get("blockers", []),
+            "gaps": todo_data.get("gaps", []),
+            "tasks": [
+                dict(task, path=str(todo_path))
+                for task in assign_task_ids(metadata["id"], todo_data.get("tasks", []))
+            ]
         })
         
         # Use TODO description if available
         if todo_data.get("description"):
             metadata["description"] = todo_data["description"]
     
-    # Detect infrastructure projects
-    metadata["is_infrastructure"] = is_infrastructure_project(metadata["name"], todo_content)
+    # Code review (dashboard panel and alerts)
+    review_path = project_path / "CODE_REVIEW.md"
+    if review_path.exists():
+        metadata["code_review"] = cache.get(metadata["id"], review_path, "code_review", parse_code_review_content)
     
     # Parse README.md for description if TODO didn't provide one
-    if not metadata["description"]:
-        readme_path = project_path / "README.md"
-        if readme_path.exists():
-            metadata["description"] = extract_readme_description(readme_path)
+    # (always read through the cache so it's indexed for search)
+    readme_path = project_path / "README.md"
+    if readme_path.exists():
+        metadata["has_readme"] = True
+        readme_description = cache.get(metadata["id"], readme_path, "readme", extract_readme_description, "")
+        if not metadata["description"]:
+            metadata["description"] = readme_description
     
+    metadata["parse_cache"] = cache.used.get(metadata["id"], [])
+    metadata["documents"] = collect_documents(cache, metadata["id"])
     return metadata
 
 
-def extract_readme_description(readme_path: Path) -> str:
-    """Extract first paragraph from README."""
+def extract_readme_description(content: str) -> str:
+    """Extract first paragraph from README content."""
     try:
-        content = readme_path.read_text()
         lines = content.split('\n')
         
         # Skip title and empty lines
@@ -249,25 +490,5 @@ def extract_readme_description(readme_path: Path) -> str:
         
         return description
     except Exception as e:
-        logger.warning(f"Failed to extract description from {readme_path}: {e}")
+        logger.warning(f"Failed to extract README description: {e}")
         return ""
-
-
-def should_skip_directory(dir_path: Path) -> bool:
-    """Determine if a directory should be skipped."""
-    skip_names = {
-        "node_modules",
-        ".git",
-        "__pycache__",
-        "venv",
-        "env",
-        ".venv",
-        "dist",
-        "build",
-        ".DS_Store",
-        ".idea",
-        ".vscode"
-    }
-    
-    return dir_path.name in skip_names or dir_path.name.startswith('.')
-
@@ -0,0 +1,99 @@
+"""Single-pass filesystem walker for project directories."""
+
+import os
+import sys
+from pathlib import Path
+from typing import Any, Dict, Union
+
+# Add parent directory to path for logger import
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+from logger import get_logger
+
+logger = get_logger(__name__)
+
+PYTHON_SUFFIXES = (".py",)
+JS_SUFFIXES = (".js", ".ts")
+
+SKIP_DIR_NAMES = {
+    "node_modules",
+    ".git",
+    "__pycache__",
+    "venv",
+    "env",
+    ".venv",
+    "dist",
+    "build",
+    ".DS_Store",
+    ".idea",
+    ".vscode"
+}
+
+
+def should_skip_directory(dir_path: Union[Path, os.DirEntry]) -> bool:
+    """Determine if a directory should be skipped.
+
+    Accepts a Path or an os.DirEntry (both expose `.name`).
+    """
+    return dir_path.name in SKIP_DIR_NAMES or dir_path.name.startswith('.')
+
+
+def walk_project(project_path: Union[str, Path]) -> Dict[str, Any]:
+    """
+    Walk a project tree once and gather scan signals.
+
+    Skipped directories (see should_skip_directory) are never entered, and
+    mtimes are folded into a running max instead of a file list.
+
+    Returns dict with:
+    - has_python: bool
+    - has_js: bool (JavaScript or TypeScript)
+    - newest_mtime: float or None (POSIX timestamp of newest file)
+    - file_count: int
+    - dir_count: int
+    """
+    stats = {
+        "has_python": False,
+        "has_js": False,
+        "newest_mtime": None,
+        "file_count": 0,
+        "dir_count": 0
+    }
+    newest = None
+    stack = [str(project_path)]
+
+    while stack:
+        current = stack.pop()
+        try:
+            with os.scandir(current) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            if not should_skip_directory(entry):
+                                stack.append(entry.path)
+                                stats["dir_count"] += 1
+                            continue
+
+                        if not entry.is_file():
+                            continue
+
+                        name = entry.name
+                        if name == ".DS_Store":
+                            continue
+
+                        stats["file_count"] += 1
+                        if not stats["has_python"] and name.endswith(PYTHON_SUFFIXES):
+                            stats["has_python"] = True
+                        elif not stats["has_js"] and name.endswith(JS_SUFFIXES):
+                            stats["has_js"] = True
+
+                        mtime = entry.stat().st_mtime
+                        if newest is None or mtime > newest:
+                            newest = mtime
+                    except OSError as e:
+                        # Broken symlinks, permission errors, files removed mid-scan
+                        logger.debug(f"Skipping {entry.path}: {e}")
+        except OSError as e:
+            logger.debug(f"Cannot scan directory {current}: {e}")
+
+    stats["newest_mtime"] = newest
+    return stats
@@ -1,33 +1,100 @@
 """Metadata providers for project discovery."""
 
+import hashlib
 import shutil
 import subprocess
 import json
+import tempfile
+import threading
+import time
 from abc import ABC, abstractmethod
-from typing import Optional, List, Dict, Any
+from itertools import islice
+from typing import Optional, List, Dict, Any, Iterable, Iterator, Tuple
 from pathlib import Path
 
 # Configure logging using project-specific logger
 import sys
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 from logger import get_logger
-from config import AUDIT_BIN_PATH
+from config import AUDIT_BIN_PATH, AUDIT_WORKERS, AUDIT_WORKER_ARGS, PROJECTS_BASE_DIR
+
+from .audit_pool import WorkerError, get_worker_pool
+from .health import ACTIVE_DAYS, GRADE_THRESHOLDS, HEALTH_WEIGHTS, collect_health_signals, health_signals, score_health
+from .index_validator import REQUIRED_SECTIONS, REQUIRED_TAGS, check_index_file
+from .todo_parser import parse_todo
 
 logger = get_logger(__name__)
 
+# Rows per batch when streaming task output into the database
+TASK_BATCH_SIZE = 500
+
+
+def batched(items: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    """Group an iterable into lists of at most size items."""
+    iterator = iter(items)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+def is_single_project(root: Path) -> bool:
+    """
+    Whether a task root is one project rather than a directory of projects.
+    
+    The projects directory never is, even with a TODO.md of its own; any
+    other directory is when it has a TODO.md.
+    """
+    return root.resolve() != PROJECTS_BASE_DIR.resolve() and (root / "TODO.md").is_file()
+
+
 class MetadataProvider(ABC):
     """Abstract base class for project metadata providers."""
     
+    @property
+    def version(self) -> str:
+        """Identifies the checker build; cached results from another version are discarded."""
+        return type(self).__name__
+    
     @abstractmethod
     def get_health(self, project_path: str) -> Optional[Dict[str, Any]]:
         """Returns {"score": 0-100, "grade": "A-F"} or None if unavailable."""
         pass
     
+    def get_health_batch(self, project_paths: List[str]) -> Dict[str, Optional[Dict[str, Any]]]:
+        """Returns {project_path: health or None}; providers that can batch override this."""
+        return {path: self.get_health(path) for path in project_paths}
+    
+    def get_project_health_batch(self, projects: List[Dict[str, Any]]) -> Dict[str, Optional[Dict[str, Any]]]:
+        """Returns {project_path: health or None} for scanned projects; defaults to get_health_batch."""
+        return self.get_health_batch([project["path"] for project in projects])
+    
     @abstractmethod
     def get_tasks(self, project_path: Optional[str] = None) -> List[Dict[str, Any]]:
         """Returns list of task dicts from parsing."""
         pass
     
+    def iter_tasks(
+        self,
+        project_path: Optional[str] = None,
+        cancel: Optional[threading.Event] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """Yields task dicts one at a time (providers that can stream override this)."""
+        for task in self.get_tasks(project_path):
+            if cancel is not None and cancel.is_set():
+                return
+            yield task
+    
+    def iter_task_batches(
+        self,
+        project_path: Optional[str] = None,
+        batch_size: int = TASK_BATCH_SIZE,
+        cancel: Optional[threading.Event] = None
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """Yields lists of up to batch_size tasks, e.g. for executemany inserts."""
+        return batched(self.iter_tasks(project_path, cancel=cancel), batch_size)
+    
     @abstractmethod
     def check_file(self, file_path: str) -> Dict[str, Any]:
         """Returns {"valid": bool, "issues": [...]}."""
@@ -41,12 +108,45 @@ class MetadataProvider(ABC):
 class AuditProvider(MetadataProvider):
     """Concrete provider that calls the Go `audit` binary."""
     
-    def __init__(self, bin_path: str):
+    def __init__(self, bin_path: str, workers: int = AUDIT_WORKERS):
         self.bin_path = bin_path
+        self.workers = workers
+    
+    @property
+    def version(self) -> str:
+        """The binary's resolved path, mtime and size; changes whenever it is rebuilt."""
+        resolved = Path(self.bin_path).resolve()
+        try:
+            st = resolved.stat()
+        except OSError:
+            return f"audit:{resolved}"
+        return f"audit:{resolved}:{st.st_mtime_ns}:{st.st_size}"
+    
+    def _pool_request(self, op: str, path: str) -> Optional[Dict[str, Any]]:
+        """
+        Run op through the shared `audit serve` worker pool.
+        
+        Returns None when workers are disabled or the pool can't answer, in
+        which case callers fall back to a one-off subprocess.
+        """
+        if self.workers <= 0:
+            return None
+        try:
+            pool = get_worker_pool([self.bin_path, *AUDIT_WORKER_ARGS], self.workers)
+            if pool.disabled:
+                # Workers couldn't start (already logged); go straight to the fallback
+                return None
+            return pool.request(op, path=path)
+        except (OSError, WorkerError) as e:
+            logger.warning(f"audit worker {op} failed for {path}, running binary directly: {e}")
+            return None
         
     def get_health(self, project_path: str) -> Optional[Dict[str, Any]]:
         """Calls `audit health [project] --json`."""
         abs_path = str(Path(project_path).absolute())
+        data = self._pool_request("health", abs_path)
+        if data is not None:
+            return self._validate_health(data, project_path)
         try:
             result = subprocess.run(
                 [self.bin_path, "health", abs_path, "--json"],
@@ -58,47 +158,137 @@ class AuditProvider(MetadataProvider):
                 logger.warning(f"audit health failed for {project_path}: {result.stderr}")
                 return None
             data = json.loads(result.stdout)
-            
-            # 🛡️ Validate binary output
-            score = data.get("score")
-            grade = data.get("grade")
-            if not isinstance(score, int) or not (0 <= score <= 100):
-                logger.error(f"Invalid score from audit binary for {project_path}: {score}")
-                return None
-            if grade not in {"A", "B", "C", "D", "F"}:
-                logger.error(f"Invalid grade from audit binary for {project_path}: {grade}")
-                return None
-                
-            return {"score": score, "grade": grade}
+            return self._validate_health(data, project_path)
         except (subprocess.TimeoutExpired, json.JSONDecodeError, KeyError) as e:
             logger.error(f"audit health error for {project_path}: {e}")
             return None
     
-    def get_tasks(self, project_path: Optional[str] = None) -> List[Dict[str, Any]]:
-        """Calls `audit tasks` and parses NDJSON output."""
+    def get_health_batch(self, project_paths: List[str]) -> Dict[str, Optional[Dict[str, Any]]]:
+        """
+        Calls `audit health p1 p2 ... --json` once for many projects.
+        
+        Expects one NDJSON object per project, matched back by its "path" (or
+        by position when the binary omits it). Projects missing from the
+        output are retried one at a time, so a binary that only understands a
+        single path still gives correct results.
+        """
+        if len(project_paths) <= 1:
+            return {path: self.get_health(path) for path in project_paths}
+        
+        abs_paths = {str(Path(path).absolute()): path for path in project_paths}
+        results: Dict[str, Optional[Dict[str, Any]]] = {}
         try:
-            cmd = [self.bin_path, "tasks"]
-            if project_path:
-                abs_path = str(Path(project_path).absolute())
-                cmd.extend(["--root", abs_path])
-            
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=60)
-            if result.returncode != 0:
-                logger.warning(f"audit tasks failed: {result.stderr}")
-                return []
+            result = subprocess.run(
+                [self.bin_path, "health", *abs_paths, "--json"],
+                capture_output=True,
+                text=True,
+                timeout=30 + 2 * len(project_paths)
+            )
+            records = [json.loads(line) for line in result.stdout.splitlines() if line.strip()]
             
-            tasks = []
-            for line in result.stdout.strip().split('\n'):
-                if line:
-                    tasks.append(json.loads(line))
-            return tasks
+            ordered = list(abs_paths)
+            positional = len(records) == len(ordered) and not any("path" in r for r in records if isinstance(r, dict))
+            for index, record in enumerate(records):
+                abs_path = ordered[index] if positional else (record.get("path") if isinstance(record, dict) else None)
+                if abs_path in abs_paths:
+                    path = abs_paths[abs_path]
+                    results[path] = self._validate_health(record, path)
         except (subprocess.TimeoutExpired, json.JSONDecodeError) as e:
-            logger.error(f"audit tasks error: {e}")
-            return []
+            logger.warning(f"audit health batch failed, falling back to single checks: {e}")
+        
+        for path in project_paths:
+            if path not in results:
+                results[path] = self.get_health(path)
+        return results
+    
+    @staticmethod
+    def _validate_health(data: Any, project_path: str) -> Optional[Dict[str, Any]]:
+        """Return {"score", "grade"} from audit output, or None if it's invalid."""
+        if not isinstance(data, dict):
+            logger.error(f"Invalid health output from audit binary for {project_path}: {data!r}")
+            return None
+        
+        # 🛡️ Validate binary output
+        score = data.get("score")
+        grade = data.get("grade")
+        if not isinstance(score, int) or not (0 <= score <= 100):
+            logger.error(f"Invalid score from audit binary for {project_path}: {score}")
+            return None
+        if grade not in {"A", "B", "C", "D", "F"}:
+            logger.error(f"Invalid grade from audit binary for {project_path}: {grade}")
+            return None
+            
+        return {"score": score, "grade": grade}
+    
+    def get_tasks(self, project_path: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Calls `audit tasks` and returns all NDJSON records (see iter_tasks)."""
+        return list(self.iter_tasks(project_path))
+    
+    def iter_tasks(
+        self,
+        project_path: Optional[str] = None,
+        cancel: Optional[threading.Event] = None,
+        timeout: float = 60
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Streams `audit tasks` NDJSON output, decoding one line at a time.
+        
+        Records are read only as fast as the consumer pulls them; when the
+        pipe buffer fills, the binary blocks (backpressure). Setting cancel,
+        closing the generator or exceeding timeout terminates the process.
+        Malformed lines are logged and skipped.
+        """
+        cmd = [self.bin_path, "tasks"]
+        if project_path:
+            cmd.extend(["--root", str(Path(project_path).absolute())])
+        
+        # stderr goes to a file so a chatty binary can't fill a pipe we aren't reading
+        with tempfile.TemporaryFile() as stderr:
+            try:
+                proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=stderr, text=True, bufsize=1)
+            except OSError as e:
+                logger.error(f"audit tasks error: {e}")
+                return
+            
+            watchdog = threading.Timer(timeout, proc.kill)
+            watchdog.start()
+            completed = False
+            try:
+                for line in proc.stdout:
+                    if cancel is not None and cancel.is_set():
+                        logger.info("audit tasks cancelled")
+                        break
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        yield json.loads(line)
+                    except json.JSONDecodeError as e:
+                        logger.error(f"audit tasks: skipping malformed line: {e}")
+                else:
+                    completed = True
+            finally:
+                # Stopped early (cancel, generator closed, error): don't leave it running
+                if not completed and proc.poll() is None:
+                    proc.terminate()
+                try:
+                    proc.wait(timeout=5)
+                except subprocess.TimeoutExpired:
+                    proc.kill()
+                    proc.wait()
+                watchdog.cancel()
+                proc.stdout.close()
+            
+            if completed and proc.returncode != 0:
+                stderr.seek(0)
+                logger.warning(f"audit tasks failed ({proc.returncode}): {stderr.read().decode(errors='replace')}")
     
     def check_file(self, file_path: str) -> Dict[str, Any]:
         """Calls `audit check [file]` and parses NDJSON."""
         abs_path = str(Path(file_path).absolute())
+        data = self._pool_request("check", abs_path)
+        if data is not None:
+            return {"valid": data.get("valid", False), "issues": data.get("issues", [])}
         try:
             result = subprocess.run(
                 [self.bin_path, "check", abs_path],
@@ -110,14 +300,17 @@ class AuditProvider(MetadataProvider):
             if result.stdout.strip():
                 data = json.loads(result.stdout.strip().split('\n')[0])
                 return {"valid": data.get("valid", False), "issues": data.get("issues", [])}
-            return {"valid": False, "issues": ["No output from audit check"]}
+            return {"valid": False, "issues": ["No output from audit check"], "error": True}
         except (subprocess.TimeoutExpired, json.JSONDecodeError) as e:
             logger.error(f"audit check error for {file_path}: {e}")
-            return {"valid": False, "issues": [str(e)]}
+            return {"valid": False, "issues": [str(e)], "error": True}
     
     def fix_file(self, file_path: str) -> bool:
         """Calls `audit fix [file]`."""
         abs_path = str(Path(file_path).absolute())
+        data = self._pool_request("fix", abs_path)
+        if data is not None:
+            return bool(data.get("fixed", False))
         try:
             result = subprocess.run(
                 [self.bin_path, "fix", abs_path],
@@ -134,56 +327,149 @@ class AuditProvider(MetadataProvider):
             return False
 
 class LegacyProvider(MetadataProvider):
-    """Concrete provider that uses existing Python logic."""
+    """Concrete provider that uses existing Python logic (no subprocesses)."""
+    
+    @property
+    def version(self) -> str:
+        """Hash of the validation and scoring rules, so rule changes invalidate cached results."""
+        rules = json.dumps([REQUIRED_TAGS, REQUIRED_SECTIONS, HEALTH_WEIGHTS, GRADE_THRESHOLDS, ACTIVE_DAYS])
+        return f"legacy:{hashlib.sha1(rules.encode('utf-8')).hexdigest()[:12]}"
     
     def get_health(self, project_path: str) -> Optional[Dict[str, Any]]:
-        """Legacy Python logic doesn't compute health scores."""
-        return None
+        """Scores the project from its index, TODO.md and README.md (see discovery.health)."""
+        path = Path(project_path)
+        if not path.is_dir():
+            return None
+        return score_health(collect_health_signals(path))
+    
+    def get_project_health_batch(self, projects: List[Dict[str, Any]]) -> Dict[str, Optional[Dict[str, Any]]]:
+        """Scores scanned projects from their metadata, without re-reading files."""
+        return {project["path"]: score_health(health_signals(project)) for project in projects}
     
     def get_tasks(self, project_path: Optional[str] = None) -> List[Dict[str, Any]]:
-        """Uses existing todo_parser.py logic (Interface only)."""
-        raise NotImplementedError("LegacyProvider.get_tasks not yet implemented")
+        """Parses TODO.md checkboxes with todo_parser (see iter_tasks)."""
+        return list(self.iter_tasks(project_path))
+    
+    def iter_tasks(
+        self,
+        project_path: Optional[str] = None,
+        cancel: Optional[threading.Event] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Yields TODO.md tasks in the same record shape as `audit tasks`.
+        
+        project_path may be a single project or a directory of projects
+        (default: the projects directory, which is always treated as a
+        directory of projects even if it has a TODO.md of its own); each
+        project's TODO.md is parsed only when iteration reaches it.
+        """
+        root = Path(project_path) if project_path else PROJECTS_BASE_DIR
+        if is_single_project(root):
+            todo_paths = [root / "TODO.md"]
+        else:
+            todo_paths = sorted(root.glob("*/TODO.md"))
+        
+        for todo_path in todo_paths:
+            if cancel is not None and cancel.is_set():
+                return
+            for task in parse_todo(todo_path)["tasks"]:
+                yield {
+                    "path": str(todo_path),
+                    "section": task["section"],
+                    "line": task["line"],
+                    "text": task["text"],
+                    "checked": task["checked"]
+                }
     
     def check_file(self, file_path: str) -> Dict[str, Any]:
-        """Uses existing validation logic (Interface only)."""
-        raise NotImplementedError("LegacyProvider.check_file not yet implemented")
+        """Validates index frontmatter and sections with the scanner's rules."""
+        issues = check_index_file(Path(file_path))
+        return {"valid": not issues, "issues": issues}
     
     def fix_file(self, file_path: str) -> bool:
         """Legacy logic doesn't support auto-fixing."""
         return False
 
-def get_provider() -> MetadataProvider:
-    """
-    Returns AuditProvider if audit binary exists, else LegacyProvider.
-    Checks config.AUDIT_BIN_PATH first, then falls back to PATH lookup.
-    """
-    # 1. Check config path
+def _verify_audit_binary(bin_path: str) -> bool:
+    """Run `--help` to make sure it's our binary and not e.g. /usr/sbin/audit."""
+    try:
+        result = subprocess.run([bin_path, "--help"], capture_output=True, text=True, timeout=2)
+        return "Go-based CLI tool" in result.stdout
+    except Exception:
+        return False
+
+
+def _audit_candidates() -> List[str]:
+    """Binary paths get_provider() would try, in order: config path, then PATH lookup."""
+    candidates = []
     if AUDIT_BIN_PATH:
         bin_path = Path(AUDIT_BIN_PATH)
         if bin_path.is_absolute() and bin_path.exists():
-            # Verify it's actually our binary and not /usr/sbin/audit
-            try:
-                result = subprocess.run([str(bin_path), "--help"], capture_output=True, text=True, timeout=2)
-                if "Go-based CLI tool" in result.stdout:
-                    logger.info(f"Using AuditProvider with verified binary at: {AUDIT_BIN_PATH}")
-                    return AuditProvider(str(AUDIT_BIN_PATH))
-            except Exception:
-                pass
-    
-    # 2. Check shutil.which
-    bin_name = AUDIT_BIN_PATH if AUDIT_BIN_PATH else "audit"
-    which_path = shutil.which(bin_name)
-    
-    if which_path:
-        # Verify it's actually our binary
+            candidates.append(str(bin_path))
+    
+    which_path = shutil.which(AUDIT_BIN_PATH if AUDIT_BIN_PATH else "audit")
+    if which_path and which_path not in candidates:
+        candidates.append(which_path)
+    return candidates
+
+
+def _candidates_key(candidates: List[str]) -> Tuple[Tuple[Any, ...], ...]:
+    """Resolved path plus (mtime, size, inode) of each candidate; changes when a binary is replaced."""
+    key = []
+    for candidate in candidates:
+        resolved = Path(candidate).resolve()
         try:
-            result = subprocess.run([which_path, "--help"], capture_output=True, text=True, timeout=2)
-            if "Go-based CLI tool" in result.stdout:
-                logger.info(f"Using AuditProvider with verified binary found in PATH: {which_path}")
-                return AuditProvider(which_path)
-        except Exception:
-            pass
-    
-    # 3. Fallback to Legacy
+            st = resolved.stat()
+            key.append((str(resolved), st.st_mtime_ns, st.st_size, st.st_ino))
+        except OSError:
+            key.append((str(resolved), None, None, None))
+    return tuple(key)
+
+
+# Seconds a cached provider is used before the binary is re-stat'ed
+PROVIDER_CACHE_TTL = 30
+
+_provider_cache: Dict[str, Any] = {"key": None, "provider": None, "checked_at": 0.0}
+_provider_lock = threading.Lock()
+
+
+def _select_provider(candidates: List[str]) -> MetadataProvider:
+    """Return an AuditProvider for the first verified candidate, else LegacyProvider."""
+    for bin_path in candidates:
+        if _verify_audit_binary(bin_path):
+            logger.info(f"Using AuditProvider with verified binary at: {bin_path}")
+            return AuditProvider(bin_path)
+    
     logger.info("audit-agent binary not found or invalid. Falling back to LegacyProvider.")
     return LegacyProvider()
+
+
+def get_provider() -> MetadataProvider:
+    """
+    Returns AuditProvider if audit binary exists, else LegacyProvider.
+    Checks config.AUDIT_BIN_PATH first, then falls back to PATH lookup.
+    
+    The choice is cached for the process. After PROVIDER_CACHE_TTL seconds
+    the candidate binaries are stat'ed again, and `--help` verification only
+    reruns if one of them changed (path, mtime, size or inode).
+    """
+    with _provider_lock:
+        provider = _provider_cache["provider"]
+        now = time.monotonic()
+        if provider is not None and now - _provider_cache["checked_at"] < PROVIDER_CACHE_TTL:
+            return provider
+        
+        candidates = _audit_candidates()
+        key = _candidates_key(candidates)
+        if provider is None or key != _provider_cache["key"]:
+            provider = _select_provider(candidates)
+        
+        _provider_cache.update(key=key, provider=provider, checked_at=now)
+        return provider
+
+
+def refresh_provider() -> MetadataProvider:
+    """Drop the cached provider and verify the audit binary again."""
+    with _provider_lock:
+        _provider_cache.update(key=None, provider=None, checked_at=0.0)
+    return get_provider()
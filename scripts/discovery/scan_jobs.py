@@ -0,0 +1,114 @@
+"""Background scan jobs with per-phase progress, for the dashboard."""
+
+import sys
+import threading
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+# Add parent directory to path for logger import
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+from logger import get_logger
+
+logger = get_logger(__name__)
+
+# Progress counters reported for every job, in pipeline order
+SCAN_PHASES = ("discovered", "extracted", "health", "persisted")
+
+# Finished jobs kept for /api/jobs lookups
+JOB_HISTORY = 20
+
+# run_fn(full, progress) -> result dict; progress(phase, count)
+ScanFunction = Callable[[bool, Callable[[str, int], None]], Dict[str, Any]]
+
+
+class ScanJobRunner:
+    """
+    Runs scans one at a time on a background thread.
+
+    submit() returns immediately with a job dict. While a job is queued or
+    running, further submissions coalesce onto it instead of starting a
+    second scan; a full scan requested while an incremental one is still
+    queued upgrades that job. Jobs are plain dicts:
+
+        {"id", "status": queued|running|done|error, "full", "phase",
+         "progress": {phase: count}, "result", "error",
+         "created_at", "started_at", "finished_at"}
+    """
+
+    def __init__(self, run_fn: ScanFunction):
+        self.run_fn = run_fn
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._jobs: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._active: Optional[Dict[str, Any]] = None
+        self._lock = threading.Lock()
+
+    def submit(self, full: bool = False) -> Dict[str, Any]:
+        """Queue a scan, or return the one already queued or running."""
+        with self._lock:
+            active = self._active
+            if active is not None:
+                if full and active["status"] == "queued":
+                    active["full"] = True
+                return dict(active)
+
+            job = {
+                "id": uuid.uuid4().hex[:12],
+                "status": "queued",
+                "full": full,
+                "phase": None,
+                "progress": dict.fromkeys(SCAN_PHASES, 0),
+                "result": None,
+                "error": None,
+                "created_at": datetime.now().isoformat(),
+                "started_at": None,
+                "finished_at": None
+            }
+            self._jobs[job["id"]] = job
+            self._active = job
+            while len(self._jobs) > JOB_HISTORY:
+                self._jobs.popitem(last=False)
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="scan-job")
+            self._executor.submit(self._run, job)
+            return dict(job)
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Snapshot of a job, or None if it's unknown (or aged out of the history)."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return None
+            return dict(job, progress=dict(job["progress"]))
+
+    def _progress(self, job: Dict[str, Any], phase: str, count: int) -> None:
+        with self._lock:
+            job["phase"] = phase
+            job["progress"][phase] = count
+
+    def _run(self, job: Dict[str, Any]) -> None:
+        with self._lock:
+            job["status"] = "running"
+            job["started_at"] = datetime.now().isoformat()
+            full = job["full"]
+
+        try:
+            result = self.run_fn(full, lambda phase, count: self._progress(job, phase, count))
+            status, error = "done", None
+        except Exception as e:
+            logger.error(f"Scan job {job['id']} failed: {e}")
+            result, status, error = None, "error", str(e)
+
+        with self._lock:
+            job.update(status=status, result=result, error=error, finished_at=datetime.now().isoformat())
+            self._active = None
+
+    def shutdown(self) -> None:
+        """Wait for a running scan to finish and stop the worker thread (a later submit starts a new one)."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
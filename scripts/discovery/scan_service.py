@@ -0,0 +1,308 @@
+"""Scan pipeline shared by the CLI, the dashboard and any future daemon."""
+
+import queue
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set, Tuple, Union
+
+from .alert_detector import persist_alerts
+from .check_cache import CheckCache
+from .external_resources_parser import parse_external_resources
+from .fingerprint import compute_fingerprint
+from .project_scanner import (
+    ExecutorSpec, iter_candidates, iter_extracted, project_id_for, scan_candidate, scan_health_parallel
+)
+from .providers import get_provider
+from db.manager import DatabaseManager, close_thread_connections
+
+# Add parent directory to path for logger import
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+from config import PROJECTS_BASE_DIR
+from logger import get_logger
+
+logger = get_logger(__name__)
+
+# Pipeline stages. They overlap while streaming; alerts for a batch run after
+# it is persisted because the detectors read the freshly written rows.
+SCAN_STAGES = ("discover", "extract", "health", "persist", "alerts")
+
+# The writer commits every WRITE_BATCH_SIZE projects or WRITE_INTERVAL_MS,
+# whichever comes first; health checks are batched the same way
+WRITE_BATCH_SIZE = 25
+WRITE_INTERVAL_MS = 500
+# Batches waiting for the writer before extraction blocks (backpressure)
+WRITE_QUEUE_BATCHES = 4
+
+_DONE = object()
+
+
+class _BatchWriter(threading.Thread):
+    """
+    The scan's only database writer.
+
+    Pulls (project, health) pairs from a bounded queue and writes them in
+    batches: bulk_sync, the batch's health cache entries, then file alerts
+    for its changed projects. Keeping every write on this thread means
+    extraction never waits on the SQLite lock and readers (the dashboard)
+    see results batch by batch.
+    """
+
+    def __init__(self, db: DatabaseManager, services: Dict[str, Any], health_cache: CheckCache,
+                 progress: Callable[[str, int], None]):
+        super().__init__(name="scan-writer", daemon=True)
+        self.db = db
+        self.services = services
+        self.health_cache = health_cache
+        self.progress = progress
+        self.queue: "queue.Queue[Any]" = queue.Queue(maxsize=WRITE_BATCH_SIZE * WRITE_QUEUE_BATCHES)
+        self.summary = {"updated": [], "removed": [], "unchanged": 0, "child_rows": 0, "documents": 0, "tasks": 0}
+        self.alerts = 0
+        self.persisted = 0
+        self.timings = {"persist": 0.0, "alerts": 0.0}
+        self.error: Optional[BaseException] = None
+        self._saved = {"updates": 0, "evicted": 0}
+        # Health cache entries for projects still waiting in the queue
+        self._unsaved: List[Dict[str, Any]] = []
+
+    def run(self) -> None:
+        batch: List[Tuple[Dict[str, Any], Any]] = []
+        deadline = None
+        finished = False
+        try:
+            while True:
+                timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+                try:
+                    item = self.queue.get(timeout=timeout)
+                except queue.Empty:
+                    item = None
+                
+                finished = item is _DONE
+                if item is not None and not finished:
+                    batch.append(item)
+                    if deadline is None:
+                        deadline = time.monotonic() + WRITE_INTERVAL_MS / 1000
+                
+                if batch and (item is None or finished or len(batch) >= WRITE_BATCH_SIZE
+                              or time.monotonic() >= deadline):
+                    self._write(batch)
+                    batch, deadline = [], None
+                if finished:
+                    return
+        except BaseException as e:
+            # Keep draining so the producer never blocks on a full queue
+            self.error = e
+            logger.error(f"Scan writer failed: {e}")
+            while not finished:
+                finished = self.queue.get() is _DONE
+        finally:
+            close_thread_connections()
+
+    def _write(self, batch: List[Tuple[Dict[str, Any], Any]]) -> None:
+        started = time.perf_counter()
+        projects = [project for project, _ in batch]
+        health_results = {project["id"]: health for project, health in batch if health is not None}
+        summary = self.db.bulk_sync(projects, self.services, health_results, remove_missing=False)
+        for key in ("updated", "removed"):
+            self.summary[key].extend(summary[key])
+        for key in ("unchanged", "child_rows", "documents", "tasks"):
+            self.summary[key] += summary[key]
+        
+        # The health cache is filled by the producer ahead of the writer; only
+        # this batch's projects have rows yet, so hold the other entries back
+        fresh = {}
+        for key in ("updates", "evicted"):
+            items = getattr(self.health_cache, key)
+            fresh[key] = items[self._saved[key]:len(items)]
+            self._saved[key] += len(fresh[key])
+        batch_ids = {project["id"] for project in projects}
+        entries = self._unsaved + fresh["updates"]
+        self._unsaved = [e for e in entries if e["project_id"] not in batch_ids]
+        self.db.save_check_cache([e for e in entries if e["project_id"] in batch_ids], fresh["evicted"])
+        
+        self.persisted += len(projects)
+        self.progress("persisted", self.persisted)
+        middle = time.perf_counter()
+        self.timings["persist"] += middle - started
+        
+        changed = [p for p in projects if not p.get("unchanged")]
+        if changed:
+            # Volatile detectors run once for every project at the end of the scan
+            self.alerts += persist_alerts(self.db, {p["id"] for p in changed}, scanned=changed, file_only=True)
+        self.timings["alerts"] += time.perf_counter() - middle
+
+
+class ScanService:
+    """
+    Runs the scan pipeline: discover → extract → health → persist → alerts.
+
+    run() streams: directories are discovered lazily, extraction keeps a
+    bounded number in flight, health is checked in small batches and a
+    single writer thread commits results every WRITE_BATCH_SIZE projects or
+    WRITE_INTERVAL_MS, so the database fills in progressively and memory
+    doesn't grow with the fleet.
+
+    executor is an EXECUTOR_MODES name or a concurrent.futures.Executor for
+    the extract stage (the dashboard passes "thread" so it never forks).
+    progress(phase, count) receives "discovered", "extracted", "health" and
+    "persisted" counts as stages advance.
+
+    run() returns a dict with "total" and "changed" (project counts),
+    "summary" (merged DatabaseManager.bulk_sync summaries), "alerts"
+    (count), "cache_hits" and "timings" ({stage: milliseconds} of time spent
+    in each stage, plus "total" wall time; stages overlap).
+    """
+
+    def __init__(
+        self,
+        db: DatabaseManager,
+        base_path: Optional[Union[str, Path]] = None,
+        jobs: Optional[int] = None,
+        executor: ExecutorSpec = "process",
+        progress: Optional[Callable[[str, int], None]] = None
+    ):
+        self.db = db
+        self.base_path = Path(base_path or PROJECTS_BASE_DIR)
+        self.jobs = jobs
+        self.executor = executor
+        self.progress = progress or (lambda phase, count: None)
+
+    def run(self, full: bool = False) -> Dict[str, Any]:
+        """Scan every project (incremental unless full) and persist the results."""
+        started = time.perf_counter()
+        spent = dict.fromkeys(("discover", "extract", "health"), 0.0)
+        
+        # Incremental by default: unchanged projects are skipped via their fingerprint
+        fingerprints = None if full else self.db.get_fingerprints()
+        health_cache = CheckCache(self.db.get_check_cache("health"), get_provider().version)
+        writer = _BatchWriter(self.db, parse_external_resources(), health_cache, self.progress)
+        writer.start()
+        
+        # Only ids extraction returned are kept; directories that stopped
+        # looking like projects are pruned with the vanished ones
+        discovered = 0
+        project_ids: Set[str] = set()
+        counts = {"extracted": 0, "changed": 0, "health": 0}
+        
+        def discover() -> Iterator[Dict[str, Any]]:
+            nonlocal discovered
+            candidates = iter_candidates(
+                self.base_path, fingerprints, lambda project_id: self.db.get_parse_cache(project_id).get(project_id)
+            )
+            while True:
+                clock = time.perf_counter()
+                candidate = next(candidates, None)
+                spent["discover"] += time.perf_counter() - clock
+                if candidate is None:
+                    return
+                discovered += 1
+                self.progress("discovered", discovered)
+                yield candidate
+        
+        pending_health: List[Dict[str, Any]] = []
+        health_deadline = None
+        
+        def flush_health() -> None:
+            nonlocal health_deadline
+            clock = time.perf_counter()
+            health_results = scan_health_parallel(pending_health, check_cache=health_cache, refresh=full)
+            spent["health"] += time.perf_counter() - clock
+            counts["health"] += len(pending_health)
+            self.progress("health", counts["health"])
+            for project in pending_health:
+                writer.queue.put((project, health_results.get(project["id"])))
+            pending_health.clear()
+            health_deadline = None
+        
+        try:
+            extracted = iter_extracted(discover(), self.jobs, self.executor)
+            while True:
+                clock, discovering = time.perf_counter(), spent["discover"]
+                project = next(extracted, None)
+                # Discovery is pulled from inside extraction; don't count it twice
+                spent["extract"] += time.perf_counter() - clock - (spent["discover"] - discovering)
+                if project is None:
+                    break
+                if writer.error is not None:
+                    extracted.close()
+                    break
+                
+                project_ids.add(project["id"])
+                counts["extracted"] += 1
+                self.progress("extracted", counts["extracted"])
+                if project.get("unchanged"):
+                    writer.queue.put((project, None))
+                    continue
+                
+                counts["changed"] += 1
+                pending_health.append(project)
+                if health_deadline is None:
+                    health_deadline = time.monotonic() + WRITE_INTERVAL_MS / 1000
+                if len(pending_health) >= WRITE_BATCH_SIZE or time.monotonic() >= health_deadline:
+                    flush_health()
+            if pending_health:
+                flush_health()
+        finally:
+            writer.queue.put(_DONE)
+            writer.join()
+        
+        if writer.error is not None:
+            raise writer.error
+        
+        # Don't prune when the projects root is missing (e.g. unmounted)
+        summary = writer.summary
+        if self.base_path.exists():
+            summary["removed"] = self.db.prune_projects(project_ids)
+        
+        # Time-dependent alerts (cron, stalled) for every project
+        clock = time.perf_counter()
+        alert_count = writer.alerts + persist_alerts(self.db, set(), all_volatile=True)
+        writer.timings["alerts"] += time.perf_counter() - clock
+        
+        timings = {stage: round(seconds * 1000, 1) for stage, seconds in spent.items()}
+        timings.update({stage: round(seconds * 1000, 1) for stage, seconds in writer.timings.items()})
+        timings["total"] = round((time.perf_counter() - started) * 1000, 1)
+        
+        logger.info(f"Scanned {counts['changed']} of {counts['extracted']} projects; stage timings (ms): {timings}")
+        return {
+            "total": counts["extracted"],
+            "changed": counts["changed"],
+            "summary": summary,
+            "alerts": alert_count,
+            "cache_hits": counts["extracted"] - counts["changed"],
+            "timings": timings
+        }
+
+    def rescan(self, project_path: Path) -> Optional[Dict[str, Any]]:
+        """
+        Re-extract a single project in-process and update only its rows.
+
+        Runs extraction, health and alert evaluation for just this project;
+        other projects' rows (and their volatile alerts) are left alone.
+        Returns {"project", "updated", "alerts", "duration_ms"}, or None if
+        the directory doesn't look like a project.
+        """
+        started = time.perf_counter()
+        project_id = project_id_for(project_path)
+
+        project = scan_candidate(
+            str(project_path), compute_fingerprint(project_path),
+            self.db.get_parse_cache(project_id).get(project_id)
+        )
+        if project is None:
+            return None
+
+        health_cache = CheckCache(self.db.get_check_cache("health"), get_provider().version)
+        health_results = scan_health_parallel([project], max_workers=1, check_cache=health_cache)
+
+        summary = self.db.bulk_sync([project], parse_external_resources(), health_results, remove_missing=False)
+        self.db.save_check_cache(health_cache.updates, health_cache.evicted)
+        alert_count = persist_alerts(self.db, {project["id"]}, scanned=[project], all_volatile=False)
+
+        return {
+            "project": project,
+            "updated": bool(summary["updated"]),
+            "alerts": alert_count,
+            "duration_ms": round((time.perf_counter() - started) * 1000, 1)
+        }
@@ -0,0 +1,52 @@
+"""Full-text search documents collected during project extraction."""
+
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from .parse_cache import ParseCache
+
+# Add parent directory to path for logger import
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+from logger import get_logger
+
+logger = get_logger(__name__)
+
+# File name -> document kind for the files the scanner parses
+DOCUMENT_KINDS = {
+    "TODO.md": "todo",
+    "README.md": "readme",
+    "CODE_REVIEW.md": "review",
+}
+INDEX_PREFIX = "00_Index_"
+
+
+def document_kind(path: Path) -> Optional[str]:
+    """Return the search document kind for a file, or None if it isn't indexed."""
+    if path.name.startswith(INDEX_PREFIX) and path.suffix == ".md":
+        return "index"
+    return DOCUMENT_KINDS.get(path.name)
+
+
+def collect_documents(cache: ParseCache, project_id: str) -> List[Dict[str, Any]]:
+    """
+    List the searchable files a project's extraction went through.
+
+    Each document has path, kind and content_hash (from the parse cache).
+    "text" is included when extraction read the file this time; for files
+    served from the cache by stat signature it is None, since the stored
+    index entry is already current for that content.
+    """
+    documents = {}
+    for entry in cache.used.get(project_id, []):
+        path = entry["path"]
+        kind = document_kind(Path(path))
+        if kind and path not in documents:
+            documents[path] = {
+                "path": path,
+                "kind": kind,
+                "content_hash": entry["content_hash"],
+                "text": cache.contents.get(path)
+            }
+    return list(documents.values())
+
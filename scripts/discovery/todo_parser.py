@@ -1,5 +1,6 @@
 """TODO.md parser for extracting project metadata."""
 
+import hashlib
 import re
 import sys
 from pathlib import Path
@@ -12,69 +13,215 @@ from logger import get_logger
 logger = get_logger(__name__)
 
 
+# Lines scanned for the Project Status / Current Phase header
+HEADER_LINES = 30
+
+# Section titles (prefix match) the tokenizer extracts
+AI_AGENTS_SECTION = "ai agents"
+CRON_SECTION = "cron job"
+BLOCKERS_SECTION = "Blockers"
+GAPS_SECTION = "What's Missing"
+
+# Checkbox list item: "- [ ] text" / "* [x] text"
+TASK_PATTERN = re.compile(r'^\s*[-*]\s+\[([ xX])\]\s+(.*)$')
+
+# Fenced code block delimiter: ``` or ~~~ (3 or more)
+FENCE_PATTERN = re.compile(r'^ {0,3}(`{3,}|~{3,})')
+
+# Infrastructure detection is data-driven: projects must explicitly declare
+# their type in TODO.md with: **Type:** Infrastructure
+# NO hardcoded lists. NO name matching. Data lives with the project.
+INFRASTRUCTURE_MARKER = "**Type:** Infra"
+
+
+def _default_todo_data() -> Dict[str, Any]:
+    """Return the result used when TODO.md is missing or unreadable."""
+    return {
+        "status": "unknown",
+        "phase": None,
+        "ai_agents": [],
+        "cron_jobs": [],
+        "completion_pct": 0,
+        "description": None,
+        "is_infrastructure": False,
+        "tasks_total": 0,
+        "tasks_done": 0,
+        "blockers": [],
+        "gaps": [],
+        "tasks": []
+    }
+
+
 def parse_todo(todo_path: Path) -> Dict[str, Any]:
-    """Extract metadata from TODO.md."""
+    """Extract metadata from TODO.md (one read, one tokenizer pass)."""
     if not todo_path.exists():
         logger.debug(f"TODO.md not found: {todo_path}")
-        return {
-            "status": "unknown",
-            "phase": None,
-            "ai_agents": [],
-            "cron_jobs": [],
-            "completion_pct": 0,
-            "description": None
-        }
+        return _default_todo_data()
     
     try:
         content = todo_path.read_text()
     except Exception as e:
         logger.error(f"Failed to read TODO.md at {todo_path}: {e}", exc_info=True)
-        return {
-            "status": "unknown",
-            "phase": None,
-            "ai_agents": [],
-            "cron_jobs": [],
-            "completion_pct": 0,
-            "description": None
-        }
-    
-    data = {
-        "status": "unknown",
-        "phase": None,
-        "ai_agents": [],
-        "cron_jobs": [],
-        "completion_pct": 0,
-        "description": None
-    }
+        return _default_todo_data()
+    
+    return parse_todo_content(content)
+
+
+def parse_todo_content(content: str) -> Dict[str, Any]:
+    """Extract metadata from TODO.md content (parse_todo without the read)."""
+    data = tokenize_todo(content)
+    data.pop("sections")
+    return data
+
+
+def tokenize_todo(content: str) -> Dict[str, Any]:
+    """
+    Scan TODO.md content once and return everything consumers need.
+    
+    Builds a section tree (headings nest by level; each node keeps the lines
+    up to the next heading) while collecting the header status/phase, type
+    marker, tasks (and their checkbox counts) and description. AI agents, cron jobs,
+    blockers and gaps are then read from their sections without rescanning
+    content. Each task records its section heading, 1-based line number,
+    text and checked state.
+    """
+    data = _default_todo_data()
+    root = {"title": None, "level": 0, "lines": [], "children": []}
+    stack = [root]
+    sections = []
     
-    # Extract header metadata (first 30 lines)
-    lines = content.split('\n')
-    for i, line in enumerate(lines[:30]):
-        # Project Status
-        if "Project Status:" in line or "**Project Status:**" in line:
-            data["status"] = extract_status(line)
+    description_lines = []
+    in_content = False
+    description_done = False
+    fence = None
+    
+    for i, line in enumerate(content.split('\n')):
+        stripped = line.strip()
+        
+        # Inside fenced code (crontab/bash snippets) '#' lines are comments,
+        # not headings, and checkboxes aren't tasks
+        fence_match = FENCE_PATTERN.match(line)
+        if fence is not None:
+            if fence_match and fence_match.group(1)[0] == fence[0] and len(fence_match.group(1)) >= len(fence):
+                fence = None
+            stack[-1]["lines"].append(line)
+            continue
+        if fence_match:
+            fence = fence_match.group(1)
+        
+        # Header metadata
+        if i < HEADER_LINES:
+            if "Project Status:" in line:
+                data["status"] = extract_status(line)
+            elif "Current Phase:" in line:
+                data["phase"] = extract_phase(line)
         
-        # Current Phase
-        elif "Current Phase:" in line or "**Current Phase:**" in line:
-            data["phase"] = extract_phase(line)
+        if INFRASTRUCTURE_MARKER in line:
+            data["is_infrastructure"] = True
+        
+        if line.startswith('#'):
+            level = len(line) - len(line.lstrip('#'))
+            node = {"title": line[level:].strip(), "level": level, "lines": [], "children": []}
+            while stack[-1]["level"] >= level:
+                stack.pop()
+            stack[-1]["children"].append(node)
+            stack.append(node)
+            sections.append(node)
+            
+            # Description: first paragraph after the title
+            in_content = True
+            continue
+        
+        stack[-1]["lines"].append(line)
+        
+        task = TASK_PATTERN.match(line)
+        if task:
+            data["tasks"].append({
+                "section": stack[-1]["title"],
+                "line": i + 1,
+                "text": task.group(2).strip(),
+                "checked": task.group(1).lower() == "x"
+            })
+        
+        if not description_done and in_content and (description_lines or stripped):
+            if line.startswith('---') or (not stripped and description_lines):
+                description_done = True
+            elif stripped and not line.startswith('**'):
+                description_lines.append(stripped)
+    
+    # Counts come from the parsed tasks so completion matches what `pt tasks` lists
+    data["tasks_total"] = len(data["tasks"])
+    data["tasks_done"] = sum(1 for task in data["tasks"] if task["checked"])
+    data["completion_pct"] = _completion_pct(data["tasks_done"], data["tasks_total"])
+    
+    description = ' '.join(description_lines)
+    if len(description) > 200:
+        description = description[:197] + "..."
+    data["description"] = description or None
     
-    # Extract AI agents
-    if "### AI Agents" in content or "## AI Agents" in content:
-        data["ai_agents"] = extract_ai_agents(content)
+    agents_section = _find_section(sections, AI_AGENTS_SECTION, min_level=3, ignore_case=True)
+    if agents_section:
+        data["ai_agents"] = extract_ai_agents(agents_section["lines"])
     
-    # Extract cron jobs
-    if "### Cron Job" in content or "## Cron Job" in content:
-        data["cron_jobs"] = extract_cron_jobs(content)
+    cron_section = _find_section(sections, CRON_SECTION, min_level=3, ignore_case=True)
+    if cron_section:
+        data["cron_jobs"] = extract_cron_jobs(cron_section["lines"])
     
-    # Calculate completion percentage
-    data["completion_pct"] = calculate_completion(content)
+    blockers_section = _find_section(sections, BLOCKERS_SECTION)
+    if blockers_section:
+        data["blockers"] = _clean_lines(blockers_section["lines"])
     
-    # Extract description (first paragraph after title)
-    data["description"] = extract_description(content)
+    gaps_section = _find_section(sections, GAPS_SECTION)
+    if gaps_section:
+        data["gaps"] = _clean_lines(gaps_section["lines"])
     
+    data["sections"] = root["children"]
     return data
 
 
+def assign_task_ids(project_id: str, tasks: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Give each task a stable id: hash of project, section, text and occurrence.
+    
+    The occurrence index tells apart identical tasks in the same section, so
+    ids survive lines moving and tasks being checked off.
+    """
+    seen: Dict[tuple, int] = {}
+    result = []
+    for task in tasks:
+        key = (task["section"] or "", task["text"])
+        occurrence = seen.get(key, 0)
+        seen[key] = occurrence + 1
+        result.append(dict(task, id=task_id(project_id, key[0], key[1], occurrence)))
+    return result
+
+
+def task_id(project_id: str, section: str, text: str, occurrence: int = 0) -> str:
+    """Hash identifying a task across rescans."""
+    return hashlib.sha1(f"{project_id}|{section}|{text}|{occurrence}".encode("utf-8")).hexdigest()
+
+
+def _find_section(sections: List[Dict[str, Any]], prefix: str, min_level: int = 2,
+                  ignore_case: bool = False) -> Optional[Dict[str, Any]]:
+    """Return the first section at min_level or deeper whose title starts with prefix."""
+    for section in sections:
+        title = section["title"].lower() if ignore_case else section["title"]
+        if section["level"] >= min_level and title.startswith(prefix):
+            return section
+    return None
+
+
+def _clean_lines(lines: List[str]) -> List[str]:
+    """Return non-empty section lines with list markers stripped."""
+    return [line.strip().lstrip('- ').lstrip('* ').strip()
+            for line in lines if line.strip()]
+
+
+def has_entries(lines: List[str]) -> bool:
+    """True if a section lists real items rather than nothing or just "None"."""
+    return len(lines) > 0 and not any(l.lower() == "none" for l in lines)
+
+
 def extract_status(line: str) -> str:
     """Extract status from a line."""
     # Remove markdown formatting and emojis
@@ -114,21 +261,12 @@ def extract_phase(line: str) -> Optional[str]:
     return None
 
 
-def extract_ai_agents(content: str) -> List[Dict[str, str]]:
-    """Extract AI agents from content."""
+def extract_ai_agents(section_lines: List[str]) -> List[Dict[str, str]]:
+    """Extract AI agents from the lines of an AI Agents section."""
     agents = []
     
-    # Find AI Agents section
-    pattern = r"### AI Agents.*?(?=\n##|\n###|$)"
-    match = re.search(pattern, content, re.DOTALL | re.IGNORECASE)
-    
-    if not match:
-        return agents
-    
-    section = match.group(0)
-    
     # Parse list items like: - **Claude Sonnet 4.5:** Role description
-    for line in section.split('\n'):
+    for line in section_lines:
         if line.strip().startswith('- '):
             # Remove leading dash
             line = line.strip()[2:]
@@ -148,25 +286,16 @@ def extract_ai_agents(content: str) -> List[Dict[str, str]]:
     return agents
 
 
-def extract_cron_jobs(content: str) -> List[Dict[str, str]]:
-    """Extract cron jobs from content."""
+def extract_cron_jobs(section_lines: List[str]) -> List[Dict[str, str]]:
+    """Extract cron jobs from the lines of a Cron Jobs section."""
     jobs = []
     
-    # Find Cron Jobs section
-    pattern = r"### Cron Job.*?(?=\n##|\n###|$)"
-    match = re.search(pattern, content, re.DOTALL | re.IGNORECASE)
-    
-    if not match:
-        return jobs
-    
-    section = match.group(0)
-    
     # Parse schedule and command
     schedule = None
     command = None
     description = None
     
-    for line in section.split('\n'):
+    for line in section_lines:
         if "Schedule:" in line:
             schedule_text = line.split("Schedule:", 1)[1].strip().replace('`', '').replace('**', '')
             # Extract just the cron expression (before any parenthetical explanation)
@@ -189,49 +318,13 @@ def extract_cron_jobs(content: str) -> List[Dict[str, str]]:
 
 def calculate_completion(content: str) -> int:
     """Calculate completion percentage from task checkboxes."""
-    total_tasks = content.count("- [ ]") + content.count("- [x]")
-    completed_tasks = content.count("- [x]")
-    
+    checks = [m.group(1) for m in map(TASK_PATTERN.match, content.split('\n')) if m]
+    return _completion_pct(sum(1 for c in checks if c.lower() == "x"), len(checks))
+
+
+def _completion_pct(completed_tasks: int, total_tasks: int) -> int:
+    """Return completed/total as an integer percentage."""
     if total_tasks == 0:
         return 0
     
     return int((completed_tasks / total_tasks) * 100)
-
-
-def extract_description(content: str) -> Optional[str]:
-    """Extract project description (first paragraph)."""
-    lines = content.split('\n')
-    
-    # Skip title and metadata
-    in_content = False
-    description_lines = []
-    
-    for line in lines:
-        # Start collecting after we pass the header
-        if line.startswith('#'):
-            in_content = True
-            continue
-        
-        # Skip empty lines at start
-        if not in_content or (not description_lines and not line.strip()):
-            continue
-        
-        # Stop at next heading or section marker
-        if line.startswith('#') or line.startswith('---'):
-            break
-        
-        # Stop at blank line after we've collected something
-        if not line.strip() and description_lines:
-            break
-        
-        if line.strip() and not line.startswith('**'):
-            description_lines.append(line.strip())
-    
-    description = ' '.join(description_lines)
-    
-    # Limit length
-    if len(description) > 200:
-        description = description[:197] + "..."
-    
-    return description if description else None
-
@@ -5,13 +5,14 @@ import sys
 import webbrowser
 import time
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Annotated
 import subprocess
 
 import typer
 from rich.console import Console
 from rich.table import Table
 from rich.progress import Progress
+from rich.markup import escape
 
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
@@ -20,8 +21,9 @@ sys.path.insert(0, str(Path(__file__).parent))
 from config import PROJECTS_BASE_DIR
 from db.schema import init_db
 from db.manager import DatabaseManager
-from discovery.project_scanner import discover_projects, scan_health_parallel
-from discovery.external_resources_parser import parse_external_resources
+from discovery.project_scanner import EXECUTOR_MODES, provider_task_rows
+from discovery.providers import TASK_BATCH_SIZE, batched, get_provider
+from discovery.scan_service import ScanService
 
 app = typer.Typer(
     name="pt",
@@ -32,6 +34,14 @@ app = typer.Typer(
 )
 console = Console()
 
+# Progress messages for ScanService phases
+SCAN_PHASE_LABELS = {
+    "discovered": "Discovering projects",
+    "extracted": "Extracting metadata",
+    "health": "Auditing project health",
+    "persisted": "Saving and evaluating alerts",
+}
+
 
 @app.command()
 def init():
@@ -42,112 +52,81 @@ def init():
 
 
 @app.command()
-def scan():
+def scan(
+    full: Annotated[bool, typer.Option("--full", help="Ignore the fingerprint cache and rescan every project")] = False,
+    jobs: Annotated[Optional[int], typer.Option("--jobs", "-j", help="Parallel extraction workers (default: CPU count)")] = None,
+    executor: Annotated[str, typer.Option("--executor", help="Worker pool type: 'process' or 'thread' (for network filesystems)")] = "process",
+    project: Annotated[Optional[str], typer.Option("--project", "-p", help="Rescan only this project (name or id)")] = None
+):
     """Scan projects directory and update database."""
-    console.print(f"[bold blue]Scanning projects in {PROJECTS_BASE_DIR}...[/bold blue]")
+    if executor not in EXECUTOR_MODES:
+        console.print(f"[red]--executor must be one of: {', '.join(EXECUTOR_MODES)}[/red]")
+        raise typer.Exit(1)
     
     # Ensure database exists
     init_db()
     db = DatabaseManager()
     
-    # Discover projects
-    with Progress() as progress:
-        task = progress.add_task("[cyan]Discovering projects...", total=None)
-        projects = discover_projects(PROJECTS_BASE_DIR)
-        progress.update(task, completed=True)
+    if project:
+        _scan_single_project(db, project)
+        return
     
-    console.print(f"\n[green]Found {len(projects)} projects[/green]\n")
+    console.print(f"[bold blue]Scanning projects in {PROJECTS_BASE_DIR}...[/bold blue]")
     
-    # Run health checks in parallel
     with Progress() as progress:
-        task = progress.add_task("[cyan]Auditing project health...", total=len(projects))
-        health_results = scan_health_parallel(projects)
-        progress.update(task, advance=len(projects))
-    
-    # Get current project IDs in database
-    existing_projects = db.get_all_projects()
-    existing_ids = {p["id"] for p in existing_projects}
-    discovered_ids = {p["id"] for p in projects}
-    
-    # Delete projects that are no longer found
-    to_delete = existing_ids - discovered_ids
-    for project_id in to_delete:
-        db.delete_project(project_id)
-        project_name = next((p["name"] for p in existing_projects if p["id"] == project_id), project_id)
-        console.print(f"  [red]✗ Removed {project_name}[/red]")
-    
-    # Update database
-    for project in projects:
-        # Add/update project
-        db.add_project(
-            project_id=project["id"],
-            name=project["name"],
-            path=project["path"],
-            status=project["status"],
-            description=project.get("description"),
-            phase=project.get("phase"),
-            last_modified=project["last_modified"],
-            completion_pct=project.get("completion_pct", 0),
-            is_infrastructure=project.get("is_infrastructure", False),
-            has_index=project.get("has_index", False),
-            index_is_valid=project.get("index_is_valid", False),
-            index_updated_at=project.get("index_updated_at"),
-            project_type=project.get("project_type", "standard")
-        )
-        
-        # Clear old AI agents, cron jobs, and services
-        db.delete_ai_agents(project["id"])
-        db.delete_cron_jobs(project["id"])
-        db.delete_services(project["id"])
-        # Services will be repopulated from EXTERNAL_RESOURCES.md below
-        
-        # Add AI agents
-        for agent in project.get("ai_agents", []):
-            db.add_ai_agent(
-                project_id=project["id"],
-                agent_name=agent["agent_name"],
-                role=agent.get("role")
-            )
-        
-        # Add cron jobs
-        for job in project.get("cron_jobs", []):
-            db.add_cron_job(
-                project_id=project["id"],
-                schedule=job["schedule"],
-                command=job["command"],
-                description=job.get("description")
-            )
+        task = progress.add_task("[cyan]Discovering projects...", total=None)
         
-        console.print(f"  ✓ {project['name']}")
+        def on_progress(phase: str, count: int):
+            progress.update(task, description=f"[cyan]{SCAN_PHASE_LABELS[phase]}... {count}")
         
-        # Update health if available
-        health = health_results.get(project["id"])
-        if health:
-            db.update_health(
-                project_id=project["id"],
-                score=health["score"],
-                grade=health["grade"]
-            )
-    
-    # Parse and add services from EXTERNAL_RESOURCES.md
-    console.print(f"\n[bold blue]Loading services from EXTERNAL_RESOURCES.md...[/bold blue]")
-    services_by_project = parse_external_resources()
-    
-    services_added = 0
-    for project_id, services in services_by_project.items():
-        for service in services:
-            db.add_service(
-                project_id=project_id,
-                service_name=service["service_name"],
-                purpose=service.get("purpose"),
-                cost_monthly=service.get("cost_monthly")
-            )
-            services_added += 1
+        service = ScanService(db, PROJECTS_BASE_DIR, jobs=jobs, executor=executor, progress=on_progress)
+        result = service.run(full=full)
+        progress.update(task, completed=True)
     
-    if services_added > 0:
-        console.print(f"  [green]✓ Added {services_added} services across {len(services_by_project)} projects[/green]")
+    summary = result["summary"]
+    console.print(f"\n[green]Found {result['total']} projects[/green]\n")
     
-    console.print(f"\n[bold green]✅ Scan complete! {len(projects)} projects updated[/bold green]")
+    for project_name in summary["removed"]:
+        console.print(f"  [red]✗ Removed {project_name}[/red]")
+    for project_name in summary["updated"]:
+        console.print(f"  ✓ {project_name}")
+    
+    if summary["child_rows"] > 0:
+        console.print(f"  [green]✓ Wrote {summary['child_rows']} agent/cron/service rows[/green]")
+    if summary["tasks"] > 0:
+        console.print(f"  [green]✓ Updated {summary['tasks']} task rows[/green]")
+    if summary["documents"] > 0:
+        console.print(f"  [green]✓ Indexed {summary['documents']} documents for search[/green]")
+    console.print(f"  [green]✓ {result['alerts']} alerts evaluated[/green]")
+    
+    if not full:
+        console.print(f"\n[dim]Fingerprint cache: {result['cache_hits']} unchanged, {result['changed']} rescanned[/dim]")
+    timings = ", ".join(f"{stage} {ms:.0f}ms" for stage, ms in result["timings"].items())
+    console.print(f"[dim]Stages: {timings}[/dim]")
+    
+    console.print(f"\n[bold green]✅ Scan complete! {result['changed']} of {result['total']} projects updated[/bold green]")
+
+
+def _scan_single_project(db: DatabaseManager, name: str):
+    """Rescan one project (by directory name or database id) in-process."""
+    project_path = PROJECTS_BASE_DIR / name
+    if not project_path.is_dir():
+        existing = db.get_project(name)
+        project_path = Path(existing["path"]) if existing else None
+    if project_path is None or not project_path.is_dir():
+        console.print(f"[red]Project '{escape(name)}' not found in {PROJECTS_BASE_DIR}[/red]")
+        raise typer.Exit(1)
+    
+    result = ScanService(db).rescan(project_path)
+    if result is None:
+        console.print(f"[yellow]{escape(project_path.name)} doesn't look like a project; nothing updated.[/yellow]")
+        raise typer.Exit(1)
+    
+    state = "updated" if result["updated"] else "unchanged"
+    console.print(
+        f"[green]✓ {escape(result['project']['name'])} {state}[/green] "
+        f"[dim]({result['alerts']} alerts, {result['duration_ms']} ms)[/dim]"
+    )
 
 
 @app.command(name="list")
@@ -196,6 +175,116 @@ def list_projects():
     console.print(f"\n[bold]Total: {len(projects)} projects[/bold]")
 
 
+@app.command(name="import-tasks")
+def import_tasks(
+    root: Annotated[Optional[Path], typer.Option("--root", help="Directory of projects, or one project, to scan (default: projects directory)")] = None
+):
+    """Stream tasks into the task index via `audit tasks`, or TODO.md parsing without it (Ctrl-C stops cleanly)."""
+    provider = get_provider()
+    
+    init_db()
+    db = DatabaseManager()
+    rows = provider_task_rows(provider, root)
+    
+    try:
+        seen = db.import_tasks(batched(rows, TASK_BATCH_SIZE))
+    except KeyboardInterrupt:
+        # Batches already written stay; nothing is pruned from a partial stream
+        console.print("\n[yellow]Import interrupted; committed batches were kept.[/yellow]")
+        raise typer.Exit(130)
+    
+    removed = db.prune_tasks(seen)
+    imported = sum(len(ids) for ids in seen.values())
+    console.print(f"[green]✓ Imported {imported} tasks from {len(seen)} projects ({removed} stale removed)[/green]")
+
+
+@app.command()
+def search(
+    query: str,
+    limit: Annotated[int, typer.Option("--limit", "-n", help="Maximum number of results")] = 20
+):
+    """Search TODO, README, index and code review documents."""
+    db = DatabaseManager()
+    
+    try:
+        # Control characters as markers, so document text can be escaped safely
+        results = db.search_documents(query, limit=limit, highlight=("\x02", "\x03"))
+    except RuntimeError as e:
+        console.print(f"[red]{e}[/red]")
+        raise typer.Exit(1)
+    
+    if not results:
+        console.print(f"[yellow]No documents match '{escape(query)}'.[/yellow]")
+        return
+    
+    for result in results:
+        snippet = escape(" ".join(result["snippet"].split()))
+        snippet = snippet.replace("\x02", "[bold yellow]").replace("\x03", "[/bold yellow]")
+        console.print(f"[cyan]{escape(result['project_name'])}[/cyan] [dim]{Path(result['path']).name}[/dim]")
+        console.print(f"  {snippet}\n")
+    
+    console.print(f"[bold]{len(results)} results[/bold]")
+
+
+@app.command()
+def tasks(
+    project: Annotated[Optional[str], typer.Option("--project", "-p", help="Only tasks from this project (name)")] = None,
+    section: Annotated[Optional[str], typer.Option("--section", "-s", help="Only tasks under this TODO.md heading")] = None,
+    show_all: Annotated[bool, typer.Option("--all", help="Include completed tasks")] = False,
+    older_than: Annotated[Optional[int], typer.Option("--older-than", help="Only tasks first seen at least N days ago")] = None,
+    by_age: Annotated[bool, typer.Option("--by-age", help="Oldest tasks first")] = False,
+    page: Annotated[int, typer.Option("--page", help="Page number (1-based)")] = 1,
+    per_page: Annotated[int, typer.Option("--per-page", help="Tasks per page")] = 50
+):
+    """List open TODO.md tasks across all projects."""
+    db = DatabaseManager()
+    
+    project_id = None
+    if project:
+        match = [p for p in db.get_all_projects() if p["name"].lower() == project.lower()]
+        if not match:
+            console.print(f"[red]Project '{project}' not found[/red]")
+            raise typer.Exit(1)
+        project_id = match[0]["id"]
+    
+    filters = {
+        "project_id": project_id,
+        "section": section,
+        "checked": None if show_all else False,
+        "older_than_days": older_than
+    }
+    page = max(page, 1)
+    total = db.count_tasks(**filters)
+    rows = db.get_tasks(
+        **filters, order_by="age" if by_age else "project",
+        limit=per_page, offset=(page - 1) * per_page
+    )
+    
+    if not rows:
+        console.print("[yellow]No matching tasks. Run 'pt scan' to refresh.[/yellow]")
+        return
+    
+    table = Table(title="Tasks")
+    table.add_column("Project", style="cyan", no_wrap=True)
+    table.add_column("Section")
+    table.add_column("", justify="center")
+    table.add_column("Task")
+    table.add_column("Since")
+    
+    for task in rows:
+        table.add_row(
+            escape(task["project_name"]),
+            escape(task["section"] or "-"),
+            "[green]✓[/green]" if task["checked"] else "☐",
+            f"{escape(task['text'])} [dim]:{task['line']}[/dim]",
+            task["first_seen"].split("T")[0]
+        )
+    
+    console.print(table)
+    pages = (total + per_page - 1) // per_page
+    console.print(f"\n[bold]{total} tasks[/bold] (page {page} of {pages})")
+
+
 @app.command()
 def status(name: str):
     """Show detailed status for a project."""
@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+"""Stand-in for `audit serve` used by the worker pool tests.
+
+Reads one JSON request per line from stdin and writes one JSON response per
+line to stdout. Paths ending in "crash" exit the process, "slow" sleeps
+before answering and "bad" gets an error reply.
+"""
+
+import json
+import os
+import sys
+import time
+
+
+def handle(request):
+    path = request.get("path", "")
+    if path.endswith("slow"):
+        time.sleep(5)
+    if path.endswith("bad"):
+        return {"id": request["id"], "error": "cannot check"}
+
+    op = request.get("op")
+    if op == "check":
+        result = {"valid": True, "issues": [], "pid": os.getpid()}
+    elif op == "fix":
+        result = {"fixed": True}
+    elif op == "health":
+        result = {"score": 88, "grade": "B"}
+    else:
+        result = {}
+    return {"id": request["id"], "result": result}
+
+
+if __name__ == "__main__":
+    for line in sys.stdin:
+        request = json.loads(line)
+        if request.get("path", "").endswith("crash"):
+            os._exit(1)
+        print(json.dumps(handle(request)), flush=True)
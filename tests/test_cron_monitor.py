@@ -0,0 +1,94 @@
+"""Tests for crontab matching and cron log reading."""
+
+import pytest
+from datetime import datetime
+from pathlib import Path
+import tempfile
+import sys
+
+# Add scripts to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+from discovery.cron_monitor import CrontabSnapshot, check_crontab_installed, check_log_file, read_lines_reversed
+
+CRONTAB = """# m h dom mon dow command
+MAILTO=me@example.com
+0 2 * * * cd /srv/app && /usr/bin/python backup.py >> logs/cron.log 2>&1
+@daily /home/me/bin/rotate.sh
+*/5 * * * * python3 /opt/other/poll.py
+"""
+
+
+class TestCrontabSnapshot:
+    """Tests for the indexed crontab snapshot."""
+
+    def test_parses_jobs_and_skips_comments_and_env(self):
+        """Comments and VAR=value lines aren't jobs."""
+        snapshot = CrontabSnapshot(CRONTAB)
+        assert [e["schedule"] for e in snapshot.entries] == ["0 2 * * *", "@daily", "*/5 * * * *"]
+
+    def test_matches_by_script_name(self):
+        """A tracked command matches an entry that runs the same script."""
+        snapshot = CrontabSnapshot(CRONTAB)
+        installed, line = check_crontab_installed("python backup.py", snapshot)
+        assert installed
+        assert "backup.py" in line
+        assert check_crontab_installed("bin/rotate.sh", snapshot)[0]
+        assert check_crontab_installed("python missing.py", snapshot) == (False, None)
+
+    def test_log_and_working_directory_dont_match(self):
+        """Sharing a redirect target or cd directory isn't running the same job."""
+        snapshot = CrontabSnapshot(CRONTAB)
+        tracked = "python3 /home/me/other/app/sync.py >> /tmp/cron.log"
+        assert check_crontab_installed(tracked, snapshot) == (False, None)
+        assert check_crontab_installed("cd /srv/app && ./deploy.sh", snapshot) == (False, None)
+        assert len(snapshot.untracked_entries([tracked])) == 3
+
+    def test_untracked_entries(self):
+        """Entries no tracked job accounts for are reported."""
+        snapshot = CrontabSnapshot(CRONTAB)
+        untracked = snapshot.untracked_entries(["python backup.py", "rotate.sh"])
+        assert [e["command"] for e in untracked] == ["python3 /opt/other/poll.py"]
+
+
+class TestCronLogReader:
+    """Tests for the tail-seeking cron log reader."""
+
+    def test_read_lines_reversed_across_blocks(self):
+        """Lines come back newest first, even when they straddle block boundaries."""
+        with tempfile.NamedTemporaryFile(mode="w", suffix=".log", delete=False) as f:
+            f.write("".join(f"line {i}\n" for i in range(50)))
+            log_path = Path(f.name)
+        try:
+            lines = [l for l in read_lines_reversed(log_path, block_size=7) if l]
+            assert lines[0] == "line 49"
+            assert lines[-1] == "line 0"
+            assert len(lines) == 50
+        finally:
+            log_path.unlink()
+
+    def test_resumes_from_saved_offset(self):
+        """A second check only reads appended bytes and carries the previous result."""
+        with tempfile.NamedTemporaryFile(mode="w", suffix=".log", delete=False) as f:
+            f.write("2025-01-01 02:00:00 start\nall good\n")
+            log_path = Path(f.name)
+        try:
+            state = {}
+            assert check_log_file(log_path, state) == (datetime(2025, 1, 1, 2, 0, 0), "success")
+            assert state["offset"] == log_path.stat().st_size
+
+            with open(log_path, "a") as f:
+                f.write("Traceback (most recent call last):\n")
+
+            assert check_log_file(log_path, state) == (datetime(2025, 1, 1, 2, 0, 0), "error")
+
+            with open(log_path, "a") as f:
+                f.write("2025-01-02 02:00:00 start\nok\n")
+
+            assert check_log_file(log_path, state) == (datetime(2025, 1, 2, 2, 0, 0), "success")
+        finally:
+            log_path.unlink()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
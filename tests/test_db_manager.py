@@ -0,0 +1,473 @@
+"""Tests for DatabaseManager scan persistence."""
+
+import os
+import pytest
+from pathlib import Path
+import tempfile
+import sys
+
+# Add scripts to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+from db.schema import create_database
+from db import manager
+from db.manager import DatabaseManager, close_all_connections
+from discovery import alert_detector
+from discovery.cron_monitor import CrontabSnapshot
+from discovery.check_cache import CheckCache
+from discovery.parse_cache import ParseCache
+from discovery import project_scanner, scan_service
+from discovery.scan_service import SCAN_STAGES, ScanService
+
+
+def _project(project_id: str, **overrides):
+    project = {
+        "id": project_id,
+        "name": project_id,
+        "path": f"/projects/{project_id}",
+        "status": "active",
+        "last_modified": "2025-01-01T00:00:00+00:00",
+        "completion_pct": 50,
+        "ai_agents": [{"agent_name": "Claude", "role": "review"}],
+        "cron_jobs": [],
+        "fingerprint": "fp-1"
+    }
+    project.update(overrides)
+    return project
+
+
+@pytest.fixture
+def db():
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = Path(tmp) / "tracker.db"
+        create_database(db_path)
+        yield DatabaseManager(db_path)
+        close_all_connections()
+
+
+class TestBulkSync:
+    """Tests for DatabaseManager.bulk_sync."""
+
+    def test_writes_projects_children_and_health(self, db):
+        """A first sync inserts projects, agents, services, health and fingerprints."""
+        services = {"alpha": [{"service_name": "OpenAI", "purpose": "AI", "cost_monthly": 5}]}
+        health = {"alpha": {"score": 90, "grade": "A"}}
+
+        summary = db.bulk_sync([_project("alpha")], services, health)
+
+        assert summary["updated"] == ["alpha"]
+        project = db.get_project("alpha")
+        assert project["health_grade"] == "A"
+        assert [a["agent_name"] for a in db.get_ai_agents("alpha")] == ["Claude"]
+        assert [s["service_name"] for s in db.get_services("alpha")] == ["OpenAI"]
+        assert db.get_fingerprints() == {"alpha": "fp-1"}
+
+    def test_unchanged_rows_are_not_rewritten(self, db):
+        """Re-syncing identical data leaves rows (and their ids) untouched."""
+        db.bulk_sync([_project("alpha")], {}, {})
+        agent_id = db.get_ai_agents("alpha")[0]["id"]
+
+        summary = db.bulk_sync([_project("alpha")], {}, {})
+
+        assert summary["updated"] == []
+        assert summary["child_rows"] == 0
+        assert db.get_ai_agents("alpha")[0]["id"] == agent_id
+
+    def test_removes_missing_and_keeps_unchanged_stubs(self, db):
+        """Undiscovered projects are removed; unchanged stubs keep their rows."""
+        db.bulk_sync([_project("alpha"), _project("beta")], {}, {})
+
+        stub = {"id": "alpha", "name": "alpha", "path": "/projects/alpha", "unchanged": True}
+        summary = db.bulk_sync([stub], {}, {})
+
+        assert summary["removed"] == ["beta"]
+        assert db.get_project("beta") is None
+        assert db.get_project("alpha")["completion_pct"] == 50
+        assert len(db.get_ai_agents("alpha")) == 1
+
+
+    def test_batch_sync_reads_only_batch_rows(self, db, monkeypatch):
+        """Without remove_missing, existing rows are read per batch project id, in chunks."""
+        db.bulk_sync([_project("alpha"), _project("beta"), _project("gamma")], {}, {})
+        monkeypatch.setattr(manager, "IN_CHUNK_SIZE", 1)
+        statements = []
+        with db._get_conn() as conn:
+            conn.set_trace_callback(statements.append)
+        try:
+            summary = db.bulk_sync(
+                [_project("alpha", completion_pct=60), _project("beta", ai_agents=[])], {}, {}, remove_missing=False
+            )
+            db.replace_alerts([], ["alpha", "beta"], ["stalled"])
+        finally:
+            with db._get_conn() as conn:
+                conn.set_trace_callback(None)
+
+        assert summary["updated"] == ["alpha"]
+        assert db.get_ai_agents("beta") == [] and len(db.get_ai_agents("gamma")) == 1
+        reads = [" ".join(sql.split()) for sql in statements if sql.lstrip().startswith("SELECT")]
+        assert all("WHERE" in sql for sql in reads if " FROM projects" in sql or " FROM alerts" in sql or " FROM ai_agents" in sql)
+        assert not any("'gamma'" in sql for sql in reads)
+        assert sum("FROM projects WHERE id IN ('alpha')" in sql for sql in reads) == 1
+
+class TestRelations:
+    """Tests for batched relation loading."""
+
+    def test_get_projects_with_relations(self, db):
+        """Relations are grouped per project, including projects without any."""
+        services = {"alpha": [{"service_name": "OpenAI", "purpose": "AI", "cost_monthly": 5}]}
+        db.bulk_sync([_project("alpha"), _project("beta", ai_agents=[])], services, {})
+
+        projects = {p["id"]: p for p in db.get_projects_with_relations(order_by="name")}
+
+        assert [a["agent_name"] for a in projects["alpha"]["relations"]["ai_agents"]] == ["Claude"]
+        assert [s["service_name"] for s in projects["alpha"]["relations"]["services"]] == ["OpenAI"]
+        assert projects["beta"]["relations"] == {"ai_agents": [], "cron_jobs": [], "services": []}
+
+
+class TestAlerts:
+    """Tests for persisted alerts."""
+
+    def _alert(self, project_id: str, fingerprint: str, detector: str = "stalled"):
+        return {
+            "fingerprint": fingerprint, "project_id": project_id, "detector": detector,
+            "type": detector, "severity": "warning", "message": "msg", "details": None
+        }
+
+    def test_replace_alerts_is_scoped(self, db):
+        """Only alerts inside the (projects, detectors) scope are invalidated."""
+        db.bulk_sync([_project("alpha"), _project("beta")], {}, {})
+        db.replace_alerts(
+            [self._alert("alpha", "a1"), self._alert("beta", "b1"), self._alert("alpha", "a2", "index")],
+            ["alpha", "beta"], ["stalled", "index"]
+        )
+        first_seen = {a["fingerprint"]: a["first_seen"] for a in db.get_alerts()}
+
+        # Re-run only the stalled detector for alpha, which no longer fires
+        db.replace_alerts([], ["alpha"], ["stalled"])
+
+        remaining = {a["fingerprint"]: a for a in db.get_alerts()}
+        assert set(remaining) == {"b1", "a2"}
+        assert remaining["b1"]["first_seen"] == first_seen["b1"]
+        assert remaining["b1"]["project_name"] == "beta"
+
+    def test_cron_log_offsets_use_given_database(self, db, monkeypatch):
+        """persist_alerts keeps cron log offsets in the database it was given."""
+        monkeypatch.setattr(alert_detector, "get_crontab_snapshot",
+                            lambda: CrontabSnapshot("0 2 * * * python3 sync.py"))
+
+        with tempfile.TemporaryDirectory() as tmp:
+            log = Path(tmp) / "cron.log"
+            log.write_text("2025-01-01 02:00:00 sync done\n")
+            job = {"schedule": "0 2 * * *", "command": "python3 sync.py", "description": "sync"}
+            db.bulk_sync([_project("alpha", path=tmp, cron_jobs=[job])], {}, {})
+
+            alert_detector.persist_alerts(db, set())
+
+            assert list(db.get_log_states()) == [str(log)]
+
+
+class TestCodeReviews:
+    """Tests for scan-time code review ingestion."""
+
+    def test_reviews_and_items_round_trip(self, db):
+        """Reviews are stored with ordered items and queried by status."""
+        review = {
+            "reviewer": "Alice", "date": "2025-01-02T00:00:00", "verdict": "NEEDS WORK",
+            "status": "in_progress", "summary": "Tighten it up", "completion_pct": 50,
+            "action_items": [{"text": "Fix A", "checked": True}, {"text": "Fix B", "checked": False}]
+        }
+        db.bulk_sync([_project("alpha", code_review=review), _project("beta", code_review=None)], {}, {})
+
+        reviews = db.get_code_reviews(status="in_progress")
+        assert [r["project_id"] for r in reviews] == ["alpha"]
+        assert reviews[0]["date"] == "2025-01-02T00:00:00"
+        assert reviews[0]["action_items"] == review["action_items"]
+        assert db.get_code_reviews(status="completed") == []
+        assert [i["text"] for i in db.get_review_items(checked=False)] == ["Fix B"]
+
+        # Review file removed: rows go away on the next sync
+        db.bulk_sync([_project("alpha", code_review=None)], {}, {})
+        assert db.get_code_reviews() == []
+        assert db.get_review_items() == []
+
+
+class TestTasks:
+    """Tests for the task index."""
+
+    def _task(self, task_id, text, checked=False, line=1):
+        return {"id": task_id, "path": "/projects/alpha/TODO.md", "section": "Now",
+                "line": line, "text": text, "checked": checked}
+
+    def test_diff_and_pagination(self, db):
+        """Re-syncs only touch changed tasks and keep first_seen."""
+        tasks = [self._task("t1", "Ship", line=3), self._task("t2", "Docs", line=4)]
+        assert db.bulk_sync([_project("alpha", tasks=tasks)], {}, {})["tasks"] == 2
+        first_seen = db.get_tasks()[0]["first_seen"]
+
+        tasks = [self._task("t1", "Ship", checked=True, line=3), self._task("t3", "Tests", line=5)]
+        assert db.bulk_sync([_project("alpha", tasks=tasks)], {}, {})["tasks"] == 3
+
+        assert [t["text"] for t in db.get_tasks(checked=False)] == ["Tests"]
+        assert db.get_tasks(checked=True)[0]["first_seen"] == first_seen
+        assert db.count_tasks(project_id="alpha") == 2
+        assert [t["id"] for t in db.get_tasks(limit=1, offset=1)] == ["t3"]
+        assert db.count_tasks(older_than_days=1) == 0
+
+
+class TestSearch:
+    """Tests for the FTS5 document index."""
+
+    def _doc(self, name, text, content_hash):
+        return {"path": f"/projects/alpha/{name}", "kind": "todo", "content_hash": content_hash, "text": text}
+
+    def test_incremental_index_and_ranking(self, db):
+        """Only changed documents are re-indexed; removed files drop out of results."""
+        docs = [self._doc("TODO.md", "Wire up Stripe webhooks", "h1"),
+                self._doc("README.md", "A tracker for projects", "h2")]
+        summary = db.bulk_sync([_project("alpha", documents=docs)], {}, {})
+        assert summary["documents"] == 2
+
+        results = db.search_documents("stripe", highlight=("[", "]"))
+        assert [r["path"] for r in results] == ["/projects/alpha/TODO.md"]
+        assert "[Stripe]" in results[0]["snippet"]
+
+        # Unchanged hash (text not re-read) leaves the index alone
+        docs[0] = dict(docs[0], text=None)
+        summary = db.bulk_sync([_project("alpha", documents=docs[:1])], {}, {})
+        assert summary["documents"] == 0
+        assert db.search_documents("tracker") == []
+
+        # Queries that aren't valid FTS5 syntax fall back to plain words
+        assert len(db.search_documents('stripe-webhooks "')) == 1
+
+
+class TestParseCache:
+    """Tests for the persistent parse cache."""
+
+    def test_stat_hit_hash_fallback_and_eviction(self, db):
+        """Unchanged files skip the parser; entries go away with their project."""
+        calls = []
+
+        def parse(content):
+            calls.append(content)
+            return {"text": content}
+
+        with tempfile.TemporaryDirectory() as tmp:
+            todo = Path(tmp) / "TODO.md"
+            todo.write_text("hello")
+
+            cache = ParseCache()
+            assert cache.get("alpha", todo, "todo", parse) == {"text": "hello"}
+            db.bulk_sync([_project("alpha", parse_cache=cache.used["alpha"])], {}, {})
+
+            # Same stat signature: served without hashing or parsing
+            cache = ParseCache(db.get_parse_cache()["alpha"])
+            cache.get("alpha", todo, "todo", parse)
+            # Touched but identical content: content hash still matches
+            os.utime(todo, ns=(1_000_000_000, 1_000_000_000))
+            cache.get("alpha", todo, "todo", parse)
+            assert (cache.hits, cache.misses, len(calls)) == (2, 0, 1)
+
+            todo.write_text("changed")
+            assert cache.get("alpha", todo, "todo", parse) == {"text": "changed"}
+            assert len(calls) == 2
+
+            # A second parser of the same file reuses the bytes already read
+            todo.unlink()
+            assert cache.get("alpha", todo, "todo", parse, default={}) == {}
+            index = Path(tmp) / "00_Index_alpha.md"
+            index.write_text("---\n---\n")
+            reads = []
+            original_read = Path.read_bytes
+            with pytest.MonkeyPatch.context() as mp:
+                mp.setattr(Path, "read_bytes", lambda self: reads.append(self) or original_read(self))
+                cache.get("alpha", index, "index_valid", parse)
+                cache.get("alpha", index, "project_type", parse)
+            assert reads == [index]
+
+        db.bulk_sync([], {}, {})
+        assert db.get_parse_cache() == {}
+
+
+class TestCheckCache:
+    """Tests for the persistent audit result cache."""
+
+    def test_hits_misses_and_version_eviction(self, db):
+        """Unchanged files aren't rechecked; a new tool version evicts old results."""
+        calls = []
+
+        def check():
+            calls.append(1)
+            return {"valid": True, "issues": []}
+
+        with tempfile.TemporaryDirectory() as tmp:
+            index = Path(tmp) / "00_Index_alpha.md"
+            index.write_text("---\ntags: []\n---\n")
+            db.bulk_sync([_project("alpha")], {}, {})
+
+            cache = CheckCache(db.get_check_cache("check"), "v1")
+            cache.get("alpha", index, "check", check)
+            db.save_check_cache(cache.updates, cache.evicted)
+
+            cache = CheckCache(db.get_check_cache("check"), "v1")
+            assert cache.get("alpha", index, "check", check) == {"valid": True, "issues": []}
+            os.utime(index, ns=(1_000_000_000, 1_000_000_000))
+            cache.get("alpha", index, "check", check)
+            assert cache.stats() == {"hits": 2, "misses": 0, "evictions": 0}
+
+            cache = CheckCache(db.get_check_cache("check"), "v2")
+            cache.get("alpha", index, "check", check)
+            assert cache.stats() == {"hits": 0, "misses": 1, "evictions": 1}
+            assert len(calls) == 2
+
+            # Failed checks aren't cached
+            cache.lookup_signed("/projects/alpha", "health", "fp-1")
+            cache.store_signed("alpha", "/projects/alpha", "health", "fp-1", None)
+            assert cache.lookup_signed("/projects/alpha", "health", "fp-1") is None
+
+        db.bulk_sync([], {}, {})
+        assert db.get_check_cache() == {}
+
+    def test_health_refresh_bypasses_cache(self, monkeypatch):
+        """Full scans recheck health; cached scores are only reused for today."""
+        calls = []
+
+        class Provider:
+            def get_project_health_batch(self, projects):
+                calls.append(projects)
+                return {p["path"]: {"score": 90, "grade": "A"} for p in projects}
+
+        monkeypatch.setattr(project_scanner, "get_provider", lambda: Provider())
+        projects = [{"id": "alpha", "path": "/projects/alpha", "fingerprint": "fp-1"}]
+        cache = CheckCache({}, "v1")
+
+        project_scanner.scan_health_parallel(projects, check_cache=cache)
+        project_scanner.scan_health_parallel(projects, check_cache=cache)
+        assert len(calls) == 1
+        project_scanner.scan_health_parallel(projects, check_cache=cache, refresh=True)
+        assert len(calls) == 2
+        assert cache.updates[-1]["content_hash"].startswith("fp-1:")
+
+
+class TestScanService:
+    """Tests for the shared scan pipeline and single-project rescans."""
+
+    def test_only_target_project_rows_change(self, db):
+        """A rescan updates its own project and leaves the others untouched."""
+        db.bulk_sync([_project("other")], {}, {})
+        other_before = db.get_project("other")
+
+        with tempfile.TemporaryDirectory() as tmp:
+            project_path = Path(tmp) / "Alpha"
+            project_path.mkdir()
+            (project_path / "TODO.md").write_text("# Alpha\n\n**Project Status:** Active\n\n- [ ] Ship it\n")
+
+            result = ScanService(db).rescan(project_path)
+
+            assert result["updated"] is True
+            assert db.get_project("alpha")["status"] == "active"
+            assert db.get_project("alpha")["health_grade"] is not None
+            assert [t["text"] for t in db.get_tasks(project_id="alpha")] == ["Ship it"]
+            assert db.get_project("other") == other_before
+
+            assert ScanService(db).rescan(project_path)["updated"] is False
+
+    def test_full_run_reports_stage_timings(self, db):
+        """run() goes through every stage and prunes projects that disappeared."""
+        db.bulk_sync([_project("gone")], {}, {})
+
+        with tempfile.TemporaryDirectory() as tmp:
+            (Path(tmp) / "Alpha").mkdir()
+            (Path(tmp) / "Alpha" / "README.md").write_text("# Alpha\n\nA demo project.\n")
+            phases = []
+
+            result = ScanService(db, tmp, jobs=1, progress=lambda phase, count: phases.append(phase)).run()
+
+            assert list(result["timings"]) == list(SCAN_STAGES) + ["total"]
+            assert (result["total"], result["changed"]) == (1, 1)
+            assert result["summary"]["removed"] == ["gone"]
+            assert db.get_project("alpha")["description"] == "A demo project."
+            assert phases[0] == "discovered" and phases[-1] == "persisted"
+            assert ScanService(db, tmp, jobs=1).run()["cache_hits"] == 1
+
+    def test_incremental_scan_extracts_only_changed_projects(self, db, monkeypatch):
+        """Unchanged projects aren't re-extracted; a touched file or a full scan re-extracts."""
+        extracted = []
+
+        def scan_candidate(path, *args):
+            extracted.append(Path(path).name)
+            return original(path, *args)
+
+        original = project_scanner.scan_candidate
+        monkeypatch.setattr(project_scanner, "scan_candidate", scan_candidate)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            for name in ("alpha", "beta"):
+                (Path(tmp) / name).mkdir()
+                (Path(tmp) / name / "README.md").write_text(f"# {name}\n")
+            ScanService(db, tmp, jobs=1).run()
+            assert sorted(extracted) == ["alpha", "beta"]
+
+            extracted.clear()
+            result = ScanService(db, tmp, jobs=1).run()
+            assert extracted == []
+            assert (result["cache_hits"], result["changed"]) == (2, 0)
+            assert result["summary"]["unchanged"] == 2
+
+            readme = Path(tmp) / "alpha" / "README.md"
+            readme.write_text("# alpha\n\nNow with a description.\n")
+            os.utime(readme, ns=(2_000_000_000_000_000_000, 2_000_000_000_000_000_000))
+            result = ScanService(db, tmp, jobs=1).run()
+            assert extracted == ["alpha"]
+            assert db.get_project("alpha")["description"] == "Now with a description."
+
+            extracted.clear()
+            result = ScanService(db, tmp, jobs=1).run(full=True)
+            assert sorted(extracted) == ["alpha", "beta"]
+            assert result["cache_hits"] == 0
+
+    def test_writer_commits_in_batches(self, db, monkeypatch):
+        """Results are persisted batch by batch while the scan is still running."""
+        monkeypatch.setattr(scan_service, "WRITE_BATCH_SIZE", 2)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            for name in ("alpha", "beta", "gamma", "delta", "epsilon"):
+                (Path(tmp) / name).mkdir()
+                (Path(tmp) / name / "README.md").write_text(f"# {name}\n\nProject {name}.\n")
+            persisted = []
+
+            def progress(phase, count):
+                if phase == "persisted":
+                    persisted.append((count, len(db.get_all_projects())))
+
+            result = ScanService(db, tmp, jobs=1, progress=progress).run()
+
+            assert result["total"] == 5
+            assert [count for count, _ in persisted] == [2, 4, 5]
+            # Each batch is committed before the writer reports it
+            assert all(rows == count for count, rows in persisted)
+            # Health cache entries aren't dropped for projects still queued
+            assert len(db.get_check_cache("health")) == 5
+
+    def test_alerts_counted_once_and_non_projects_pruned(self, db):
+        """Volatile alerts aren't double-counted; directories that stop being projects are removed."""
+        with tempfile.TemporaryDirectory() as tmp:
+            readme = Path(tmp) / "Alpha" / "README.md"
+            readme.parent.mkdir()
+            readme.write_text("# Alpha\n\nA demo project.\n")
+            os.utime(readme, (1_000_000_000, 1_000_000_000))
+
+            result = ScanService(db, tmp, jobs=1).run()
+
+            assert "stalled" in {a["detector"] for a in db.get_alerts()}
+            assert result["alerts"] == len(db.get_alerts())
+
+            readme.unlink()
+            result = ScanService(db, tmp, jobs=1).run()
+
+            assert result["summary"]["removed"] == ["Alpha"]
+            assert db.get_project("alpha") is None
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,63 @@
+"""Tests for the in-process git reader."""
+
+import shutil
+import subprocess
+import pytest
+from pathlib import Path
+import tempfile
+import sys
+
+# Add scripts to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+from discovery.git_reader import find_git_dir, read_last_commit_date, resolve_head
+
+pytestmark = pytest.mark.skipif(shutil.which("git") is None, reason="git not installed")
+
+
+def _git(repo: Path, *args: str) -> str:
+    result = subprocess.run(
+        ["git", "-c", "user.name=Test", "-c", "user.email=test@example.com", *args],
+        cwd=repo, capture_output=True, text=True, check=True,
+        env={"GIT_COMMITTER_DATE": "2025-03-04T05:06:07+02:00", "PATH": "/usr/bin:/bin"}
+    )
+    return result.stdout.strip()
+
+
+class TestGitReader:
+    """Tests for reading HEAD commit dates without git log."""
+
+    def _make_repo(self, tmp: str) -> Path:
+        repo = Path(tmp)
+        _git(repo, "init", "-q")
+        (repo / "file.txt").write_text("hello")
+        _git(repo, "add", "file.txt")
+        _git(repo, "commit", "-q", "-m", "init")
+        return repo
+
+    def test_loose_object_matches_git_log(self):
+        """Committer date from a loose commit matches `git log --format=%cI`."""
+        with tempfile.TemporaryDirectory() as tmp:
+            repo = self._make_repo(tmp)
+            expected = _git(repo, "log", "-1", "--format=%cI")
+            assert read_last_commit_date(find_git_dir(repo)) == expected
+
+    def test_packed_refs_and_objects(self):
+        """After gc, refs come from packed-refs and the commit from a pack."""
+        with tempfile.TemporaryDirectory() as tmp:
+            repo = self._make_repo(tmp)
+            _git(repo, "gc", "-q")
+            expected = _git(repo, "log", "-1", "--format=%cI")
+            assert read_last_commit_date(find_git_dir(repo)) == expected
+
+    def test_unborn_branch(self):
+        """A repository without commits has no commit date."""
+        with tempfile.TemporaryDirectory() as tmp:
+            repo = Path(tmp)
+            _git(repo, "init", "-q")
+            assert resolve_head(find_git_dir(repo)) is None
+            assert read_last_commit_date(find_git_dir(repo)) is None
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
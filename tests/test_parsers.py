@@ -8,7 +8,7 @@ import sys
 # Add scripts to path
 sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
 
-from discovery.todo_parser import parse_todo, extract_status, calculate_completion
+from discovery.todo_parser import parse_todo, tokenize_todo, assign_task_ids, extract_status, calculate_completion
 
 
 class TestTODOParser:
@@ -41,6 +41,13 @@ class TestTODOParser:
         
         content_empty = "No checkboxes here"
         assert calculate_completion(content_empty) == 0
+        
+        # Every checkbox style tasks are parsed from counts towards completion
+        content_styles = "* [X] Ship\n  - [x] Nested\n* [ ] Todo"
+        assert calculate_completion(content_styles) == 66
+        result = tokenize_todo(content_styles)
+        assert (result["tasks_done"], result["tasks_total"]) == (2, 3)
+        assert result["completion_pct"] == 66
     
     def test_parse_todo_with_real_file(self):
         """Test parsing an actual TODO.md file."""
@@ -67,6 +74,79 @@ class TestTODOParser:
             assert result["completion_pct"] == 66  # 2/3 complete
         finally:
             temp_path.unlink()
+    
+    def test_tokenize_todo_sections(self):
+        """Test one tokenizer pass yields agents, cron, marker, blockers and gaps."""
+        content = """# Project TODO
+
+**Project Status:** Active
+**Type:** Infrastructure
+
+## Team
+### AI Agents
+- Claude: Architecture
+
+### Cron Jobs
+- Schedule: `0 2 * * *` (nightly)
+- Command: `python backup.py`
+
+## Blockers & Dependencies
+- Waiting on API key
+
+## What's Missing
+- [ ] Docs
+- [x] Tests
+"""
+        result = tokenize_todo(content)
+        assert result["is_infrastructure"] is True
+        assert result["ai_agents"] == [{"agent_name": "Claude", "role": "Architecture"}]
+        assert result["cron_jobs"][0]["schedule"] == "0 2 * * *"
+        assert result["cron_jobs"][0]["command"] == "python backup.py"
+        assert result["blockers"] == ["Waiting on API key"]
+        assert result["gaps"] == ["[ ] Docs", "[x] Tests"]
+        assert (result["tasks_done"], result["tasks_total"]) == (1, 2)
+        
+        # Section tree nests by heading level
+        title = result["sections"][0]
+        assert [s["title"] for s in title["children"]] == ["Team", "Blockers & Dependencies", "What's Missing"]
+        assert [s["title"] for s in title["children"][0]["children"]] == ["AI Agents", "Cron Jobs"]
+
+    
+    def test_task_ids_are_stable(self):
+        """Task ids survive line moves and check-offs; duplicates stay distinct."""
+        before = tokenize_todo("# T\n## Now\n- [ ] Ship\n- [ ] Ship\n")["tasks"]
+        after = tokenize_todo("# T\n\nIntro\n## Now\n- [x] Ship\n- [ ] Ship\n")["tasks"]
+        
+        ids_before = [t["id"] for t in assign_task_ids("alpha", before)]
+        ids_after = [t["id"] for t in assign_task_ids("alpha", after)]
+        assert ids_before == ids_after
+        assert len(set(ids_before)) == 2
+        assert (after[0]["section"], after[0]["line"], after[0]["checked"]) == ("Now", 5, True)
+    
+    def test_fenced_code_is_not_headings_or_tasks(self):
+        """'#' comments and checkboxes inside fenced code stay in their section."""
+        content = """# Demo
+
+## Cron Jobs
+```bash
+# nightly backup
+0 2 * * * python backup.py
+- [ ] not a task
+```
+
+## Blockers
+- Waiting on API key
+
+## Next
+~~~
+# also a comment
+~~~
+- [ ] Ship
+"""
+        result = tokenize_todo(content)
+        assert [s["title"] for s in result["sections"][0]["children"]] == ["Cron Jobs", "Blockers", "Next"]
+        assert result["blockers"] == ["Waiting on API key"]
+        assert [(t["section"], t["text"]) for t in result["tasks"]] == [("Next", "Ship")]
 
 
 if __name__ == "__main__":
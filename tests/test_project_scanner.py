@@ -0,0 +1,77 @@
+"""Tests for the streaming extract stage."""
+
+import pytest
+from pathlib import Path
+import tempfile
+import sys
+
+# Add scripts to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+from discovery.project_scanner import iter_candidates, iter_extracted
+
+
+@pytest.fixture
+def fleet():
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        for name in ("alpha", "beta", "gamma", "delta"):
+            (root / name).mkdir()
+            (root / name / "README.md").write_text(f"# {name}\n\nProject {name}.\n")
+        (root / "empty").mkdir()
+        yield root
+
+
+class TestIterCandidates:
+    """Tests for the discover stage."""
+
+    def test_cache_entries_loaded_only_for_changed_projects(self, fleet):
+        """Parse cache entries are looked up per candidate, skipping unchanged ones."""
+        fingerprints = {c["id"]: c["fingerprint"] for c in iter_candidates(fleet)}
+        (fleet / "beta" / "TODO.md").write_text("# beta\n")
+        loaded = []
+
+        def load(project_id):
+            loaded.append(project_id)
+            return {("README.md", "readme"): {"project_id": project_id}}
+
+        candidates = {c["id"]: c for c in iter_candidates(fleet, fingerprints, load)}
+
+        assert loaded == ["beta"]
+        assert candidates["beta"]["cache_entries"] == {("README.md", "readme"): {"project_id": "beta"}}
+        assert candidates["alpha"]["unchanged"] is True
+
+
+class TestIterExtracted:
+    """Tests for iter_extracted across executor modes."""
+
+    def _candidates(self, root: Path):
+        candidates = list(iter_candidates(root))
+        # Extraction raises for this one (Path(None)); it's skipped, not fatal
+        candidates.append({"id": "broken", "name": "broken", "path": None, "fingerprint": "fp"})
+        # Unchanged stubs pass straight through
+        candidates.append({"id": "stub", "name": "stub", "path": str(root / "stub"), "fingerprint": "fp",
+                           "unchanged": True})
+        return candidates
+
+    @pytest.mark.parametrize("executor", ["process", "thread"])
+    def test_same_results_in_any_completion_order(self, fleet, executor):
+        """Both executors extract the same projects; failures and non-projects are dropped."""
+        serial = {p["id"]: p.get("description") for p in iter_extracted(self._candidates(fleet), jobs=1)}
+        parallel = {
+            p["id"]: p.get("description")
+            for p in iter_extracted(self._candidates(fleet), jobs=2, executor=executor, window=2)
+        }
+
+        assert parallel == serial
+        assert sorted(serial) == ["alpha", "beta", "delta", "gamma", "stub"]
+        assert serial["alpha"] == "Project alpha."
+
+    def test_rejects_unknown_executor(self, fleet):
+        """Executor mode names are validated up front."""
+        with pytest.raises(ValueError):
+            list(iter_extracted(self._candidates(fleet), executor="fork"))
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
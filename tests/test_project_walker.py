@@ -0,0 +1,53 @@
+"""Tests for the single-pass project walker."""
+
+import os
+import pytest
+from pathlib import Path
+import tempfile
+import sys
+
+# Add scripts to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+from discovery.project_walker import walk_project, should_skip_directory
+
+
+class TestProjectWalker:
+    """Tests for walk_project."""
+
+    def test_prunes_skipped_directories(self):
+        """Files under node_modules/venv/.git never count toward the stats."""
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            (root / "src").mkdir()
+            (root / "src" / "app.py").write_text("print('hi')")
+            os.utime(root / "src" / "app.py", (1_000_000, 1_000_000))
+
+            for skipped in ["node_modules", "venv", ".git"]:
+                (root / skipped).mkdir()
+                (root / skipped / "index.js").write_text("")
+
+            stats = walk_project(root)
+            assert stats["has_python"] is True
+            assert stats["has_js"] is False
+            assert stats["file_count"] == 1
+            assert stats["newest_mtime"] == 1_000_000
+
+    def test_empty_directory(self):
+        """An empty tree has no indicators and no mtime."""
+        with tempfile.TemporaryDirectory() as tmp:
+            stats = walk_project(Path(tmp))
+            assert stats["has_python"] is False
+            assert stats["has_js"] is False
+            assert stats["newest_mtime"] is None
+            assert stats["file_count"] == 0
+
+    def test_should_skip_directory(self):
+        """Skip list and hidden directories are pruned."""
+        assert should_skip_directory(Path("node_modules"))
+        assert should_skip_directory(Path(".cache"))
+        assert not should_skip_directory(Path("src"))
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
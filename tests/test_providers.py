@@ -0,0 +1,284 @@
+"""Tests for the audit metadata providers."""
+
+import pytest
+import threading
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+import tempfile
+import sys
+
+# Add scripts to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+from discovery.audit_pool import MAX_CONSECUTIVE_FAILURES, AuditWorkerPool, WorkerError, WorkerReplyError
+from discovery import providers
+from discovery.providers import AuditProvider, LegacyProvider, batched, get_provider, refresh_provider
+from discovery.project_scanner import extract_project_metadata, provider_task_rows
+from discovery.alert_detector import detect_stalled_projects
+from discovery.health import ACTIVE_DAYS
+
+WORKER_SCRIPT = str(Path(__file__).parent / "fixtures" / "audit_worker.py")
+
+
+def _fake_audit(tmp: str, body: str) -> str:
+    """Write an executable stand-in for the audit binary."""
+    script = Path(tmp) / "audit"
+    script.write_text(f"#!{sys.executable}\nimport sys, json\n{body}\n")
+    script.chmod(0o755)
+    return str(script)
+
+
+class TestAuditTaskStream:
+    """Tests for streaming `audit tasks` output."""
+
+    def test_streams_and_skips_malformed_lines(self):
+        """NDJSON is decoded line by line; garbage lines are dropped."""
+        with tempfile.TemporaryDirectory() as tmp:
+            bin_path = _fake_audit(tmp, (
+                "for i in range(5):\n"
+                "    print(json.dumps({'text': f'task {i}'}))\n"
+                "print('not json')"
+            ))
+            provider = AuditProvider(bin_path)
+
+            assert [t["text"] for t in provider.get_tasks()] == [f"task {i}" for i in range(5)]
+            assert [len(b) for b in provider.iter_task_batches(batch_size=2)] == [2, 2, 1]
+
+    def test_cancel_stops_the_process(self):
+        """Setting the cancel event ends iteration of an endless stream."""
+        with tempfile.TemporaryDirectory() as tmp:
+            bin_path = _fake_audit(tmp, (
+                "while True:\n"
+                "    print(json.dumps({'text': 'again'}), flush=True)"
+            ))
+            cancel = threading.Event()
+            received = 0
+            for _ in AuditProvider(bin_path).iter_tasks(cancel=cancel, timeout=10):
+                received += 1
+                if received == 3:
+                    cancel.set()
+            assert received == 3
+
+    def test_batched(self):
+        """batched groups any iterable without materializing it."""
+        assert list(batched(iter(range(5)), 2)) == [[0, 1], [2, 3], [4]]
+
+
+class TestAuditHealthBatch:
+    """Tests for batched `audit health` calls."""
+
+    def test_batch_maps_results_by_path(self):
+        """One invocation covers many projects; results come back keyed by path."""
+        with tempfile.TemporaryDirectory() as tmp:
+            log = Path(tmp) / "calls.log"
+            bin_path = _fake_audit(tmp, (
+                f"open({str(log)!r}, 'a').write('call\\n')\n"
+                "paths = [a for a in sys.argv[2:] if a != '--json']\n"
+                "for p in reversed(paths):\n"
+                "    print(json.dumps({'path': p, 'score': 90 if p.endswith('a') else 101, 'grade': 'A'}))"
+            ))
+            paths = [str(Path(tmp) / name) for name in ("a", "b", "c")]
+
+            results = AuditProvider(bin_path).get_health_batch(paths)
+
+            assert results[paths[0]] == {"score": 90, "grade": "A"}
+            assert results[paths[1]] is None  # invalid score rejected
+            assert len(log.read_text().splitlines()) == 1
+
+    def test_single_path_binary_falls_back(self):
+        """A binary that ignores extra paths still yields a result per project."""
+        with tempfile.TemporaryDirectory() as tmp:
+            bin_path = _fake_audit(tmp, "print(json.dumps({'score': 70, 'grade': 'C'}))")
+            paths = [str(Path(tmp) / name) for name in ("a", "b")]
+
+            results = AuditProvider(bin_path).get_health_batch(paths)
+
+            assert results == {path: {"score": 70, "grade": "C"} for path in paths}
+
+
+class TestAuditWorkerPool:
+    """Tests for the long-lived `audit serve` worker pool."""
+
+    def test_requests_reuse_workers(self):
+        """Consecutive requests are answered by the same process."""
+        pool = AuditWorkerPool([sys.executable, WORKER_SCRIPT, "serve"], size=1)
+        try:
+            first = pool.request("check", path="a.md")
+            second = pool.request("check", path="b.md")
+            assert first["valid"] is True
+            assert first["pid"] == second["pid"]
+            with pytest.raises(WorkerReplyError):
+                pool.request("check", path="bad")
+        finally:
+            pool.shutdown()
+
+    def test_crash_and_timeout_restart_the_worker(self):
+        """A dead or hung worker is replaced and the pool keeps serving."""
+        pool = AuditWorkerPool([sys.executable, WORKER_SCRIPT, "serve"], size=1)
+        try:
+            pid = pool.request("check", path="a.md")["pid"]
+            with pytest.raises(WorkerError):
+                pool.request("check", path="crash")
+            with pytest.raises(WorkerError):
+                pool.request("check", path="slow", timeout=0.5)
+            assert pool.request("check", path="a.md")["pid"] != pid
+        finally:
+            pool.shutdown()
+
+    def test_pool_disables_itself_when_workers_cannot_start(self):
+        """A command that never serves stops being retried after a few failures."""
+        pool = AuditWorkerPool([sys.executable, "-c", "pass"], size=1)
+        try:
+            for _ in range(MAX_CONSECUTIVE_FAILURES):
+                with pytest.raises(WorkerError):
+                    pool.request("check", path="a.md", timeout=2)
+            assert pool.disabled
+            with pytest.raises(WorkerError, match="disabled"):
+                pool.request("check", path="a.md")
+        finally:
+            pool.shutdown()
+
+        assert AuditWorkerPool(["/nonexistent/audit", "serve"], size=1).disabled
+
+    def test_provider_uses_pool(self):
+        """AuditProvider routes health checks through workers when enabled."""
+        with tempfile.TemporaryDirectory() as tmp:
+            provider = AuditProvider(WORKER_SCRIPT, workers=1)
+            assert provider.get_health(tmp) == {"score": 88, "grade": "B"}
+            assert provider.check_file(str(Path(tmp) / "a.md")) == {"valid": True, "issues": []}
+
+
+class TestProviderCache:
+    """Tests for the process-wide provider cache."""
+
+    def test_verifies_once_until_binary_changes(self, monkeypatch):
+        """`--help` runs once; replacing the binary triggers a new check."""
+        with tempfile.TemporaryDirectory() as tmp:
+            log = Path(tmp) / "calls.log"
+            bin_path = _fake_audit(tmp, (
+                f"open({str(log)!r}, 'a').write('call\\n')\n"
+                "print('Go-based CLI tool')"
+            ))
+            monkeypatch.setattr(providers, "AUDIT_BIN_PATH", bin_path)
+            monkeypatch.setattr(providers, "PROVIDER_CACHE_TTL", 0)
+
+            first = refresh_provider()
+            assert isinstance(first, AuditProvider)
+            assert get_provider() is first
+            assert len(log.read_text().splitlines()) == 1
+
+            _fake_audit(tmp, "print('something else entirely')")
+            assert isinstance(get_provider(), LegacyProvider)
+
+        monkeypatch.undo()
+        refresh_provider()
+
+
+VALID_INDEX = """---
+tags:
+  - map/project
+  - p/demo
+  - type/standard
+  - domain/tools
+  - status/active
+  - tech/python
+---
+# Demo
+
+## Key Components
+- cli
+
+## Status
+Active
+"""
+
+
+class TestLegacyProvider:
+    """Tests for the in-process provider used without the audit binary."""
+
+    def test_check_file_reports_issues(self):
+        """Index validation names the missing tags and sections."""
+        with tempfile.TemporaryDirectory() as tmp:
+            index = Path(tmp) / "00_Index_demo.md"
+            index.write_text(VALID_INDEX)
+            assert LegacyProvider().check_file(str(index)) == {"valid": True, "issues": []}
+
+            index.write_text(VALID_INDEX.replace("  - tech/python\n", "").replace("## Status", "## Notes"))
+            result = LegacyProvider().check_file(str(index))
+            assert result["valid"] is False
+            assert result["issues"] == ["Missing tag: tech/", "Missing section: Status"]
+
+    def test_health_score_and_grade(self):
+        """Score is the sum of present signals; blockers cost points."""
+        with tempfile.TemporaryDirectory() as tmp:
+            project = Path(tmp)
+            # An empty directory's last_modified falls back to now, so only "active" counts
+            assert LegacyProvider().get_health(tmp) == {"score": 15, "grade": "F"}
+
+            (project / "00_Index_demo.md").write_text(VALID_INDEX)
+            (project / "README.md").write_text("# Demo\n")
+            (project / "TODO.md").write_text("# Demo\n\n## Blockers\n- Waiting on API keys\n")
+            assert LegacyProvider().get_health(tmp) == {"score": 85, "grade": "B"}
+
+    def test_health_from_scanned_project(self):
+        """Scanned projects are scored from their metadata; "active" follows last_modified."""
+        with tempfile.TemporaryDirectory() as tmp:
+            project = Path(tmp) / "demo"
+            project.mkdir()
+            (project / "00_Index_demo.md").write_text(VALID_INDEX)
+            (project / "README.md").write_text("# Demo\n")
+            (project / "TODO.md").write_text("# Demo\n\n## Blockers\n- Waiting on API keys\n")
+            scanned = extract_project_metadata(project)
+            for name in ("00_Index_demo.md", "README.md", "TODO.md"):
+                (project / name).unlink()
+
+            provider = LegacyProvider()
+            assert provider.get_project_health_batch([scanned]) == {scanned["path"]: {"score": 85, "grade": "B"}}
+
+            stale = datetime.now(timezone.utc) - timedelta(days=ACTIVE_DAYS + 1)
+            scanned["last_modified"] = stale.isoformat()
+            assert provider.get_project_health_batch([scanned]) == {scanned["path"]: {"score": 70, "grade": "C"}}
+            assert detect_stalled_projects([scanned])
+
+    def test_tasks_match_audit_record_shape(self):
+        """TODO.md checkboxes come back as audit-style records, per project."""
+        with tempfile.TemporaryDirectory() as tmp:
+            project = Path(tmp) / "demo"
+            project.mkdir()
+            (project / "TODO.md").write_text("# Demo\n\n## Phase 1\n- [x] Setup\n- [ ] Ship\n")
+
+            tasks = LegacyProvider().get_tasks(tmp)
+
+            assert tasks == [
+                {"path": str(project / "TODO.md"), "section": "Phase 1", "line": 4, "text": "Setup", "checked": True},
+                {"path": str(project / "TODO.md"), "section": "Phase 1", "line": 5, "text": "Ship", "checked": False},
+            ]
+            assert LegacyProvider().get_tasks(str(project)) == tasks
+
+    def test_task_rows_for_a_single_project_root(self):
+        """A single project as the task root is owned by its own directory."""
+        with tempfile.TemporaryDirectory() as tmp:
+            project = Path(tmp) / "Demo"
+            project.mkdir()
+            (project / "TODO.md").write_text("# Demo\n\n- [x] Setup\n- [ ] Ship\n")
+
+            rows = list(provider_task_rows(LegacyProvider(), project))
+
+            assert [(r["project_id"], r["text"]) for r in rows] == [("demo", "Setup"), ("demo", "Ship")]
+            assert list(provider_task_rows(LegacyProvider(), Path(tmp))) == rows
+
+    def test_projects_directory_with_its_own_todo(self, monkeypatch):
+        """The projects directory lists every project even if it has a TODO.md itself."""
+        with tempfile.TemporaryDirectory() as tmp:
+            project = Path(tmp) / "demo"
+            project.mkdir()
+            (project / "TODO.md").write_text("# Demo\n\n- [ ] Ship\n")
+            (Path(tmp) / "TODO.md").write_text("# Fleet\n\n- [ ] Tidy up\n")
+            monkeypatch.setattr(providers, "PROJECTS_BASE_DIR", Path(tmp))
+
+            assert [t["text"] for t in LegacyProvider().get_tasks()] == ["Ship"]
+            assert [t["text"] for t in LegacyProvider().get_tasks(tmp)] == ["Ship"]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,62 @@
+"""Tests for background scan jobs."""
+
+import pytest
+import threading
+from pathlib import Path
+import sys
+
+# Add scripts to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+from discovery.scan_jobs import ScanJobRunner
+
+
+class TestScanJobRunner:
+    """Tests for queuing, coalescing and progress of scan jobs."""
+
+    def test_concurrent_requests_coalesce(self):
+        """Submissions while a scan runs return the running job."""
+        release = threading.Event()
+        started = threading.Event()
+        runs = []
+
+        def run(full, progress):
+            runs.append(full)
+            progress("discovered", 3)
+            started.set()
+            release.wait(5)
+            progress("persisted", 3)
+            return {"message": "ok"}
+
+        runner = ScanJobRunner(run)
+        try:
+            first = runner.submit()
+            started.wait(5)
+            second = runner.submit(full=True)
+            assert second["id"] == first["id"]
+            assert runner.get(first["id"])["progress"]["discovered"] == 3
+
+            release.set()
+            runner.shutdown()
+            job = runner.get(first["id"])
+            assert (job["status"], job["result"], job["phase"]) == ("done", {"message": "ok"}, "persisted")
+            assert runs == [False]
+        finally:
+            release.set()
+            runner.shutdown()
+
+    def test_failed_job_reports_error(self):
+        """An exception in the scan marks the job as failed and frees the runner."""
+        def run(full, progress):
+            raise RuntimeError("disk gone")
+
+        runner = ScanJobRunner(run)
+        job_id = runner.submit()["id"]
+        runner.shutdown()
+        assert runner.get(job_id)["status"] == "error"
+        assert runner.get(job_id)["error"] == "disk gone"
+        assert runner.get("missing") is None
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])